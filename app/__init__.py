@@ -1,13 +1,14 @@
-from .add_mint import (
-    add_mint_fields,
-    process_file as add_mint_process_file,
-    process_reference_files as add_mint_process_files,
-)
-from .convert_md_to_mdx import (
-    process_file as convert_md_process_file,
-    process_reference_files as convert_md_process_files,
-)
-from .cli import main
+# Exports are loaded on first access, so importing the package (e.g. to run
+# the CLI) does not pull in every processing module and its dependencies
+_EXPORTS = {
+    "add_mint_fields": (".add_mint", "add_mint_fields"),
+    "add_mint_process_file": (".add_mint", "process_file"),
+    "add_mint_process_files": (".add_mint", "process_reference_files"),
+    "convert_md_process_file": (".convert_md_to_mdx", "process_file"),
+    "convert_md_process_files": (".convert_md_to_mdx", "process_reference_files"),
+    "convert_operations": (".convert_md_to_mdx", "convert_operations"),
+    "main": (".cli", "main"),
+}
 
 __all__ = [
     "add_mint_fields",
@@ -15,5 +16,22 @@ __all__ = [
     "add_mint_process_files",
     "convert_md_process_file",
     "convert_md_process_files",
+    "convert_operations",
     "main",
 ]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib import import_module
+
+    module_name, attribute = _EXPORTS[name]
+    value = getattr(import_module(module_name, __name__), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
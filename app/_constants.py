@@ -25,3 +25,52 @@ PRO_MODE = "pro"
 VALID_MODES = [DEMO_MODE, PRO_MODE]
 
 DEFAULT_MDX_DIR = "mdx"
+
+DEFAULT_JOBS = 8
+
+DEFAULT_MAX_RETRIES = 3
+RETRY_BACKOFF_BASE = 0.5
+RETRY_BACKOFF_MAX = 30
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+
+DEFAULT_CACHE_DIR = ".cache/readme"
+
+# Specs at least this large are indexed by scanning the file instead of
+# parsing it. Parsing peaks at about 16 times the file size, scanning at a
+# few MiB whatever the size, for about 3 times the (sub-second) time
+SPEC_SCAN_MIN_SIZE = 4 * 1024 * 1024
+
+# Bump whenever a change to the converter alters the generated MDX
+CONVERTER_VERSION = "2"
+MANIFEST_FILENAME = ".mdx-manifest.json"
+# Operations completed by an unfinished run, next to the MDX of each spec
+JOURNAL_SUFFIX = ".journal.jsonl"
+
+# Specs that add-mint already processed, skipped on later runs unless --force
+ADD_MINT_STATE_FILE = ".cache/add-mint-state.json"
+
+WATCH_INTERVAL = 0.5
+WATCH_DEBOUNCE = 0.3
+
+# Maximum number of converted callout blocks kept in memory
+BLOCK_MEMO_SIZE = 4096
+# Maximum number of converted pages shared across modes by --share-pages
+PAGE_MEMO_SIZE = 1024
+
+# Adaptive rate limiting: the rate (requests per second) is cut by a factor on
+# 429 responses and grows back by a step on every successful response
+RATE_LIMIT_DECREASE = 0.7
+RATE_LIMIT_RECOVERY = 0.05
+RATE_LIMIT_MIN_RATE = 0.2
+
+# Staged convert-mdx pipeline: converter threads, capacity of the queues
+# between stages and number of files handed to the writer at once
+DEFAULT_CONVERT_WORKERS = 2
+PIPELINE_QUEUE_SIZE = 64
+WRITE_BATCH_SIZE = 16
+
+# --profile output files and number of entries in their reports
+PROFILE_OUTPUTS = {"cpu": "profile.prof", "mem": "profile-mem.txt"}
+PROFILE_TOP = 25
+# Seconds between samples of traced memory while looking for its peak
+PROFILE_SAMPLE_INTERVAL = 0.05
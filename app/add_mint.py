@@ -1,7 +1,54 @@
+import mmap
+import os
+import tempfile
+import orjson
 import justsdk
 
 from pathlib import Path
-from ._constants import HTTP_METHODS, DEFAULT_REFERENCE_DIR
+from .operation_index import OperationIndex
+from .metrics import run_metrics, ADD_MINT_STAGE
+from .mint_state import MintState
+from .spec_scanner import scan_operations
+from ._constants import DEFAULT_REFERENCE_DIR
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def mint_config(operation_id):
+    """
+    Build the x-mint config for an operation.
+    """
+    return {"href": f"/reference/{operation_id}"}
+
+
+def insert_after_key(mapping, anchor, key, value):
+    """
+    Insert a key right after `anchor` in a dict, in place and keeping order.
+    """
+    keys = list(mapping)
+    moved = [(k, mapping.pop(k)) for k in keys[keys.index(anchor) + 1 :]]
+    mapping[key] = value
+    mapping.update(moved)
+
+
+def print_mint_report(added, missing_ids, skipped):
+    """
+    Print what add-mint did in one write instead of one line per operation.
+    """
+    lines = [
+        f"Added x-mint field to {method.upper()} {path} (operationId: {operation_id})"
+        for path, method, operation_id in added
+    ]
+    lines.extend(
+        f"Warning: No operationId found for {method.upper()} {path}"
+        for path, method in missing_ids
+    )
+    lines.append(f"\nProcessed {len(added)} operations successfully!")
+
+    if skipped > 0:
+        lines.append(f"Skipped {skipped} operations that already had x-mint fields.")
+
+    print("\n".join(lines))
 
 
 def add_mint_fields(openapi_data):
@@ -12,45 +59,136 @@ def add_mint_fields(openapi_data):
         print("Warning: No 'paths' found in the OpenAPI specification")
         return openapi_data
 
-    operations_processed = 0
+    added = []
+    missing_ids = []
     operations_skipped = 0
 
-    for path, path_item in openapi_data["paths"].items():
-        for method in HTTP_METHODS:
-            if method in path_item:
-                operation = path_item[method]
+    operation_index = OperationIndex(openapi_data)
+    operation_index.report_duplicates()
+
+    for path, method, operation in operation_index.operations:
+        if "operationId" not in operation:
+            missing_ids.append((path, method))
+            continue
+
+        if "x-mint" in operation:
+            operations_skipped += 1
+            continue
+
+        operation_id = operation["operationId"]
+        insert_after_key(operation, "operationId", "x-mint", mint_config(operation_id))
+        added.append((path, method, operation_id))
+
+    print_mint_report(added, missing_ids, operations_skipped)
+    return openapi_data
+
 
-                if "operationId" in operation:
-                    operation_id = operation["operationId"]
+def render_mint_field(buffer, span):
+    """
+    Render the bytes that add x-mint right after an operation's operationId,
+    following the indentation of the surrounding JSON.
+    """
+    line_start = buffer.rfind(b"\n", 0, span.id_key_start) + 1
+    indent = buffer[line_start : span.id_key_start]
+    key_separator = span.key_separator
+    href = orjson.dumps(mint_config(span.operation_id)["href"])
+
+    if indent.strip(b" \t") or line_start == 0:
+        # Compact JSON
+        return b',"x-mint"' + key_separator + b'{"href"' + key_separator + href + b"}"
+
+    return (
+        b",\n"
+        + indent
+        + b'"x-mint"'
+        + key_separator
+        + b"{\n"
+        + indent
+        + b'  "href"'
+        + key_separator
+        + href
+        + b"\n"
+        + indent
+        + b"}"
+    )
+
+
+def copy_range(buffer, output, start, end):
+    """
+    Copy a byte range of a buffer to a file in bounded chunks.
+    """
+    while start < end:
+        chunk_end = min(start + COPY_CHUNK_SIZE, end)
+        output.write(buffer[start:chunk_end])
+        start = chunk_end
+
+
+def splice_mint_fields(json_file):
+    """
+    Add x-mint fields to a JSON spec file by splicing them into its bytes.
+    Keeps the file's formatting and key order, uses flat memory however large
+    the spec is, and leaves the file untouched when nothing is missing.
+    Returns the list of (path, method, operationId) that were added.
+    """
+    json_file = Path(json_file)
+
+    if json_file.stat().st_size == 0:
+        raise ValueError(f"'{json_file.name}' is empty")
+
+    with (
+        open(json_file, "rb") as source,
+        mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as buffer,
+    ):
+        added = []
+        missing_ids = []
+        insertions = []
+        skipped = 0
+        seen_ids = set()
+        duplicate_ids = set()
+
+        for span in scan_operations(buffer):
+            if span.operation_id is None:
+                missing_ids.append((span.path, span.method))
+                continue
+
+            if span.operation_id in seen_ids:
+                duplicate_ids.add(span.operation_id)
+            seen_ids.add(span.operation_id)
 
-                    if "x-mint" in operation:
-                        operations_skipped += 1
-                        continue
+            if span.has_mint:
+                skipped += 1
+                continue
 
-                    new_operation = {}
+            insertions.append((span.id_value_end, render_mint_field(buffer, span)))
+            added.append((span.path, span.method, span.operation_id))
 
-                    for key, value in operation.items():
-                        new_operation[key] = value
+        for operation_id in sorted(duplicate_ids):
+            justsdk.print_warning(f"Duplicate operationId '{operation_id}'")
 
-                        if key == "operationId":
-                            new_operation["x-mint"] = {
-                                "href": f"/reference/{operation_id}"
-                            }
+        print_mint_report(added, missing_ids, skipped)
 
-                    path_item[method] = new_operation
-                    operations_processed += 1
-                    print(
-                        f"Added x-mint field to {method.upper()} {path} (operationId: {operation_id})"
-                    )
-                else:
-                    print(f"Warning: No operationId found for {method.upper()} {path}")
+        if not insertions:
+            return added
 
-    print(f"\nProcessed {operations_processed} operations successfully!")
-    if operations_skipped > 0:
-        print(
-            f"Skipped {operations_skipped} operations that already had x-mint fields."
+        temp_fd, temp_path = tempfile.mkstemp(
+            dir=json_file.parent, prefix=f".{json_file.stem}.", suffix=json_file.suffix
         )
-    return openapi_data
+        try:
+            with open(temp_fd, "wb") as output:
+                position = 0
+                for offset, field in insertions:
+                    copy_range(buffer, output, position, offset)
+                    output.write(field)
+                    position = offset
+                copy_range(buffer, output, position, len(buffer))
+
+            os.chmod(temp_path, os.stat(json_file).st_mode & 0o777)
+            os.replace(temp_path, json_file)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+    return added
 
 
 def process_file(json_file):
@@ -60,11 +198,16 @@ def process_file(json_file):
     try:
         justsdk.print_info(f"Processing '{json_file.name}'...")
 
-        openapi_data = justsdk.read_file(json_file, use_orjson=True)
-        modified_data = add_mint_fields(openapi_data)
+        with run_metrics.time_stage(ADD_MINT_STAGE):
+            added = splice_mint_fields(json_file)
+        run_metrics.increment("x_mint_fields_added", len(added))
 
-        justsdk.write_file(modified_data, json_file, use_orjson=True, atomic=True)
-        justsdk.print_success(f"Successfully processed '{json_file.name}'!")
+        if added:
+            justsdk.print_success(f"Successfully processed '{json_file.name}'!")
+        else:
+            justsdk.print_success(
+                f"'{json_file.name}' already has x-mint on every operation, left unchanged"
+            )
         return True
 
     except Exception as e:
@@ -72,9 +215,11 @@ def process_file(json_file):
         return False
 
 
-def process_reference_files(reference_dir=None):
+def process_reference_files(reference_dir=None, force=False):
     """
     Process all JSON files in the reference folder and its subdirectories (pro, demo).
+    Specs that are unchanged since they were last processed are skipped,
+    unless `force` is set.
     """
     if reference_dir is None:
         reference_dir = Path(DEFAULT_REFERENCE_DIR)
@@ -98,11 +243,19 @@ def process_reference_files(reference_dir=None):
         relative_path = file.relative_to(reference_dir)
         print(f"  - {relative_path}")
 
+    state = MintState.load()
     success_count = 0
 
     for json_file in json_files:
-        if process_file(json_file):
+        if not force and state.is_current(json_file):
+            justsdk.print_info(f"'{json_file.name}' is unchanged, skipping...")
+            run_metrics.increment("specs_skipped")
             success_count += 1
+        elif process_file(json_file):
+            state.record(json_file)
+            success_count += 1
+
+    state.save()
 
     justsdk.print_info(
         f"\nCompleted processing {success_count}/{len(json_files)} files successfully!"
@@ -0,0 +1,212 @@
+import re
+
+from collections import namedtuple
+
+CalloutKind = namedtuple("CalloutKind", ["name", "pattern", "keyword", "terminator"])
+
+# A callout ends at a blank line followed by plain text or by a callout of
+# another kind, or at the end of the content
+NOTICE = CalloutKind(
+    "notice",
+    re.compile(
+        r"(>\s*🚧.*?(?:Notice|Warning).*?)(?=\n\n>\s*[👍📘]|\n\n[^>]|\Z)",
+        re.MULTILINE | re.DOTALL,
+    ),
+    re.compile(r"Notice|Warning"),
+    re.compile(r"(?=\n\n>\s*[👍📘]|\n\n[^>]|\Z)"),
+)
+TIPS = CalloutKind(
+    "tips",
+    re.compile(
+        r"(>\s*👍.*?Tips.*?)(?=\n\n>\s*[📘🚧]|\n\n[^>]|\Z)",
+        re.MULTILINE | re.DOTALL,
+    ),
+    re.compile(r"Tips"),
+    re.compile(r"(?=\n\n>\s*[📘🚧]|\n\n[^>]|\Z)"),
+)
+NOTES = CalloutKind(
+    "notes",
+    re.compile(
+        r"(>\s*📘.*?Notes.*?)(?=\n\n>\s*[👍🚧]|\n\n[^>]|\Z)",
+        re.MULTILINE | re.DOTALL,
+    ),
+    re.compile(r"Notes"),
+    re.compile(r"(?=\n\n>\s*[👍🚧]|\n\n[^>]|\Z)"),
+)
+
+# Callouts are emitted in this order: Notice, Tips, Notes
+CALLOUT_KINDS = [NOTICE, TIPS, NOTES]
+CALLOUT_KINDS_BY_EMOJI = {"🚧": NOTICE, "👍": TIPS, "📘": NOTES}
+
+CALLOUT_START_PATTERN = re.compile(r">\s*([🚧👍📘])")
+BULLET_PATTERN = re.compile(r"^(\s*)\*\s+")
+QUOTE_TRANSLATION = str.maketrans({"‘": "'", "’": "'", "“": '"', "”": '"'})
+
+
+def scan_callouts(content):
+    """
+    Find every Notice, Tips and Notes blockquote in one scan of the content.
+    Returns the unique callout blocks in Notice, Tips, Notes order.
+    """
+    blocks = {kind.name: [] for kind in CALLOUT_KINDS}
+    # Callouts of one kind never overlap, so each kind resumes its search
+    # after the end of its previous callout
+    resume_at = {kind.name: 0 for kind in CALLOUT_KINDS}
+
+    for start_match in CALLOUT_START_PATTERN.finditer(content):
+        kind = CALLOUT_KINDS_BY_EMOJI[start_match.group(1)]
+        start = start_match.start()
+
+        if start < resume_at[kind.name]:
+            continue
+
+        keyword_match = kind.keyword.search(content, start_match.end())
+        if keyword_match is None:
+            continue
+
+        end = kind.terminator.search(content, keyword_match.end()).start()
+        blocks[kind.name].append(content[start:end])
+        resume_at[kind.name] = end
+
+    unique_blocks = []
+    for kind in CALLOUT_KINDS:
+        for block in blocks[kind.name]:
+            if block not in unique_blocks:
+                unique_blocks.append(block)
+
+    return unique_blocks
+
+
+def is_callout_header(line):
+    """
+    Check whether a line is blank or the emoji title line of a callout.
+    """
+    return (
+        line.strip() == ""
+        or "👍" in line
+        and "Tips" in line
+        or "📘" in line
+        and "Notes" in line
+        or "🚧" in line
+        and ("Notice" in line or "Warning" in line)
+    )
+
+
+def render_callout(block):
+    """
+    Convert a single blockquote callout to a Mintlify MDX component.
+    """
+    # Check the content for section type
+    if "👍" in block or "Tips" in block:
+        component_type = "Tip"
+        title = "Tips"
+    elif "📘" in block or "Notes" in block:
+        component_type = "Note"
+        title = "Note"
+    elif "🚧" in block or "Notice" in block or "Warning" in block:
+        component_type = "Warning"
+        title = "Notice"
+    else:
+        component_type = "Note"
+        title = "Note"
+
+    cleaned_lines = []
+
+    # Skip the header line (first line with emoji and title)
+    content_started = False
+
+    for line in block.split("\n"):
+        # Remove leading > and minimal whitespace
+        if line.startswith(">"):
+            line = line[2:] if line[1:2].isspace() else line[1:]
+
+        if not content_started:
+            if is_callout_header(line):
+                continue
+            content_started = True
+
+        # Convert * to - for consistency, preserving indentation
+        line = BULLET_PATTERN.sub(r"\1- ", line)
+
+        line = line.translate(QUOTE_TRANSLATION)
+
+        # Remove extra escaping from quotes in URLs/text
+        line = line.replace('`"', '"').replace('"`', '"')
+
+        cleaned_lines.append(line)
+
+    component_content = "\n".join(cleaned_lines).strip()
+
+    # Indent the content by 2 spaces for proper MDX formatting
+    indented_content = "\n".join(
+        "  " + line if line.strip() else line for line in component_content.split("\n")
+    )
+
+    return (
+        f"<{component_type}>\n  ### {title}\n\n{indented_content}\n</{component_type}>"
+    )
+
+
+def extract_tips_and_notes(content):
+    """
+    Extract Tips, Notes, and Notice sections from markdown content.
+    """
+    return "\n\n".join(scan_callouts(content))
+
+
+def convert_blockquote_to_component(content):
+    """
+    Convert blockquote-style Tips, Notes, and Notice to Mintlify MDX components.
+    """
+    converted_content = content
+
+    for kind in CALLOUT_KINDS:
+        converted_content = kind.pattern.sub(
+            lambda match: render_callout(match.group(0)), converted_content
+        )
+
+    return converted_content
+
+
+def can_render_independently(blocks):
+    """
+    Check whether converting the joined callouts block by block gives the
+    same result as the pattern-by-pattern conversion of the joined text.
+
+    That holds when each kind has at most one callout (otherwise adjacent
+    callouts of one kind merge), no callout ends with a newline (which would
+    end it early once joined), and no callout start marker appears anywhere
+    but at the start of each block, before or after rendering.
+    """
+    kinds = [
+        CALLOUT_KINDS_BY_EMOJI[CALLOUT_START_PATTERN.match(b).group(1)] for b in blocks
+    ]
+
+    if len(set(kinds)) != len(kinds):
+        return False
+
+    return not any(
+        block.endswith("\n") or CALLOUT_START_PATTERN.search(block, 1)
+        for block in blocks
+    )
+
+
+def convert_callouts(content):
+    """
+    Extract the Notice, Tips and Notes callouts from markdown content and
+    convert them to Mintlify MDX components in a single pass.
+    Equivalent to convert_blockquote_to_component(extract_tips_and_notes(content)).
+    """
+    blocks = scan_callouts(content)
+
+    if not blocks:
+        return ""
+
+    if can_render_independently(blocks):
+        components = [render_callout(block) for block in blocks]
+
+        if not any(CALLOUT_START_PATTERN.search(c) for c in components):
+            return "\n\n".join(components)
+
+    # Irregular callouts fall back to converting the joined text pattern by pattern
+    return convert_blockquote_to_component("\n\n".join(blocks))
@@ -1,21 +1,22 @@
 import argparse
 import sys
-import justsdk
 
 from pathlib import Path
-from .add_mint import (
-    process_reference_files as add_mint_process_files,
-    process_file as add_mint_process_file,
-)
-from .convert_md_to_mdx import (
-    process_reference_files as convert_md_process_files,
-    process_file as convert_md_process_file,
-    process_demo_files,
-    process_pro_files,
-    process_mode_files,
-)
+
+# Subcommand dependencies (requests, justsdk, orjson, ...) are imported when
+# the subcommand runs, so --help and add-mint start without loading them all
 from ._constants import (
     DEFAULT_REFERENCE_DIR,
+    DEFAULT_MDX_DIR,
+    DEFAULT_JOBS,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_CACHE_DIR,
+    WATCH_INTERVAL,
+    WATCH_DEBOUNCE,
+    DEFAULT_CONVERT_WORKERS,
+    PIPELINE_QUEUE_SIZE,
+    WRITE_BATCH_SIZE,
+    PROFILE_TOP,
     JSON_EXTENSION,
     DEMO_MODE,
     PRO_MODE,
@@ -23,6 +24,98 @@ from ._constants import (
 )
 
 
+def positive_int(value):
+    """
+    Argparse type for options that need a positive integer.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not an integer")
+
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"'{value}' must be at least 1")
+    return number
+
+
+def non_negative_int(value):
+    """
+    Argparse type for options that accept zero or a positive integer.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not an integer")
+
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"'{value}' must not be negative")
+    return number
+
+
+def positive_float(value):
+    """
+    Argparse type for options that need a positive number of seconds.
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{value}' is not a number")
+
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"'{value}' must be greater than 0")
+    return number
+
+
+def rate_limit(value):
+    """
+    Argparse type for '[HOST=]RATE[:BURST[:CONCURRENCY]]' rate limits.
+    """
+    from .rate_limiter import parse_rate_limit
+
+    try:
+        return parse_rate_limit(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def load_fetcher(create_fetcher, fetcher_options):
+    """
+    Create the fetcher, exiting with an error if its source cannot be read.
+    """
+    import justsdk
+
+    try:
+        return create_fetcher(**fetcher_options)
+    except (OSError, ValueError) as e:
+        justsdk.print_error(f"Error: Cannot read markdown source: {e}")
+        sys.exit(1)
+
+
+def convert_mdx_paths(args):
+    """
+    Get the spec files convert-mdx reads and the directories it writes MDX
+    to, resolving the defaults each way of running it uses.
+    """
+    reference_dir = Path(args.dir)
+
+    if args.file:
+        output_dir = Path(args.output) if args.output else Path(args.file).parent
+        return [Path(args.file)], [output_dir]
+
+    if args.api_mode or args.all_modes:
+        modes = [args.api_mode] if args.api_mode else VALID_MODES
+        output_dir = Path(args.output or DEFAULT_MDX_DIR)
+        spec_files = [
+            json_file
+            for mode in modes
+            for json_file in (reference_dir / mode).glob(f"*{JSON_EXTENSION}")
+        ]
+        return spec_files, [output_dir / mode for mode in modes]
+
+    output_dir = Path(args.output) if args.output else reference_dir
+    return list(reference_dir.glob(f"*{JSON_EXTENSION}")), [output_dir]
+
+
 def create_parser():
     parser = argparse.ArgumentParser(
         description="CLI to process OAS for Mintlify",
@@ -31,7 +124,7 @@ def create_parser():
 
     parser.add_argument(
         "mode",
-        choices=["add-mint", "convert-mdx"],
+        choices=["add-mint", "convert-mdx", "watch", "refresh-frontmatter"],
         help="Choose the processing mode",
     )
 
@@ -60,6 +153,175 @@ def create_parser():
         help=f"API mode to process: {', '.join(VALID_MODES)} (only for convert-mdx mode)",
     )
 
+    parser.add_argument(
+        "--all-modes",
+        action="store_true",
+        help="Convert the specs of every API mode in one run on a process pool (only for convert-mdx mode)",
+    )
+
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Process every spec, including those unchanged since the last run (only for add-mint mode)",
+    )
+
+    parser.add_argument(
+        "--share-pages",
+        action="store_true",
+        help="With --all-modes, convert the union of every mode's operations in one process, fetching and converting pages that modes share once",
+    )
+
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=positive_int,
+        help="Number of worker processes for add-mint and --all-modes (default: one per CPU, up to the number of files)",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=positive_int,
+        default=DEFAULT_JOBS,
+        help=f"Number of markdown pages to fetch concurrently (default: {DEFAULT_JOBS}, only for convert-mdx mode)",
+    )
+
+    parser.add_argument(
+        "--pool-size",
+        type=positive_int,
+        help="Number of pooled HTTP connections to keep alive (default: same as --jobs, only for convert-mdx mode)",
+    )
+
+    parser.add_argument(
+        "--retries",
+        type=non_negative_int,
+        default=DEFAULT_MAX_RETRIES,
+        help=f"Retries per page on connection errors, 429 and 5xx responses (default: {DEFAULT_MAX_RETRIES}, only for convert-mdx mode)",
+    )
+
+    parser.add_argument(
+        "--request-budget",
+        type=positive_int,
+        help="Maximum number of HTTP requests for the whole run, retries included (only for convert-mdx mode)",
+    )
+
+    parser.add_argument(
+        "--convert-workers",
+        type=positive_int,
+        default=DEFAULT_CONVERT_WORKERS,
+        help=f"Number of threads converting fetched markdown while other pages download (default: {DEFAULT_CONVERT_WORKERS}, only for convert-mdx mode)",
+    )
+
+    parser.add_argument(
+        "--queue-size",
+        type=positive_int,
+        default=PIPELINE_QUEUE_SIZE,
+        help=f"Maximum number of pages waiting between the fetch, convert and write stages (default: {PIPELINE_QUEUE_SIZE}, only for convert-mdx mode)",
+    )
+
+    parser.add_argument(
+        "--write-batch",
+        type=positive_int,
+        default=WRITE_BATCH_SIZE,
+        help=f"Maximum number of MDX files written per batch (default: {WRITE_BATCH_SIZE}, only for convert-mdx mode)",
+    )
+
+    parser.add_argument(
+        "--swap-output",
+        action="store_true",
+        help="Stage the MDX of each mode in a temporary directory and swap it in once complete (only for convert-mdx mode, not with --all-modes)",
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip operations completed by an interrupted or failed run of the same specs and converter version (only for convert-mdx mode, not with --swap-output)",
+    )
+
+    parser.add_argument(
+        "--rate-limit",
+        type=rate_limit,
+        action="append",
+        metavar="[HOST=]RATE[:BURST[:CONCURRENCY]]",
+        help="Pace requests to a host, or to every host without HOST=, at RATE requests per second; the rate adapts to 429 responses and rate-limit headers (repeatable, only for convert-mdx and watch modes)",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=DEFAULT_CACHE_DIR,
+        help=f"Directory for cached markdown pages (default: {DEFAULT_CACHE_DIR}, only for convert-mdx mode)",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always download markdown pages without using the cache (only for convert-mdx mode)",
+    )
+
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Serve markdown pages only from the cache, without network access (only for convert-mdx mode)",
+    )
+
+    parser.add_argument(
+        "--source",
+        type=str,
+        help="Read markdown pages from a local directory, tarball or JSONL bundle instead of fetching them (only for convert-mdx and watch modes)",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only rewrite MDX whose inputs changed and remove MDX of deleted operations (only for convert-mdx mode)",
+    )
+
+    parser.add_argument(
+        "--interval",
+        type=positive_float,
+        default=WATCH_INTERVAL,
+        help=f"Seconds between polls of the reference specs (default: {WATCH_INTERVAL}, only for watch mode)",
+    )
+
+    parser.add_argument(
+        "--debounce",
+        type=positive_float,
+        default=WATCH_DEBOUNCE,
+        help=f"Seconds a changed spec must stay unchanged before it is processed (default: {WATCH_DEBOUNCE}, only for watch mode)",
+    )
+
+    parser.add_argument(
+        "--report",
+        type=str,
+        help="Write a JSON report with per-stage timings, counters and the slowest operations",
+    )
+
+    parser.add_argument(
+        "--prometheus",
+        type=str,
+        help="Write the run metrics as a Prometheus textfile",
+    )
+
+    parser.add_argument(
+        "--profile",
+        choices=["cpu", "mem"],
+        help="Profile the run with cProfile (cpu) or tracemalloc (mem); worker processes are not profiled",
+    )
+
+    parser.add_argument(
+        "--profile-output",
+        type=str,
+        help="File for the profile (default: profile.prof for cpu, profile-mem.txt for mem)",
+    )
+
+    parser.add_argument(
+        "--profile-top",
+        type=positive_int,
+        default=PROFILE_TOP,
+        help=f"Number of functions or allocation sites listed in the profile report (default: {PROFILE_TOP})",
+    )
+
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Enable verbose output"
     )
@@ -70,37 +332,230 @@ def create_parser():
 def main():
     parser = create_parser()
     args = parser.parse_args()
+    client = None
+
+    import justsdk
+    from .metrics import run_metrics, QUEUE_STAGE
+
+    run_metrics.reset()
+
+    fetcher_options = {
+        "jobs": args.jobs,
+        "pool_size": args.pool_size,
+        "max_retries": args.retries,
+        "budget": args.request_budget,
+        "cache_dir": None if args.no_cache else args.cache_dir,
+        "offline": args.offline,
+        "source": args.source,
+        "rate_limits": dict(args.rate_limit) if args.rate_limit else None,
+    }
+
+    if args.offline and args.no_cache:
+        justsdk.print_error("Error: --offline cannot be combined with --no-cache.")
+        sys.exit(1)
+
+    if args.source:
+        from .markdown_bundle import bundle_format
+
+        if bundle_format(args.source) is None:
+            justsdk.print_error(
+                f"Error: Source '{args.source}' is not a directory, tarball or JSONL bundle."
+            )
+            sys.exit(1)
 
     if args.mode == "add-mint":
+        from .add_mint import (
+            process_reference_files as add_mint_process_files,
+            process_file as add_mint_process_file,
+        )
+
         justsdk.print_info("Starting OpenAPI x-mint field processor...")
         process_file_func = add_mint_process_file
-        process_files_func = add_mint_process_files
+
+        if args.workers == 1:
+
+            def process_files_func(reference_dir=None):
+                """Process files one after another."""
+                return add_mint_process_files(reference_dir, args.force)
+        else:
+
+            def process_files_func(reference_dir=None):
+                """Process files on a process pool."""
+                from .parallel import add_mint_parallel
+
+                return add_mint_parallel(reference_dir, args.workers, args.force)
     elif args.mode == "convert-mdx":
+        from .convert_md_to_mdx import (
+            process_reference_files as convert_md_process_files,
+            process_file as convert_md_process_file,
+            process_demo_files,
+            process_pro_files,
+            process_mode_files,
+        )
+        from .fetcher import create_fetcher
+
         justsdk.print_info("Starting OpenAPI markdown to MDX converter...")
 
+        if args.all_modes and (args.api_mode or args.file):
+            justsdk.print_error(
+                "Error: --all-modes cannot be combined with --api-mode or --file."
+            )
+            sys.exit(1)
+
+        if args.share_pages and not args.all_modes:
+            justsdk.print_error("Error: --share-pages requires --all-modes.")
+            sys.exit(1)
+
+        # Concurrent workers would each swap the directory in turn
+        if args.all_modes and args.swap_output and not args.share_pages:
+            justsdk.print_error(
+                "Error: --swap-output cannot be combined with --all-modes, unless --share-pages is used."
+            )
+            sys.exit(1)
+
+        # Swapping replaces the output directory as a whole, which must not
+        # be the directory of the specs being read
+        if args.swap_output:
+            from .output_sink import contains_path
+
+            spec_files, output_dirs = convert_mdx_paths(args)
+            if any(
+                contains_path(output_dir, spec_file)
+                for output_dir in output_dirs
+                for spec_file in spec_files
+            ):
+                justsdk.print_error(
+                    "Error: --swap-output cannot write to the directory of the specs; "
+                    "choose another directory with --output."
+                )
+                sys.exit(1)
+
+        if args.resume and args.swap_output:
+            justsdk.print_error(
+                "Error: --resume cannot be combined with --swap-output."
+            )
+            sys.exit(1)
+
+        from .pipeline import PipelineSettings
+
+        pipeline = PipelineSettings(
+            args.convert_workers,
+            args.queue_size,
+            args.write_batch,
+            args.swap_output,
+            args.resume,
+        )
+
+        # --all-modes builds one fetcher per worker process instead
+        if not args.all_modes or args.share_pages:
+            fetcher = load_fetcher(create_fetcher, fetcher_options)
+            client = fetcher.client
+
         def _process_demo_file(file_path, output_dir=None):
             """Process a single file in demo mode."""
-            return convert_md_process_file(file_path, output_dir, DEMO_MODE)
+            return convert_md_process_file(
+                file_path, output_dir, DEMO_MODE, fetcher, args.incremental, pipeline
+            )
 
         def _process_pro_file(file_path, output_dir=None):
             """Process a single file in pro mode."""
-            return convert_md_process_file(file_path, output_dir, PRO_MODE)
+            return convert_md_process_file(
+                file_path, output_dir, PRO_MODE, fetcher, args.incremental, pipeline
+            )
+
+        def _process_file(file_path, output_dir=None):
+            """Process a single file without a specific mode."""
+            return convert_md_process_file(
+                file_path, output_dir, None, fetcher, args.incremental, pipeline
+            )
+
+        def _process_demo_files(reference_dir=None, output_dir=None):
+            """Process demo files."""
+            return process_demo_files(
+                reference_dir, output_dir, fetcher, args.incremental, pipeline
+            )
+
+        def _process_pro_files(reference_dir=None, output_dir=None):
+            """Process pro files."""
+            return process_pro_files(
+                reference_dir, output_dir, fetcher, args.incremental, pipeline
+            )
+
+        def _process_files(reference_dir=None, output_dir=None):
+            """Process files without a specific mode."""
+            return convert_md_process_files(
+                reference_dir, output_dir, None, fetcher, args.incremental, pipeline
+            )
 
         if args.api_mode == DEMO_MODE:
             process_file_func = _process_demo_file
-            process_files_func = process_demo_files
+            process_files_func = _process_demo_files
         elif args.api_mode == PRO_MODE:
             process_file_func = _process_pro_file
-            process_files_func = process_pro_files
+            process_files_func = _process_pro_files
         else:
-            process_file_func = convert_md_process_file
-            process_files_func = convert_md_process_files
+            process_file_func = _process_file
+            process_files_func = _process_files
+    elif args.mode == "watch":
+        from .fetcher import create_fetcher
+        from .watch import SpecWatcher
+
+        justsdk.print_info("Starting OpenAPI spec watcher...")
+
+        if args.file or args.all_modes:
+            justsdk.print_error(
+                "Error: watch mode cannot be combined with --file or --all-modes."
+            )
+            sys.exit(1)
+
+        fetcher = load_fetcher(create_fetcher, fetcher_options)
+        client = fetcher.client
+        watcher = SpecWatcher(
+            fetcher,
+            args.dir,
+            args.output,
+            [args.api_mode] if args.api_mode else None,
+            args.interval,
+            args.debounce,
+        )
+    elif args.mode == "refresh-frontmatter":
+        from .frontmatter import refresh_frontmatter
+
+        justsdk.print_info("Starting MDX frontmatter refresh...")
+
+        if args.file:
+            justsdk.print_error(
+                "Error: refresh-frontmatter mode cannot be combined with --file."
+            )
+            sys.exit(1)
     else:
         justsdk.print_error(f"Unknown mode: {args.mode}")
         sys.exit(1)
 
+    profile = None
+    if args.profile:
+        from .profiling import RunProfile
+
+        uses_pool = args.workers != 1 and (
+            args.mode == "add-mint" or (args.all_modes and not args.share_pages)
+        )
+        if uses_pool and not args.file:
+            justsdk.print_warning(
+                "Worker processes are not profiled; use --workers 1 "
+                "(or --share-pages with --all-modes) to profile the whole run."
+            )
+
+        profile = RunProfile(args.profile, args.profile_output, args.profile_top)
+        profile.start()
+
     try:
-        if args.file:
+        if args.mode == "watch":
+            watcher.run()
+        elif args.mode == "refresh-frontmatter":
+            modes = [args.api_mode] if args.api_mode else None
+            if not refresh_frontmatter(args.dir, args.output, modes):
+                sys.exit(1)
+        elif args.file:
             file_path = Path(args.file)
             if not file_path.exists():
                 justsdk.print_error(f"Error: File '{file_path}' does not exist.")
@@ -122,11 +577,45 @@ def main():
                 justsdk.print_error(f"Failed to process '{file_path.name}'.")
                 sys.exit(1)
         else:
-            if args.mode == "convert-mdx" and args.api_mode:
+            if args.mode == "convert-mdx" and args.share_pages:
+                from .mode_planner import convert_shared_modes
+
+                success = convert_shared_modes(
+                    args.dir,
+                    args.output,
+                    fetcher,
+                    incremental=args.incremental,
+                    pipeline=pipeline,
+                )
+            elif args.mode == "convert-mdx" and args.all_modes:
+                from .parallel import convert_all_modes
+
+                success = convert_all_modes(
+                    args.dir,
+                    args.output,
+                    args.workers,
+                    fetcher_options,
+                    args.incremental,
+                    pipeline,
+                )
+            elif args.mode == "convert-mdx" and args.api_mode:
                 if args.output:
-                    success = process_mode_files(args.api_mode, args.dir, args.output)
+                    success = process_mode_files(
+                        args.api_mode,
+                        args.dir,
+                        args.output,
+                        fetcher,
+                        args.incremental,
+                        pipeline,
+                    )
                 else:
-                    success = process_mode_files(args.api_mode, args.dir)
+                    success = process_mode_files(
+                        args.api_mode,
+                        args.dir,
+                        fetcher=fetcher,
+                        incremental=args.incremental,
+                        pipeline=pipeline,
+                    )
             elif args.mode == "convert-mdx" and args.output:
                 success = process_files_func(args.dir, args.output)
             else:
@@ -147,3 +636,25 @@ def main():
 
             traceback.print_exc()
         sys.exit(1)
+
+    finally:
+        if profile is not None:
+            profile.stop()
+
+        queue = run_metrics.stages.get(QUEUE_STAGE)
+        if queue:
+            justsdk.print_info(
+                f"Waited {queue['total_seconds']:.1f}s for rate limits "
+                f"across {queue['count']} request(s)"
+            )
+
+        if client is not None:
+            justsdk.print_info(
+                f"Made {client.requests_made} HTTP request(s), {client.retries} of them retries"
+            )
+            client.close()
+
+        if args.report:
+            run_metrics.write_report(args.report)
+        if args.prometheus:
+            run_metrics.write_prometheus(args.prometheus)
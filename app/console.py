@@ -0,0 +1,26 @@
+import threading
+import justsdk
+
+# justsdk prints a line and its newline in two writes, so lines printed by
+# threads at the same time can run together; they are printed whole under
+# this lock instead
+_print_lock = threading.Lock()
+
+
+def _locked(print_func):
+    def locked_print(message, **kwargs):
+        with _print_lock:
+            print_func(message, **kwargs)
+
+    locked_print.__name__ = print_func.__name__
+    locked_print.__doc__ = print_func.__doc__
+    return locked_print
+
+
+# Drop-in replacements for justsdk's print helpers, for code that runs in the
+# fetch, convert and write threads of the pipeline
+print_success = _locked(justsdk.print_success)
+print_warning = _locked(justsdk.print_warning)
+print_error = _locked(justsdk.print_error)
+print_info = _locked(justsdk.print_info)
+print_debug = _locked(justsdk.print_debug)
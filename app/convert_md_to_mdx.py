@@ -1,208 +1,167 @@
-import re
-import requests
 import justsdk
 
+from collections import namedtuple
 from pathlib import Path
+from . import console
+from .callouts import (
+    convert_blockquote_to_component,
+    scan_callouts,
+    can_render_independently,
+    render_callout,
+    CALLOUT_START_PATTERN,
+    # Re-exported for callers that imported them from this module
+    convert_callouts as convert_callouts,
+    extract_tips_and_notes as extract_tips_and_notes,
+)
+from .fetcher import MarkdownFetcher, shared_fetcher
+from .journal import RunJournal
+from .memo import LRUMemo
+from .output_sink import OutputSink, contains_path
+from .pipeline import PipelineSettings, run_pipeline
+from .reference_links import (
+    ReferenceLinkRewriter,
+    count_code_links,
+    known_operation_ids,
+    reference_target,
+    CODE_LINK_START,
+)
+from .frontmatter import render_frontmatter, render_openapi_line
+from .operation_index import OperationIndex, find_operation
+from .metrics import (
+    run_metrics,
+    operation_key,
+    PARSE_STAGE,
+    CONVERT_STAGE,
+    WRITE_STAGE,
+)
+from .manifest import (
+    OutputManifest,
+    hash_bytes,
+    ADDED,
+    CHANGED,
+    UNCHANGED,
+    DELETED,
+)
 from ._constants import (
-    HTTP_METHODS,
     DEFAULT_REFERENCE_DIR,
-    COINGECKO_DOCS_BASE_URL,
-    COINGECKO_DEMO_DOCS_BASE_URL,
-    REQUEST_TIMEOUT,
     DEMO_MODE,
     PRO_MODE,
     VALID_MODES,
     DEFAULT_MDX_DIR,
+    BLOCK_MEMO_SIZE,
 )
 
+# Demo and pro pages share most callouts, so rendered blocks are reused across
+# operations and modes, and converted blocks across operations
+callout_memo = LRUMemo("callout_memo", BLOCK_MEMO_SIZE)
+block_memo = LRUMemo("block_memo", BLOCK_MEMO_SIZE)
+link_rewriter = ReferenceLinkRewriter()
+
 
-def extract_tips_and_notes(content):
+def convert_reference_links(content, mode=None):
     """
-    Extract Tips, Notes, and Notice sections from markdown content.
+    Convert relative reference links to full CoinGecko documentation URLs.
+    Uses different base URLs for demo and pro modes.
     """
-    patterns = [
-        # Capture Notice section
-        ("notice", r"(>\s*🚧.*?(?:Notice|Warning).*?)(?=\n\n>\s*[👍📘]|\n\n[^>]|\Z)"),
-        # Capture Tips section
-        ("tips", r"(>\s*👍.*?Tips.*?)(?=\n\n>\s*[📘🚧]|\n\n[^>]|\Z)"),
-        # Capture Notes section
-        ("notes", r"(>\s*📘.*?Notes.*?)(?=\n\n>\s*[👍🚧]|\n\n[^>]|\Z)"),
-    ]
-
-    # Dictionary to store matches by type
-    matches_by_type = {"notice": [], "tips": [], "notes": []}
-
-    for section_type, pattern in patterns:
-        matches = re.findall(pattern, content, flags=re.MULTILINE | re.DOTALL)
-        if matches:
-            matches_by_type[section_type].extend(matches)
+    rewritten, _ = link_rewriter.rewrite(content, [mode])
+    return rewritten[mode]
 
-    # Combine matches in the desired order: Notice, Tips, Notes
-    all_matches = []
-    for section_type in ["notice", "tips", "notes"]:
-        all_matches.extend(matches_by_type[section_type])
 
-    if not all_matches:
-        return ""
-
-    unique_matches = []
-    for match in all_matches:
-        if match not in unique_matches:
-            unique_matches.append(match)
-
-    return "\n\n".join(unique_matches)
-
-
-def convert_blockquote_to_component(content):
+def render_callout_block(block):
     """
-    Convert blockquote-style Tips, Notes, and Notice to Mintlify MDX components.
+    Render a single callout block as an MDX component, before link resolution.
+    Returns (component, standalone): standalone is False when the block could
+    change the conversion of its neighbours once the blocks are joined.
     """
+    component = render_callout(block)
+    # Only code links can span lines, so every one of them must open and
+    # close inside this component
+    standalone = component.count(CODE_LINK_START) == count_code_links(
+        component
+    ) and not CALLOUT_START_PATTERN.search(component)
 
-    def process_blockquote_match(match):
-        """Process a single blockquote match and convert it to MDX component."""
-        full_match = match.group(0)
-
-        # Check the content for section type
-        if "👍" in full_match or "Tips" in full_match:
-            component_type = "Tip"
-            title = "Tips"
-        elif "📘" in full_match or "Notes" in full_match:
-            component_type = "Note"
-            title = "Note"
-        elif "🚧" in full_match or "Notice" in full_match or "Warning" in full_match:
-            component_type = "Warning"
-            title = "Notice"
-        else:
-            component_type = "Note"
-            title = "Note"
-
-        # Process the entire content, removing blockquote markers
-        lines = full_match.split("\n")
-        cleaned_lines = []
-
-        # Skip the header line (first line with emoji and title)
-        content_started = False
-
-        for line in lines:
-            # Remove leading > and minimal whitespace
-            cleaned_line = re.sub(r"^>\s?", "", line)
-
-            if not content_started:
-                if (
-                    cleaned_line.strip() == ""
-                    or "👍" in cleaned_line
-                    and "Tips" in cleaned_line
-                    or "📘" in cleaned_line
-                    and "Notes" in cleaned_line
-                    or "🚧" in cleaned_line
-                    and ("Notice" in cleaned_line or "Warning" in cleaned_line)
-                ):
-                    continue
-                content_started = True
-
-            # Convert * to - for consistency, preserving indentation
-            cleaned_line = re.sub(r"^(\s*)\*\s+", r"\1- ", cleaned_line)
-
-            cleaned_line = cleaned_line.replace("‘", "'")
-            cleaned_line = cleaned_line.replace("’", "'")
-            cleaned_line = cleaned_line.replace("“", '"')
-            cleaned_line = cleaned_line.replace("”", '"')
-
-            # Remove extra escaping from quotes in URLs/text
-            cleaned_line = cleaned_line.replace('`"', '"').replace('"`', '"')
-
-            cleaned_lines.append(cleaned_line)
-
-        component_content = "\n".join(cleaned_lines).strip()
-
-        # Indent the content by 2 spaces for proper MDX formatting
-        indented_lines = []
-        for line in component_content.split("\n"):
-            if line.strip():  # Only indent non-empty lines
-                indented_lines.append("  " + line)
-            else:
-                indented_lines.append(line)
-        indented_content = "\n".join(indented_lines)
-
-        mdx_component = f"<{component_type}>\n  ### {title}\n\n{indented_content}\n</{component_type}>"
+    return component, standalone
 
-        return mdx_component
 
-    # Process patterns in the desired order: Notice, Tips, Notes
-    patterns = [
-        r"(>\s*🚧.*?(?:Notice|Warning).*?)(?=\n\n>\s*[👍📘]|\n\n[^>]|\Z)",
-        r"(>\s*👍.*?Tips.*?)(?=\n\n>\s*[📘🚧]|\n\n[^>]|\Z)",
-        r"(>\s*📘.*?Notes.*?)(?=\n\n>\s*[👍🚧]|\n\n[^>]|\Z)",
-    ]
+def convert_callout_block(block, mode=None):
+    """
+    Convert a single callout block to an MDX component with resolved links.
+    Returns (component, standalone, link targets).
 
-    converted_content = content
+    The rendering is shared by every mode. The links of the other modes are
+    rewritten in the same scan and memoized for their later lookups.
+    """
+    component, standalone = callout_memo.get(block, lambda: render_callout_block(block))
+    modes = [mode] if mode is None else [mode, *(m for m in VALID_MODES if m != mode)]
+    rewritten, targets = link_rewriter.rewrite(component, modes)
 
-    for pattern in patterns:
-        converted_content = re.sub(
-            pattern,
-            process_blockquote_match,
-            converted_content,
-            flags=re.MULTILINE | re.DOTALL,
+    for other_mode in modes[1:]:
+        block_memo.put(
+            (block, other_mode), (rewritten[other_mode], standalone, targets)
         )
 
-    return converted_content
+    return rewritten[mode], standalone, targets
 
 
-def convert_reference_links(content, mode=None):
+def convert_callouts_and_links(content, mode=None):
     """
-    Convert relative reference links to full CoinGecko documentation URLs.
-    Uses different base URLs for demo and pro modes.
+    Convert the callouts of markdown content and resolve their reference links.
+    Returns (converted content, link targets); the content is equivalent to
+    convert_reference_links(convert_callouts(content), mode), but regular
+    callout blocks are converted once and then served from block_memo.
     """
-    pattern = r"\[`([^`]+)`\]\(/reference/([^)]+)\)"
-
-    def replace_link(match):
-        endpoint = match.group(1)
-        reference_id = match.group(2)
+    blocks = scan_callouts(content)
 
-        if mode == DEMO_MODE:
-            base_url = COINGECKO_DEMO_DOCS_BASE_URL
-        else:
-            base_url = COINGECKO_DOCS_BASE_URL
+    if not blocks:
+        return "", []
 
-        return f"[`{endpoint}`](<{base_url}/{reference_id}>)"
+    if can_render_independently(blocks):
+        converted = [
+            block_memo.get(
+                (block, mode), lambda block=block: convert_callout_block(block, mode)
+            )
+            for block in blocks
+        ]
 
-    converted_content = re.sub(pattern, replace_link, content)
+        if all(standalone for _, standalone, _ in converted):
+            return (
+                "\n\n".join(component for component, _, _ in converted),
+                [target for _, _, targets in converted for target in targets],
+            )
 
-    return converted_content
+    rewritten, targets = link_rewriter.rewrite(
+        convert_blockquote_to_component("\n\n".join(blocks)), [mode]
+    )
+    return rewritten[mode], targets
 
 
 def find_operation_path_and_method(openapi_data, target_operation_id):
     """
     Find the path and HTTP method for a given operation ID in OpenAPI data.
     Returns tuple of (path, method) or (None, None) if not found.
+    For repeated lookups, build an OperationIndex once and use its find().
     """
-    if "paths" not in openapi_data:
+    ref = find_operation(openapi_data, target_operation_id)
+    if ref is None:
         return None, None
-
-    for path, path_item in openapi_data["paths"].items():
-        for method in HTTP_METHODS:
-            if method in path_item:
-                operation = path_item[method]
-                if (
-                    "operationId" in operation
-                    and operation["operationId"] == target_operation_id
-                ):
-                    return path, method
-
-    return None, None
+    return ref.path, ref.method
 
 
-def convert_md_to_mdx(content, openapi_metadata=None, mode=None):
+def convert_markdown(content, openapi_metadata=None, mode=None):
     """
     Convert markdown content to MDX format with optional OpenAPI frontmatter.
+    Returns (MDX content, targets of its reference links).
     """
-    extracted_content = extract_tips_and_notes(content)
+    converted_content, link_targets = convert_callouts_and_links(content, mode)
+    return add_frontmatter(converted_content, openapi_metadata), link_targets
 
-    if not extracted_content:
-        return ""
 
-    converted_content = convert_blockquote_to_component(extracted_content)
-    converted_content = convert_reference_links(converted_content, mode)
+def add_frontmatter(converted_content, openapi_metadata=None):
+    """
+    Prepend the OpenAPI frontmatter to converted content, if there is any.
+    """
+    if not converted_content:
+        return ""
 
     if openapi_metadata and all(
         key in openapi_metadata for key in ["reference_file", "path", "method"]
@@ -211,146 +170,602 @@ def convert_md_to_mdx(content, openapi_metadata=None, mode=None):
         path = openapi_metadata["path"]
         method = openapi_metadata["method"]
 
-        frontmatter = (
-            f"---\nopenapi: api-reference/{reference_file} {method} {path}\n---\n\n"
+        frontmatter = render_frontmatter(
+            render_openapi_line(reference_file, method, path)
         )
         converted_content = frontmatter + converted_content
 
     return converted_content
 
 
-def fetch_markdown_content(operation_id, mode=None):
+def convert_md_to_mdx(content, openapi_metadata=None, mode=None):
     """
-    Fetch markdown content from CoinGecko docs for a given operation ID.
-    Uses different base URLs for demo and pro modes.
+    Convert markdown content to MDX format with optional OpenAPI frontmatter.
     """
-    if mode == DEMO_MODE:
-        base_url = COINGECKO_DEMO_DOCS_BASE_URL
-    else:
-        base_url = COINGECKO_DOCS_BASE_URL
+    return convert_markdown(content, openapi_metadata, mode)[0]
 
-    url = f"{base_url}/{operation_id}.md"
 
-    try:
-        response = requests.get(url, timeout=REQUEST_TIMEOUT)
-        response.raise_for_status()
+def report_unknown_references(operation_id, link_targets, known_ids):
+    """
+    Warn about reference links that point to no known operation.
+    Returns the number of unknown targets.
+    """
+    unknown = sorted(
+        {target for target in link_targets if reference_target(target) not in known_ids}
+    )
 
-        justsdk.print_success(
-            f"Fetched markdown content for '{operation_id}' from {base_url}"
+    for target in unknown:
+        console.print_warning(
+            f"'{operation_id}.md' links to unknown reference '/reference/{target}'"
         )
-        return response.text
 
-    except requests.exceptions.RequestException as e:
-        justsdk.print_error(f"Failed to fetch '{operation_id}.md' from {base_url}: {e}")
-        return None
+    if unknown:
+        run_metrics.increment("unknown_reference_links", len(unknown))
+    return len(unknown)
+
+
+def convert_operations(
+    openapi_data, sources, mode=None, spec_name=None, known_ids=None
+):
+    """
+    Convert markdown pages in memory, without touching the filesystem.
+    `sources` is a mapping or an iterable of (operation_id, markdown) pairs,
+    and `openapi_data` the parsed spec they belong to (or its
+    OperationIndex). Frontmatter is added when `spec_name` names the spec
+    file, e.g. "coingecko-pro.json".
+
+    Lazily yields (operation_id, mdx_text, metadata) for every source, where
+    mdx_text is empty when the page has nothing to convert and metadata holds
+    the operation's path and method (None when it is not in the spec), the
+    mode and the targets of its reference links. With `known_ids`, links to
+    unknown operations are also listed under "unknown_links".
+    """
+    if isinstance(openapi_data, OperationIndex):
+        operation_index = openapi_data
+    else:
+        operation_index = OperationIndex(openapi_data)
+
+    if hasattr(sources, "items"):
+        sources = sources.items()
+
+    for operation_id, md_content in sources:
+        ref = operation_index.get(operation_id)
+        openapi_metadata = None
+        if ref is not None and spec_name:
+            openapi_metadata = {
+                "reference_file": spec_name,
+                "path": ref.path,
+                "method": ref.method,
+            }
+
+        with run_metrics.time_stage(CONVERT_STAGE, operation_key(operation_id, mode)):
+            mdx_content, link_targets = convert_markdown(
+                md_content, openapi_metadata, mode
+            )
+
+        metadata = {
+            "path": ref.path if ref is not None else None,
+            "method": ref.method if ref is not None else None,
+            "mode": mode,
+            "links": sorted(set(link_targets)),
+        }
+        if known_ids is not None:
+            metadata["unknown_links"] = [
+                target
+                for target in metadata["links"]
+                if reference_target(target) not in known_ids
+            ]
+
+        yield operation_id, mdx_content, metadata
+
+
+def fetch_markdown_content(operation_id, mode=None, fetcher=None):
+    """
+    Fetch markdown content from CoinGecko docs for a given operation ID.
+    Uses different base URLs for demo and pro modes.
+    """
+    return (fetcher or shared_fetcher()).fetch(operation_id, mode)
 
 
 def extract_operation_ids(openapi_data):
     """
     Extract all operation IDs from OpenAPI specification.
     """
-    operation_ids = []
-
-    if "paths" not in openapi_data:
-        justsdk.print_warning("No 'paths' found in the OpenAPI specification")
-        return operation_ids
+    operation_index = OperationIndex(openapi_data)
 
-    for path, path_item in openapi_data["paths"].items():
-        for method in HTTP_METHODS:
-            if method in path_item:
-                operation = path_item[method]
-                if "operationId" in operation:
-                    operation_ids.append(operation["operationId"])
+    if not operation_index.has_paths:
+        console.print_warning("No 'paths' found in the OpenAPI specification")
 
-    return operation_ids
+    return operation_index.operation_ids
 
 
 def process_operation_id(
-    operation_id, output_dir, json_filename=None, openapi_data=None, mode=None
+    operation_id,
+    output_dir,
+    json_filename=None,
+    openapi_data=None,
+    mode=None,
+    fetcher=None,
+    operation_index=None,
+    journal=None,
 ):
     """
     Process a single operation ID: fetch markdown and convert to MDX.
+    The operation is recorded in `journal`, a RunJournal, once it succeeded.
     """
+    if fetcher is None:
+        fetcher = shared_fetcher()
+
     try:
-        md_content = fetch_markdown_content(operation_id, mode)
+        md_content = fetcher.fetch(operation_id, mode)
 
         if md_content is None:
             return False
 
-        # Prepare OpenAPI metadata for frontmatter
-        openapi_metadata = None
-        if json_filename and openapi_data:
-            path, method = find_operation_path_and_method(openapi_data, operation_id)
-            if path and method:
-                openapi_metadata = {
-                    "reference_file": f"{json_filename}.json",
-                    "path": path,
-                    "method": method,
-                }
-
-        mdx_content = convert_md_to_mdx(md_content, openapi_metadata, mode)
-
-        if not mdx_content.strip():
-            justsdk.print_debug(
-                f"No Tips, Notes, or Notice sections found in '{operation_id}.md', skipping..."
+        success = write_operation_mdx(
+            operation_id,
+            md_content,
+            output_dir,
+            json_filename,
+            openapi_data,
+            mode,
+            operation_index=operation_index,
+        )
+        if success and journal is not None:
+            journal.record(operation_id)
+        return success
+
+    except Exception as e:
+        console.print_error(f"Error processing operation '{operation_id}': {e}")
+        return False
+
+
+def prepare_operation_mdx(
+    operation_id,
+    md_content,
+    output_dir,
+    json_filename=None,
+    openapi_data=None,
+    mode=None,
+    manifest=None,
+    operation_index=None,
+    known_ids=None,
+    converter=None,
+):
+    """
+    Convert fetched markdown for a single operation ID to MDX, without
+    writing it. Returns (mdx_file_path, mdx_content), or None when there is
+    nothing to write.
+    With a manifest, operations whose inputs and output are unchanged are
+    skipped, and identical output is never rewritten. With `known_ids`,
+    reference links to any other operationId are reported. `converter`
+    replaces convert_markdown() for the conversion itself.
+    """
+    # Prepare OpenAPI metadata for frontmatter
+    openapi_metadata = None
+    operation = None
+    if json_filename and (operation_index is not None or openapi_data):
+        if operation_index is None:
+            ref = find_operation(openapi_data, operation_id)
+        else:
+            ref = operation_index.get(operation_id)
+
+        if ref is not None:
+            openapi_metadata = {
+                "reference_file": f"{json_filename}.json",
+                "path": ref.path,
+                "method": ref.method,
+            }
+            operation = ref.operation
+
+    if manifest is not None:
+        spec_name = f"{json_filename}.json" if json_filename else None
+        input_hash = manifest.input_hash(md_content, openapi_metadata, operation, mode)
+        previous = manifest.entries.get(operation_id)
+
+        if manifest.is_current(operation_id, input_hash):
+            manifest.record(
+                operation_id,
+                spec_name,
+                input_hash,
+                previous["output_hash"],
+                UNCHANGED,
             )
-            return True  # Not an error, just no content to convert
+            console.print_debug(f"'{operation_id}' is up to date, skipping...")
+            return None
+
+    with run_metrics.time_stage(CONVERT_STAGE, operation_key(operation_id, mode)):
+        mdx_content, link_targets = (converter or convert_markdown)(
+            md_content, openapi_metadata, mode
+        )
+
+    if known_ids is not None:
+        report_unknown_references(operation_id, link_targets, known_ids)
+    mdx_file_path = output_dir / f"{operation_id}.mdx"
+
+    if not mdx_content.strip():
+        if manifest is not None:
+            # No file is written, so only removing an earlier one is a change
+            status = UNCHANGED
+            if mdx_file_path.exists() and previous:
+                mdx_file_path.unlink()
+                console.print_info(f"Removed '{operation_id}.mdx'")
+                status = DELETED
+            manifest.record(operation_id, spec_name, input_hash, None, status)
+
+        console.print_debug(
+            f"No Tips, Notes, or Notice sections found in '{operation_id}.md', skipping..."
+        )
+        return None  # Not an error, just no content to convert
+
+    if manifest is not None:
+        output_hash = hash_bytes(mdx_content)
 
-        mdx_file_path = output_dir / f"{operation_id}.mdx"
-        justsdk.write_file(mdx_content, mdx_file_path, atomic=True)
-        justsdk.print_success(f"Created '{operation_id}.mdx'")
+        if not mdx_file_path.exists():
+            status = ADDED
+        elif hash_bytes(mdx_file_path.read_bytes()) == output_hash:
+            status = UNCHANGED
+        else:
+            status = CHANGED
+
+        manifest.record(operation_id, spec_name, input_hash, output_hash, status)
+
+        if status == UNCHANGED:
+            console.print_debug(f"'{operation_id}.mdx' is unchanged, skipping...")
+            return None
+
+    return mdx_file_path, mdx_content
+
+
+def write_mdx_file(operation_id, mdx_file_path, mdx_content, mode=None, sink=None):
+    """
+    Atomically write the MDX of a single operation ID, through an
+    OutputSink when one is given.
+    """
+    with run_metrics.time_stage(WRITE_STAGE, operation_key(operation_id, mode)):
+        if sink is None:
+            justsdk.write_file(mdx_content, mdx_file_path, atomic=True)
+        elif not sink.write(mdx_file_path, mdx_content):
+            console.print_debug(f"'{operation_id}.mdx' is unchanged, skipping...")
+            return
+    run_metrics.increment("files_written")
+    console.print_success(f"Created '{operation_id}.mdx'")
+
+
+def write_operation_mdx(
+    operation_id,
+    md_content,
+    output_dir,
+    json_filename=None,
+    openapi_data=None,
+    mode=None,
+    manifest=None,
+    operation_index=None,
+    known_ids=None,
+):
+    """
+    Convert fetched markdown for a single operation ID and write it as MDX.
+    See prepare_operation_mdx() for how a manifest and `known_ids` are used.
+    """
+    try:
+        job = prepare_operation_mdx(
+            operation_id,
+            md_content,
+            output_dir,
+            json_filename,
+            openapi_data,
+            mode,
+            manifest,
+            operation_index,
+            known_ids,
+        )
+        if job is not None:
+            write_mdx_file(operation_id, *job, mode)
         return True
 
     except Exception as e:
-        justsdk.print_error(f"Error processing operation '{operation_id}': {e}")
+        console.print_error(f"Error processing operation '{operation_id}': {e}")
         return False
 
 
-def process_file(json_file, output_dir=None, mode=None):
+SpecTarget = namedtuple(
+    "SpecTarget", ["output", "json_file", "mode", "operation_index", "known_ids"]
+)
+
+
+class OutputRun:
+    """
+    An output directory written by a convert-mdx run: the OutputSink its
+    MDX goes through, its OutputManifest in incremental mode and the
+    RunJournal of every spec written to it.
+    """
+
+    def __init__(self, output_dir, pipeline=None, incremental=False, sink=None):
+        self.output_dir = Path(output_dir)
+        self.pipeline = pipeline or PipelineSettings()
+        self.manifest = OutputManifest.load(self.output_dir) if incremental else None
+        # A sink given by the caller is committed by the caller
+        self.own_sink = sink is None
+        if sink is None:
+            sink = OutputSink(self.output_dir, self.pipeline.swap_output)
+        self.sink = sink
+        self.journals = {}
+
+    def open_journal(self, json_file):
+        """
+        Journal the operations of a spec written to this directory. Staged
+        files are lost with an interrupted run, so swapped output is neither
+        journaled nor resumed.
+        Raises ValueError if swapped output would replace the spec's own
+        directory.
+        """
+        if self.pipeline.swap_output and contains_path(self.output_dir, json_file):
+            raise ValueError(
+                f"Cannot swap '{self.output_dir}', which holds the spec "
+                f"'{json_file.name}'"
+            )
+        if not self.pipeline.swap_output:
+            self.journals[json_file] = RunJournal.open(
+                self.output_dir, json_file, self.pipeline.resume
+            )
+
+    def is_done(self, json_file, operation_id):
+        journal = self.journals.get(json_file)
+        return journal is not None and journal.is_done(operation_id)
+
+    def record(self, json_file, operation_id):
+        journal = self.journals.get(json_file)
+        if journal is not None:
+            journal.record(operation_id)
+
+    def commit(self, outcomes):
+        """
+        Commit the written files and the manifest, then remove the journals
+        of the specs whose operations all succeeded in `outcomes`, as
+        returned by run_operations().
+        """
+        if self.own_sink:
+            self.sink.commit()
+        if self.manifest is not None:
+            self.manifest.save()
+
+        for json_file, journal in self.journals.items():
+            journal.close(
+                finished=all(
+                    success
+                    for (target_file, _), success in outcomes.items()
+                    if target_file == json_file
+                )
+            )
+
+    def close(self):
+        """
+        Drop uncommitted staged files and close the journals.
+        """
+        if self.own_sink:
+            self.sink.discard()
+        for journal in self.journals.values():
+            journal.close()
+
+
+def run_operations(plan, fetcher, pipeline=None, converter=None):
+    """
+    Fetch, convert and write planned operations through the pipeline.
+    `plan` maps each operationId to the SpecTargets it is written for. Its
+    page is fetched once per distinct MarkdownFetcher.page_key() of those
+    targets, and converted with `converter` (see prepare_operation_mdx()).
+    Operations completed by an interrupted run are skipped when their
+    target's journal was opened to resume.
+
+    Returns {(json_file, operation_id): success} for every planned target.
+    """
+    outcomes = {}
+    pending = {}
+    for operation_id, targets in plan.items():
+        for target in targets:
+            done = target.output.is_done(target.json_file, operation_id)
+            outcomes[(target.json_file, operation_id)] = done
+            if not done:
+                pending.setdefault(operation_id, []).append(target)
+
+    resumed_count = sum(outcomes.values())
+    if resumed_count:
+        console.print_info(
+            f"Resuming: {resumed_count} operation(s) completed by the previous run"
+        )
+
+    def complete(target, operation_id):
+        outcomes[(target.json_file, operation_id)] = True
+        target.output.record(target.json_file, operation_id)
+
+    def fetch(operation_id):
+        pages = {}
+        fetched = {}
+        for target in pending[operation_id]:
+            key = fetcher.page_key(operation_id, target.mode)
+            if key not in fetched:
+                # A page that cannot be fetched fails its own targets only
+                try:
+                    fetched[key] = fetcher.fetch(operation_id, target.mode)
+                except Exception as e:
+                    console.print_error(
+                        f"Error processing operation '{operation_id}'{mode_label(target.mode)}: {e}"
+                    )
+                    fetched[key] = None
+            pages[target.json_file] = fetched[key]
+
+        if all(md_content is None for md_content in pages.values()):
+            return None
+        return pages
+
+    def convert(operation_id, pages):
+        jobs = []
+        for target in pending[operation_id]:
+            md_content = pages[target.json_file]
+            if md_content is None:
+                continue
+
+            try:
+                job = prepare_operation_mdx(
+                    operation_id,
+                    md_content,
+                    target.output.output_dir,
+                    target.json_file.stem,
+                    None,
+                    target.mode,
+                    target.output.manifest,
+                    target.operation_index,
+                    target.known_ids,
+                    converter,
+                )
+            except Exception as e:
+                console.print_error(
+                    f"Error processing operation '{operation_id}'{mode_label(target.mode)}: {e}"
+                )
+                continue
+
+            if job is None:
+                complete(target, operation_id)
+            else:
+                jobs.append((target, *job))
+
+        return True, jobs or None
+
+    def write(batch):
+        for operation_id, jobs in batch:
+            for target, mdx_file_path, mdx_content in jobs:
+                try:
+                    write_mdx_file(
+                        operation_id,
+                        mdx_file_path,
+                        mdx_content,
+                        target.mode,
+                        target.output.sink,
+                    )
+                    complete(target, operation_id)
+                except Exception as e:
+                    console.print_error(
+                        f"Error processing operation '{operation_id}'{mode_label(target.mode)}: {e}"
+                    )
+        return [True] * len(batch)
+
+    # Fetching, converting and writing overlap, with bounded queues
+    # between them
+    run_pipeline(pending, fetch, convert, write, fetcher.jobs, pipeline)
+    return outcomes
+
+
+def mode_label(mode):
+    return f" ({mode})" if mode else ""
+
+
+def process_file(
+    json_file,
+    output_dir=None,
+    mode=None,
+    fetcher=None,
+    incremental=False,
+    pipeline=None,
+    sink=None,
+):
     """
     Process a single OpenAPI JSON file to generate MDX files.
+    In incremental mode, unchanged operations are skipped and MDX files of
+    operations removed from the spec are deleted. `pipeline` holds the
+    PipelineSettings of the fetch, convert and write stages. Files are
+    written through `sink`, or through an OutputSink of this file alone.
+    Completed operations are journaled as they are written, and with
+    `pipeline.resume`, those completed by an interrupted run are skipped.
     """
+    own_fetcher = fetcher is None
+    if own_fetcher:
+        fetcher = MarkdownFetcher()
+    output = None
+
     try:
-        justsdk.print_info(f"Processing '{json_file.name}'...")
+        console.print_info(f"Processing '{json_file.name}'...")
 
-        openapi_data = justsdk.read_file(json_file, use_orjson=True)
-        operation_ids = extract_operation_ids(openapi_data)
+        # Only paths, methods and operationIds are needed, plus the operation
+        # objects themselves when their hashes decide what to regenerate
+        with run_metrics.time_stage(PARSE_STAGE):
+            operation_index = OperationIndex.load(
+                json_file, with_operations=incremental
+            )
+        operation_ids = operation_index.operation_ids
 
-        if not operation_ids:
-            justsdk.print_warning(f"No operation IDs found in '{json_file.name}'")
-            return True
+        if not operation_index.has_paths:
+            console.print_warning("No 'paths' found in the OpenAPI specification")
+        operation_index.report_duplicates(json_file.name)
 
         if output_dir is None:
             output_dir = json_file.parent
 
+        output = OutputRun(output_dir, pipeline, incremental, sink)
+        manifest = output.manifest
+
+        if manifest is not None and manifest.prune(json_file.name, operation_ids):
+            manifest.save()
+
+        if not operation_ids:
+            console.print_warning(f"No operation IDs found in '{json_file.name}'")
+            return True
+
         output_dir.mkdir(parents=True, exist_ok=True)
-        justsdk.print_info(f"Found {len(operation_ids)} operation IDs to process")
+        console.print_info(f"Found {len(operation_ids)} operation IDs to process")
+
+        output.open_journal(json_file)
+        # Links may point to operations in any spec of the same mode
+        target = SpecTarget(
+            output,
+            json_file,
+            mode,
+            operation_index,
+            known_operation_ids(json_file.parent),
+        )
+        outcomes = run_operations(
+            {operation_id: [target] for operation_id in operation_ids},
+            fetcher,
+            pipeline,
+        )
+        output.commit(outcomes)
 
-        success_count = 0
-        json_filename = json_file.stem
+        success_count = sum(
+            outcomes[(json_file, operation_id)] for operation_id in operation_ids
+        )
 
-        for operation_id in operation_ids:
-            if process_operation_id(
-                operation_id, output_dir, json_filename, openapi_data, mode
-            ):
-                success_count += 1
+        if manifest is not None:
+            console.print_info(
+                f"Operations in '{json_file.name}': {manifest.summary()}"
+            )
 
-        justsdk.print_info(
+        console.print_info(
             f"Successfully processed {success_count}/{len(operation_ids)} operations from '{json_file.name}'"
         )
         return success_count == len(operation_ids)
 
     except Exception as e:
-        justsdk.print_error(f"Error processing '{json_file.name}': {e}")
+        console.print_error(f"Error processing '{json_file.name}': {e}")
         return False
-
-
-def process_mode_files(mode, reference_dir=None, output_dir=None):
+    finally:
+        if output is not None:
+            output.close()
+        if own_fetcher:
+            fetcher.close()
+
+
+def process_mode_files(
+    mode,
+    reference_dir=None,
+    output_dir=None,
+    fetcher=None,
+    incremental=False,
+    pipeline=None,
+):
     """
     Process OpenAPI JSON files for a specific mode (pro or demo).
     """
     if mode not in VALID_MODES:
-        justsdk.print_error(
+        console.print_error(
             f"Error: Invalid mode '{mode}'. Valid modes are: {', '.join(VALID_MODES)}"
         )
         return False
@@ -369,50 +784,84 @@ def process_mode_files(mode, reference_dir=None, output_dir=None):
     mode_output_dir = output_dir / mode
 
     if not mode_reference_dir.exists():
-        justsdk.print_error(
+        console.print_error(
             f"Error: Mode directory '{mode_reference_dir}' does not exist."
         )
         return False
 
     mode_output_dir.mkdir(parents=True, exist_ok=True)
 
-    json_files = list(mode_reference_dir.glob("*.json"))
+    json_files = sorted(mode_reference_dir.glob("*.json"))
 
     if not json_files:
-        justsdk.print_warning(f"No JSON files found in the {mode} directory.")
+        console.print_warning(f"No JSON files found in the {mode} directory.")
         return True
 
-    justsdk.print_info(f"Processing {mode} mode with {len(json_files)} JSON file(s):")
+    console.print_info(f"Processing {mode} mode with {len(json_files)} JSON file(s):")
     for file in json_files:
         print(f"  - {file.name}")
 
     success_count = 0
+    # Every spec of a mode writes to the same directory, which is committed
+    # once at the end
+    swap_output = pipeline.swap_output if pipeline is not None else False
+    sink = OutputSink(mode_output_dir, swap_output)
+    # The specs share one fetcher, and so its connections
+    own_fetcher = fetcher is None
+    if own_fetcher:
+        fetcher = MarkdownFetcher()
 
-    for json_file in json_files:
-        if process_file(json_file, mode_output_dir, mode):
-            success_count += 1
+    try:
+        for json_file in json_files:
+            if process_file(
+                json_file, mode_output_dir, mode, fetcher, incremental, pipeline, sink
+            ):
+                success_count += 1
+        sink.commit()
+    except Exception as e:
+        console.print_error(f"Error writing '{mode_output_dir}': {e}")
+        return False
+    finally:
+        sink.discard()
+        if own_fetcher:
+            fetcher.close()
 
-    justsdk.print_info(
+    console.print_info(
         f"\nCompleted processing {success_count}/{len(json_files)} {mode} files successfully!"
     )
     return success_count == len(json_files)
 
 
-def process_demo_files(reference_dir=None, output_dir=None):
+def process_demo_files(
+    reference_dir=None, output_dir=None, fetcher=None, incremental=False, pipeline=None
+):
     """
     Process demo OpenAPI JSON files to generate MDX files.
     """
-    return process_mode_files(DEMO_MODE, reference_dir, output_dir)
+    return process_mode_files(
+        DEMO_MODE, reference_dir, output_dir, fetcher, incremental, pipeline
+    )
 
 
-def process_pro_files(reference_dir=None, output_dir=None):
+def process_pro_files(
+    reference_dir=None, output_dir=None, fetcher=None, incremental=False, pipeline=None
+):
     """
     Process pro OpenAPI JSON files to generate MDX files.
     """
-    return process_mode_files(PRO_MODE, reference_dir, output_dir)
+    return process_mode_files(
+        PRO_MODE, reference_dir, output_dir, fetcher, incremental, pipeline
+    )
 
 
-def process_reference_files(reference_dir=None, output_dir=None, mode=None):
+def process_reference_files(
+    reference_dir=None,
+    output_dir=None,
+    mode=None,
+    fetcher=None,
+    incremental=False,
+    pipeline=None,
+):
     """
     Process all OpenAPI JSON files in the reference folder to generate MDX files.
     """
@@ -427,7 +876,7 @@ def process_reference_files(reference_dir=None, output_dir=None, mode=None):
         output_dir = Path(output_dir)
 
     if not reference_dir.exists():
-        justsdk.print_error(
+        console.print_error(
             f"Error: Reference directory '{reference_dir}' does not exist."
         )
         return False
@@ -435,20 +884,30 @@ def process_reference_files(reference_dir=None, output_dir=None, mode=None):
     json_files = list(reference_dir.glob("*.json"))
 
     if not json_files:
-        justsdk.print_warning("No JSON files found in the reference directory.")
+        console.print_warning("No JSON files found in the reference directory.")
         return True
 
-    justsdk.print_info(f"Found {len(json_files)} JSON file(s) to process:")
+    console.print_info(f"Found {len(json_files)} JSON file(s) to process:")
     for file in json_files:
         print(f"  - {file.name}")
 
     success_count = 0
+    # The specs share one fetcher, and so its connections
+    own_fetcher = fetcher is None
+    if own_fetcher:
+        fetcher = MarkdownFetcher()
 
-    for json_file in json_files:
-        if process_file(json_file, output_dir, mode):
-            success_count += 1
+    try:
+        for json_file in json_files:
+            if process_file(
+                json_file, output_dir, mode, fetcher, incremental, pipeline
+            ):
+                success_count += 1
+    finally:
+        if own_fetcher:
+            fetcher.close()
 
-    justsdk.print_info(
+    console.print_info(
         f"\nCompleted processing {success_count}/{len(json_files)} files successfully!"
     )
     return success_count == len(json_files)
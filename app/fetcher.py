@@ -0,0 +1,196 @@
+import threading
+import requests
+
+from . import console
+from .http_client import ReadMeClient
+from .markdown_cache import MarkdownCache
+from .metrics import run_metrics, operation_key, FETCH_STAGE
+from ._constants import (
+    COINGECKO_DOCS_BASE_URL,
+    COINGECKO_DEMO_DOCS_BASE_URL,
+    DEMO_MODE,
+    DEFAULT_JOBS,
+    DEFAULT_MAX_RETRIES,
+)
+
+
+def get_base_url(mode=None):
+    """
+    Get the CoinGecko docs base URL for the given API mode.
+    """
+    if mode == DEMO_MODE:
+        return COINGECKO_DEMO_DOCS_BASE_URL
+    return COINGECKO_DOCS_BASE_URL
+
+
+class MarkdownFetcher:
+    """
+    Fetch ReadMe markdown pages. `jobs` is the number of requests the fetch
+    stage of the convert-mdx pipeline runs at once.
+    """
+
+    def __init__(
+        self, jobs=DEFAULT_JOBS, base_url=None, client=None, cache=None, offline=False
+    ):
+        self.jobs = max(1, int(jobs))
+        # Overrides the per-mode docs URL, e.g. to point at a local HTTP server
+        self.base_url = base_url
+        # One pooled session is shared by every fetch, across files and modes
+        self.client = client or self.create_client()
+        # Pages are revalidated against the cache, or served only from it offline
+        self.cache = cache
+        self.offline = offline
+
+    def create_client(self):
+        return ReadMeClient(pool_size=self.jobs)
+
+    def get_base_url(self, mode=None):
+        return self.base_url or get_base_url(mode)
+
+    def page_key(self, operation_id, mode=None):
+        """
+        Identify the page fetch() returns for an operation ID and mode, so a
+        page shared by several modes can be fetched once.
+        """
+        # Offline pages come from the cache, which is kept per mode
+        if self.offline:
+            return mode, operation_id
+        return f"{self.get_base_url(mode)}/{operation_id}.md"
+
+    def fetch(self, operation_id, mode=None):
+        """
+        Fetch markdown content for a single operation ID.
+        Returns the page text, or None if the request failed.
+        """
+        with run_metrics.time_stage(FETCH_STAGE, operation_key(operation_id, mode)):
+            content = self._fetch(operation_id, mode)
+
+        if content is None:
+            run_metrics.increment("fetch_failures")
+        return content
+
+    def _fetch(self, operation_id, mode=None):
+        base_url = self.get_base_url(mode)
+        url = f"{base_url}/{operation_id}.md"
+        cached = self.cache.load(operation_id, mode) if self.cache else None
+
+        if self.offline:
+            if cached is None:
+                console.print_error(
+                    f"No cached markdown for '{operation_id}' available offline"
+                )
+                return None
+
+            console.print_success(f"Loaded cached markdown for '{operation_id}'")
+            run_metrics.increment("cache_hits")
+            return cached["body"]
+
+        try:
+            response = self.client.get(
+                url, headers=self.cache.conditional_headers(cached) if cached else None
+            )
+
+            if response.status_code == 304 and cached is not None:
+                console.print_success(
+                    f"Markdown for '{operation_id}' unchanged since last fetch"
+                )
+                run_metrics.increment("cache_hits")
+                return cached["body"]
+
+            response.raise_for_status()
+            run_metrics.increment("bytes_downloaded", len(response.content))
+
+            if self.cache:
+                try:
+                    self.cache.store(
+                        operation_id,
+                        response.text,
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"),
+                        mode,
+                    )
+                except OSError as e:
+                    # The page itself was fetched; only the next run pays
+                    console.print_warning(f"Cannot cache '{operation_id}.md': {e}")
+
+            console.print_success(
+                f"Fetched markdown content for '{operation_id}' from {base_url}"
+            )
+            return response.text
+
+        except requests.exceptions.RequestException as e:
+            console.print_error(
+                f"Failed to fetch '{operation_id}.md' from {base_url}: {e}"
+            )
+            return None
+
+    def close(self):
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Fetcher of the calls that are not given one, created on first use
+_shared_fetcher = None
+_shared_fetcher_lock = threading.Lock()
+
+
+def shared_fetcher():
+    """
+    Get the fetcher used when no fetcher is passed, so those calls share one
+    pooled session instead of opening their own.
+    """
+    global _shared_fetcher
+
+    with _shared_fetcher_lock:
+        if _shared_fetcher is None:
+            _shared_fetcher = MarkdownFetcher()
+        return _shared_fetcher
+
+
+def create_fetcher(
+    jobs=DEFAULT_JOBS,
+    pool_size=None,
+    max_retries=DEFAULT_MAX_RETRIES,
+    budget=None,
+    cache_dir=None,
+    offline=False,
+    base_url=None,
+    source=None,
+    rate_limits=None,
+    budget_spent=None,
+):
+    """
+    Build a MarkdownFetcher with its HTTP client and optional cache from plain
+    options, so the same setup can be recreated inside worker processes.
+    With a `source` bundle, pages are read locally and no client is created.
+    `rate_limits` maps hosts (None for any host) to their HostLimit, and
+    `budget_spent` shares the request budget between processes (see
+    ReadMeClient).
+    """
+    if source:
+        from .markdown_bundle import BundleFetcher
+
+        return BundleFetcher(source, jobs=jobs)
+
+    limiter = None
+    if rate_limits:
+        from .rate_limiter import RateLimiter
+
+        limiter = RateLimiter(rate_limits)
+
+    client = ReadMeClient(
+        pool_size=pool_size or jobs,
+        max_retries=max_retries,
+        budget=budget,
+        limiter=limiter,
+        budget_spent=budget_spent,
+    )
+    cache = MarkdownCache(cache_dir) if cache_dir else None
+    return MarkdownFetcher(
+        jobs=jobs, base_url=base_url, client=client, cache=cache, offline=offline
+    )
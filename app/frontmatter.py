@@ -0,0 +1,140 @@
+import mmap
+import re
+import justsdk
+
+from pathlib import Path
+from .spec_scanner import scan_operations
+from ._constants import (
+    DEFAULT_REFERENCE_DIR,
+    DEFAULT_MDX_DIR,
+    MDX_EXTENSION,
+    VALID_MODES,
+)
+
+FRONTMATTER_PATTERN = re.compile(r"\A---\nopenapi: ([^\n]*)\n---\n\n")
+
+
+def render_openapi_line(reference_file, method, path):
+    """
+    Render the value of the `openapi:` frontmatter field.
+    """
+    return f"api-reference/{reference_file} {method} {path}"
+
+
+def render_frontmatter(openapi_line):
+    return f"---\nopenapi: {openapi_line}\n---\n\n"
+
+
+def collect_openapi_lines(mode_reference_dir):
+    """
+    Scan the specs of one mode in a single pass and map each operationId to
+    the `openapi:` line of every spec that defines it, in file name order.
+    """
+    openapi_lines = {}
+
+    for json_file in sorted(Path(mode_reference_dir).glob("*.json")):
+        reference_file = json_file.name
+        seen = set()
+
+        with (
+            open(json_file, "rb") as source,
+            mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as buffer,
+        ):
+            for span in scan_operations(buffer):
+                # The first definition in a spec wins, as in OperationIndex
+                if span.operation_id is None or span.operation_id in seen:
+                    continue
+                seen.add(span.operation_id)
+                openapi_lines.setdefault(span.operation_id, []).append(
+                    render_openapi_line(reference_file, span.method, span.path)
+                )
+
+    return openapi_lines
+
+
+def choose_openapi_line(current_line, candidates):
+    """
+    Keep pointing at the spec the MDX already references when it still
+    defines the operation, otherwise use the first spec that does.
+    """
+    if current_line is not None:
+        current_file = current_line.split(" ", 1)[0]
+        for candidate in candidates:
+            if candidate.split(" ", 1)[0] == current_file:
+                return candidate
+
+    return candidates[0]
+
+
+def refresh_mode_frontmatter(mode, reference_dir=None, output_dir=None):
+    """
+    Rewrite the `openapi:` frontmatter of the MDX files of one mode to match
+    the current specs, without fetching or converting any markdown.
+    """
+    reference_dir = Path(reference_dir or DEFAULT_REFERENCE_DIR)
+    output_dir = Path(output_dir or DEFAULT_MDX_DIR)
+
+    mode_reference_dir = reference_dir / mode
+    mode_output_dir = output_dir / mode
+
+    if not mode_reference_dir.exists():
+        justsdk.print_error(
+            f"Error: Mode directory '{mode_reference_dir}' does not exist."
+        )
+        return False
+
+    mdx_files = sorted(mode_output_dir.glob(f"*{MDX_EXTENSION}"))
+
+    if not mdx_files:
+        justsdk.print_warning(f"No MDX files found in '{mode_output_dir}'.")
+        return True
+
+    try:
+        openapi_lines = collect_openapi_lines(mode_reference_dir)
+    except (OSError, ValueError) as e:
+        justsdk.print_error(f"Error reading the {mode} specs: {e}")
+        return False
+
+    updates = []
+    unknown = []
+
+    for mdx_file in mdx_files:
+        operation_id = mdx_file.stem
+        candidates = openapi_lines.get(operation_id)
+
+        if not candidates:
+            unknown.append(operation_id)
+            continue
+
+        content = mdx_file.read_text(encoding="utf-8")
+        match = FRONTMATTER_PATTERN.match(content)
+        current_line = match.group(1) if match else None
+        openapi_line = choose_openapi_line(current_line, candidates)
+
+        if openapi_line != current_line:
+            body = content[match.end() :] if match else content
+            updates.append((mdx_file, render_frontmatter(openapi_line) + body))
+
+    for mdx_file, content in updates:
+        justsdk.write_file(content, mdx_file, atomic=True)
+        justsdk.print_success(f"Updated frontmatter of '{mdx_file.name}'")
+
+    if unknown:
+        justsdk.print_warning(
+            f"{len(unknown)} {mode} MDX file(s) have no operation in the specs: "
+            + ", ".join(unknown)
+        )
+
+    justsdk.print_info(f"Refreshed {len(updates)}/{len(mdx_files)} {mode} MDX file(s)")
+    return True
+
+
+def refresh_frontmatter(reference_dir=None, output_dir=None, modes=None):
+    """
+    Refresh the frontmatter of the MDX files of every given mode.
+    """
+    results = [
+        refresh_mode_frontmatter(mode, reference_dir, output_dir)
+        for mode in modes or VALID_MODES
+    ]
+    return all(results)
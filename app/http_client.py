@@ -0,0 +1,178 @@
+import random
+import threading
+import time
+import requests
+
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from . import console
+from .metrics import run_metrics
+from ._constants import (
+    REQUEST_TIMEOUT,
+    DEFAULT_JOBS,
+    DEFAULT_MAX_RETRIES,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    RETRY_STATUS_CODES,
+)
+
+
+class RequestBudgetExceeded(requests.exceptions.RequestException):
+    """
+    Raised when a run has used up its request budget.
+    """
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header given either as seconds or as an HTTP date.
+    Returns the delay in seconds, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class ReadMeClient:
+    """
+    Shared HTTP session for ReadMe fetches with connection pooling,
+    retries on transient errors, an optional per-run request budget and
+    optional per-host rate limiting.
+
+    The budget counts this client's requests, or with `budget_spent`, a
+    multiprocessing.Value counting the requests of every process that
+    shares the budget.
+    """
+
+    def __init__(
+        self,
+        pool_size=DEFAULT_JOBS,
+        max_retries=DEFAULT_MAX_RETRIES,
+        budget=None,
+        backoff_base=RETRY_BACKOFF_BASE,
+        backoff_max=RETRY_BACKOFF_MAX,
+        limiter=None,
+        budget_spent=None,
+    ):
+        self.max_retries = max(0, int(max_retries))
+        self.budget = budget
+        self.budget_spent = budget_spent
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        # Optional RateLimiter pacing requests per host
+        self.limiter = limiter
+
+        self.requests_made = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+        # pool_block keeps the number of open connections at pool_size
+        # instead of opening throwaway ones when every thread is busy
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _spend_request(self, url):
+        with self._lock:
+            if self.budget is not None:
+                if self.budget_spent is None:
+                    spent = self.requests_made
+                else:
+                    with self.budget_spent.get_lock():
+                        spent = self.budget_spent.value
+                        if spent < self.budget:
+                            self.budget_spent.value += 1
+
+                if spent >= self.budget:
+                    raise RequestBudgetExceeded(
+                        f"Request budget of {self.budget} exhausted before fetching {url}"
+                    )
+            self.requests_made += 1
+        run_metrics.increment("http_requests")
+
+    def backoff_delay(self, attempt, retry_after=None):
+        """
+        Get the delay before the given retry attempt: the server's Retry-After
+        when present, otherwise exponential backoff with full jitter.
+        """
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+
+        ceiling = min(self.backoff_max, self.backoff_base * (2**attempt))
+        return random.uniform(0, ceiling)
+
+    def _send(self, url, headers=None):
+        if self.limiter is None:
+            return self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+
+        with self.limiter.slot(url) as (bucket, generation):
+            response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+
+            if bucket is not None:
+                bucket.observe(
+                    response.status_code,
+                    response.headers,
+                    parse_retry_after(response.headers.get("Retry-After")),
+                    generation,
+                )
+            return response
+
+    def get(self, url, headers=None):
+        """
+        GET a URL, retrying connection errors, timeouts and 429/5xx responses.
+        Returns the final response; raises once retries or the budget run out.
+        """
+        attempt = 0
+
+        while True:
+            self._spend_request(url)
+
+            try:
+                response = self._send(url, headers)
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+            ) as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                reason = type(e).__name__
+            else:
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or attempt >= self.max_retries
+                ):
+                    return response
+                delay = self.backoff_delay(
+                    attempt, parse_retry_after(response.headers.get("Retry-After"))
+                )
+                reason = f"HTTP {response.status_code}"
+                response.close()
+
+            with self._lock:
+                self.retries += 1
+            run_metrics.increment("retries")
+
+            console.print_warning(
+                f"{reason} for {url}, retrying in {delay:.1f}s "
+                f"(attempt {attempt + 1}/{self.max_retries})"
+            )
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,112 @@
+import threading
+import orjson
+import justsdk
+
+from pathlib import Path
+from .manifest import hash_file
+from ._constants import CONVERTER_VERSION, JOURNAL_SUFFIX
+
+
+class RunJournal:
+    """
+    Append-only log of the operations of a spec whose MDX has been written,
+    so an interrupted run can be resumed where it stopped.
+
+    The first line identifies the spec content and converter version the
+    operations were converted with; entries from any other spec or version
+    are never resumed. The journal is removed once every operation of the
+    spec has completed.
+    """
+
+    def __init__(self, output_dir, json_file):
+        json_file = Path(json_file)
+        self.path = Path(output_dir) / f".{json_file.stem}{JOURNAL_SUFFIX}"
+        self.header = {
+            "spec": json_file.name,
+            "spec_hash": hash_file(json_file),
+            "converter_version": CONVERTER_VERSION,
+        }
+        self.completed = set()
+        self._file = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, output_dir, json_file, resume=False):
+        """
+        Open the journal of a spec. With `resume`, operations completed by
+        the previous run of the same spec and converter are kept; otherwise
+        the run starts from scratch.
+        """
+        journal = cls(output_dir, json_file)
+        completed = journal._read() if resume else None
+
+        if completed is None:
+            journal.path.unlink(missing_ok=True)
+        else:
+            journal.completed = completed
+        return journal
+
+    def _read(self):
+        """
+        Read the completed operations, or None when the journal belongs to
+        another spec content or converter version.
+        """
+        try:
+            lines = self.path.read_bytes().splitlines()
+        except FileNotFoundError:
+            return set()
+
+        try:
+            if not lines or orjson.loads(lines[0]) != self.header:
+                return None
+        except orjson.JSONDecodeError:
+            return None
+
+        completed = set()
+        for line in lines[1:]:
+            try:
+                completed.add(orjson.loads(line)["operation_id"])
+            except (orjson.JSONDecodeError, KeyError, TypeError):
+                # The last line may be cut short by the run that was stopped
+                continue
+
+        return completed
+
+    def is_done(self, operation_id):
+        return operation_id in self.completed
+
+    def record(self, operation_id):
+        """
+        Append a completed operation. Each entry is flushed right away, so it
+        survives the process being killed.
+        """
+        with self._lock:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a+b")
+                if self._file.tell() == 0:
+                    self._file.write(orjson.dumps(self.header) + b"\n")
+                else:
+                    # Start on a new line after an entry that was cut short
+                    self._file.seek(-1, 2)
+                    if self._file.read(1) != b"\n":
+                        self._file.write(b"\n")
+
+            self._file.write(orjson.dumps({"operation_id": operation_id}) + b"\n")
+            self._file.flush()
+            self.completed.add(operation_id)
+
+    def close(self, finished=False):
+        """
+        Close the journal, removing it when the run `finished` every
+        operation.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+        if finished:
+            self.path.unlink(missing_ok=True)
+            if self.completed:
+                justsdk.print_debug(f"Removed journal '{self.path.name}'")
@@ -0,0 +1,187 @@
+import hashlib
+import os
+import threading
+import orjson
+import justsdk
+
+from contextlib import contextmanager
+from pathlib import Path
+from ._constants import CONVERTER_VERSION, MANIFEST_FILENAME, MDX_EXTENSION
+
+try:
+    import fcntl
+except ImportError:  # Windows has no fcntl; manifests are then saved unlocked
+    fcntl = None
+
+ADDED = "added"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+DELETED = "deleted"
+
+
+def hash_bytes(data):
+    """
+    Hash text or bytes with SHA-256.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path):
+    """
+    Hash a file's content with SHA-256.
+    """
+    with open(path, "rb") as source:
+        return hashlib.file_digest(source, "sha256").hexdigest()
+
+
+class OutputManifest:
+    """
+    Record of the inputs and outputs behind every generated MDX file in an
+    output directory, used to skip operations whose inputs have not changed.
+    """
+
+    def __init__(self, output_dir, entries=None):
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / MANIFEST_FILENAME
+        self.entries = entries or {}
+        # Operations recorded or pruned by this run, merged into the file on save
+        self.recorded = set()
+        self.pruned = set()
+        self.counts = {ADDED: 0, CHANGED: 0, UNCHANGED: 0, DELETED: 0}
+        # Operations are recorded from several pipeline workers at once
+        self._record_lock = threading.Lock()
+
+    @staticmethod
+    def _read_entries(path):
+        try:
+            data = justsdk.read_file(path) if path.exists() else {}
+        except (OSError, ValueError):
+            justsdk.print_warning(f"Ignoring unreadable manifest '{path}'")
+            data = {}
+
+        return data.get("operations", {})
+
+    @classmethod
+    def load(cls, output_dir):
+        """
+        Load the manifest of an output directory, or start an empty one.
+        """
+        return cls(output_dir, cls._read_entries(Path(output_dir) / MANIFEST_FILENAME))
+
+    @contextmanager
+    def _locked(self):
+        if fcntl is None:
+            yield
+            return
+
+        # Lock the directory itself, since the manifest file is replaced on save
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        dir_fd = os.open(self.output_dir, os.O_RDONLY)
+        try:
+            fcntl.flock(dir_fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(dir_fd)
+
+    def save(self):
+        """
+        Merge this run's changes into the manifest on disk. Several spec files
+        can share an output directory and be processed at the same time, so
+        entries written by others since loading are kept.
+        """
+        with self._locked():
+            entries = self._read_entries(self.path)
+
+            for operation_id in self.pruned:
+                entries.pop(operation_id, None)
+            for operation_id in self.recorded:
+                entries[operation_id] = self.entries[operation_id]
+
+            justsdk.write_file(
+                {"converter_version": CONVERTER_VERSION, "operations": entries},
+                self.path,
+                sort_keys=True,
+                atomic=True,
+            )
+
+        self.entries = entries
+
+    @staticmethod
+    def input_hash(md_content, openapi_metadata=None, operation=None, mode=None):
+        """
+        Hash everything that feeds an operation's MDX: the source markdown,
+        its slice of the OpenAPI spec, the mode and the converter version.
+        """
+        spec_slice = orjson.dumps(
+            {"metadata": openapi_metadata, "operation": operation},
+            option=orjson.OPT_SORT_KEYS,
+        )
+        digest = hashlib.sha256()
+        for part in (CONVERTER_VERSION, mode or "", md_content):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(spec_slice)
+        return digest.hexdigest()
+
+    def mdx_path(self, operation_id):
+        return self.output_dir / f"{operation_id}{MDX_EXTENSION}"
+
+    def is_current(self, operation_id, input_hash):
+        """
+        Check whether an operation was generated from the same inputs and its
+        output is still what was written last time.
+        """
+        entry = self.entries.get(operation_id)
+
+        if entry is None or entry.get("input_hash") != input_hash:
+            return False
+
+        mdx_path = self.mdx_path(operation_id)
+
+        if entry.get("output_hash") is None:
+            return not mdx_path.exists()
+
+        try:
+            return hash_bytes(mdx_path.read_bytes()) == entry["output_hash"]
+        except OSError:
+            return False
+
+    def record(self, operation_id, spec_name, input_hash, output_hash, status):
+        with self._record_lock:
+            self.entries[operation_id] = {
+                "spec": spec_name,
+                "input_hash": input_hash,
+                "output_hash": output_hash,
+            }
+            self.recorded.add(operation_id)
+            self.pruned.discard(operation_id)
+            self.counts[status] += 1
+
+    def prune(self, spec_name, operation_ids):
+        """
+        Delete MDX files of operations that were generated from `spec_name`
+        but are no longer part of it.
+        """
+        current_ids = set(operation_ids)
+        stale_ids = [
+            operation_id
+            for operation_id, entry in self.entries.items()
+            if entry.get("spec") == spec_name and operation_id not in current_ids
+        ]
+
+        for operation_id in stale_ids:
+            mdx_path = self.mdx_path(operation_id)
+            if mdx_path.exists():
+                mdx_path.unlink()
+                justsdk.print_info(f"Removed stale '{mdx_path.name}'")
+            del self.entries[operation_id]
+            self.pruned.add(operation_id)
+            self.recorded.discard(operation_id)
+            self.counts[DELETED] += 1
+
+        return len(stale_ids)
+
+    def summary(self):
+        return ", ".join(f"{count} {status}" for status, count in self.counts.items())
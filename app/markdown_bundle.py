@@ -0,0 +1,225 @@
+import shutil
+import tarfile
+import tempfile
+import threading
+import orjson
+
+from pathlib import Path
+from . import console
+from .fetcher import MarkdownFetcher
+from .metrics import run_metrics
+from ._constants import DEFAULT_JOBS, PRO_MODE, VALID_MODES, MD_EXTENSION
+
+JSONL_EXTENSION = ".jsonl"
+
+
+def bundle_format(source):
+    """
+    Detect the format of a markdown bundle: 'directory', 'tar' or 'jsonl'.
+    Returns None if the source is missing or not a supported bundle.
+    """
+    source = Path(source)
+
+    if source.is_dir():
+        return "directory"
+    if not source.is_file():
+        return None
+    if source.suffix.lower() == JSONL_EXTENSION:
+        return "jsonl"
+    if tarfile.is_tarfile(source):
+        return "tar"
+    return None
+
+
+def page_key(name):
+    """
+    Map a bundle member like 'pro/ping-server.md' or 'ping-server.md' to its
+    (mode, operation_id) key; the mode is None for pages outside a mode folder.
+    """
+    path = Path(name)
+    mode = path.parent.name if path.parent.name in VALID_MODES else None
+    return mode, path.stem
+
+
+class BundlePages:
+    """
+    Pages of a bundle file, indexed by where they are stored and read on
+    demand, so memory does not grow with the size of the bundle.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        # {(mode, operation_id): (offset, size)}
+        self.offsets = {}
+        # Fetch threads share the file and its position
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        return key in self.offsets
+
+    def get(self, key):
+        """
+        Read the body of a page, or None if the bundle does not have it.
+        """
+        location = self.offsets.get(key)
+        if location is None:
+            return None
+
+        offset, size = location
+        with self._lock:
+            self.file.seek(offset)
+            data = self.file.read(size)
+        return self.decode(data)
+
+    def decode(self, data):
+        return data.decode("utf-8")
+
+    def close(self):
+        self.file.close()
+
+
+class TarPages(BundlePages):
+    """
+    Markdown pages of a tarball, read at the offset of their member. A
+    compressed tarball cannot be read at an offset, so its pages are
+    decompressed once into a temporary file instead.
+    """
+
+    def __init__(self, source):
+        try:
+            archive = tarfile.open(source, "r:")
+        except tarfile.ReadError:
+            archive = None
+
+        if archive is not None:
+            super().__init__(open(source, "rb"))
+            with archive:
+                for member in self.page_members(archive):
+                    self.offsets[page_key(member.name)] = (
+                        member.offset_data,
+                        member.size,
+                    )
+            return
+
+        super().__init__(tempfile.TemporaryFile())
+        with tarfile.open(source, "r:*") as archive:
+            for member in self.page_members(archive):
+                offset = self.file.tell()
+                shutil.copyfileobj(archive.extractfile(member), self.file)
+                self.offsets[page_key(member.name)] = (offset, member.size)
+
+    @staticmethod
+    def page_members(archive):
+        for member in archive:
+            if member.isfile() and member.name.endswith(MD_EXTENSION):
+                yield member
+
+
+class JsonlPages(BundlePages):
+    """
+    Markdown pages of a JSONL bundle, one object per line with
+    'operation_id', 'body' and an optional 'mode'. Only the offset of each
+    line is kept, and the line is parsed again when its page is read.
+    """
+
+    def __init__(self, source):
+        super().__init__(open(source, "rb"))
+        offset = 0
+
+        for line_number, line in enumerate(self.file, 1):
+            if line.strip():
+                try:
+                    entry = orjson.loads(line)
+                    key = (entry.get("mode"), entry["operation_id"])
+                    if "body" not in entry:
+                        raise KeyError("body")
+                except (orjson.JSONDecodeError, KeyError, TypeError) as e:
+                    self.close()
+                    raise ValueError(f"Invalid entry on line {line_number}: {e}")
+                self.offsets[key] = (offset, len(line))
+            offset += len(line)
+
+    def decode(self, data):
+        return orjson.loads(data)["body"]
+
+
+class BundleFetcher(MarkdownFetcher):
+    """
+    Serve markdown pages from a local export instead of the ReadMe API: a
+    directory (e.g. a cache snapshot), a tarball or a JSONL bundle.
+
+    Pages are looked up as '<mode>/<operation_id>.md' first, then as
+    '<operation_id>.md', so both per-mode and flat exports work. Without a
+    mode, the pro folder is used, as in MarkdownCache.
+    """
+
+    def __init__(self, source, jobs=DEFAULT_JOBS):
+        super().__init__(jobs=jobs, offline=True)
+        self.source = Path(source)
+        self.format = bundle_format(self.source)
+
+        if self.format is None:
+            raise ValueError(
+                f"'{self.source}' is not a directory, tarball or JSONL bundle"
+            )
+
+        # Archives are indexed once up front; directories are read page by page
+        if self.format == "tar":
+            self.pages = TarPages(self.source)
+        elif self.format == "jsonl":
+            self.pages = JsonlPages(self.source)
+        else:
+            self.pages = None
+
+    def create_client(self):
+        # No network access at all
+        return None
+
+    def get_base_url(self, mode=None):
+        return str(self.source)
+
+    def page_key(self, operation_id, mode=None):
+        for key_mode in (mode or PRO_MODE, None):
+            if self.pages is not None:
+                if (key_mode, operation_id) in self.pages:
+                    return key_mode, operation_id
+            elif (
+                self.source / (key_mode or "") / f"{operation_id}{MD_EXTENSION}"
+            ).is_file():
+                return key_mode, operation_id
+
+        return mode, operation_id
+
+    def load(self, operation_id, mode=None):
+        for key_mode in (mode or PRO_MODE, None):
+            if self.pages is not None:
+                body = self.pages.get((key_mode, operation_id))
+                if body is not None:
+                    return body
+                continue
+
+            page_path = self.source / (key_mode or "") / f"{operation_id}{MD_EXTENSION}"
+            if page_path.is_file():
+                return page_path.read_text(encoding="utf-8")
+
+        return None
+
+    def _fetch(self, operation_id, mode=None):
+        try:
+            body = self.load(operation_id, mode)
+        except (OSError, UnicodeDecodeError) as e:
+            console.print_error(f"Failed to read '{operation_id}.md': {e}")
+            return None
+
+        if body is None:
+            console.print_error(f"No markdown for '{operation_id}' in '{self.source}'")
+            return None
+
+        run_metrics.increment("bundle_pages")
+        console.print_success(f"Loaded markdown for '{operation_id}' from bundle")
+        return body
+
+    def close(self):
+        if self.pages is not None:
+            self.pages.close()
+            self.pages = None
@@ -0,0 +1,71 @@
+import justsdk
+
+from pathlib import Path
+from ._constants import DEFAULT_CACHE_DIR, PRO_MODE, MD_EXTENSION, JSON_EXTENSION
+
+
+class MarkdownCache:
+    """
+    On-disk cache of fetched markdown pages, keyed by API mode and operation ID.
+    Each page is stored next to a small JSON file holding its validators
+    (ETag / Last-Modified) so later runs can send conditional requests.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    def _paths(self, operation_id, mode=None):
+        mode_dir = self.cache_dir / (mode or PRO_MODE)
+        return (
+            mode_dir / f"{operation_id}{MD_EXTENSION}",
+            mode_dir / f"{operation_id}{JSON_EXTENSION}",
+        )
+
+    def load(self, operation_id, mode=None):
+        """
+        Load a cached page as a dict with 'body', 'etag' and 'last_modified'.
+        Returns None if the page is not cached.
+        """
+        body_path, meta_path = self._paths(operation_id, mode)
+
+        if not body_path.exists():
+            return None
+
+        try:
+            body = body_path.read_text(encoding="utf-8")
+            meta = justsdk.read_file(meta_path) if meta_path.exists() else {}
+        except (OSError, ValueError):
+            return None
+
+        return {
+            "body": body,
+            "etag": meta.get("etag"),
+            "last_modified": meta.get("last_modified"),
+        }
+
+    def store(self, operation_id, body, etag=None, last_modified=None, mode=None):
+        """
+        Store a fetched page and its validators.
+        """
+        body_path, meta_path = self._paths(operation_id, mode)
+
+        justsdk.write_file(body, body_path, atomic=True)
+        justsdk.write_file(
+            {"etag": etag, "last_modified": last_modified}, meta_path, atomic=True
+        )
+
+    @staticmethod
+    def conditional_headers(entry):
+        """
+        Build If-None-Match / If-Modified-Since headers for a cached entry.
+        """
+        headers = {}
+
+        if entry is None:
+            return headers
+
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
@@ -0,0 +1,57 @@
+import threading
+
+from collections import OrderedDict
+from .metrics import run_metrics
+
+
+class LRUMemo:
+    """
+    A bounded memo that evicts the least recently used entry once full.
+    Hits, misses and evictions are counted in the run metrics under `name`.
+    """
+
+    def __init__(self, name, max_entries):
+        self.name = name
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, compute):
+        """
+        Return the memoized value for `key`, calling `compute()` on a miss.
+        """
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                run_metrics.increment(f"{self.name}_hits")
+                return self.entries[key]
+
+        value = compute()
+
+        with self._lock:
+            self.misses += 1
+        run_metrics.increment(f"{self.name}_misses")
+        self.put(key, value)
+
+        return value
+
+    def put(self, key, value):
+        """
+        Store a value computed ahead of its first lookup.
+        """
+        with self._lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                run_metrics.increment(f"{self.name}_evictions")
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
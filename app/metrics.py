@@ -0,0 +1,171 @@
+import threading
+import time
+import justsdk
+
+from contextlib import contextmanager
+from pathlib import Path
+
+FETCH_STAGE = "fetch"
+PARSE_STAGE = "parse"
+CONVERT_STAGE = "convert"
+WRITE_STAGE = "write"
+ADD_MINT_STAGE = "add_mint"
+QUEUE_STAGE = "queue"
+
+SLOWEST_OPERATIONS_LIMIT = 10
+PROMETHEUS_PREFIX = "mintlify_oas"
+
+
+class RunMetrics:
+    """
+    Thread-safe collector of per-stage timings and counters for one run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.perf_counter()
+            self.stages = {}
+            self.operations = {}
+            self.counters = {}
+
+    def record(self, stage, seconds, operation=None):
+        """
+        Record time spent in a stage, optionally for a single operation.
+        """
+        with self._lock:
+            totals = self.stages.setdefault(
+                stage, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            )
+            totals["count"] += 1
+            totals["total_seconds"] += seconds
+            totals["max_seconds"] = max(totals["max_seconds"], seconds)
+
+            if operation is not None:
+                stages = self.operations.setdefault(operation, {})
+                stages[stage] = stages.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def time_stage(self, stage, operation=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, operation)
+
+    def increment(self, counter, amount=1):
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def export(self):
+        """
+        Export the raw metrics so another process can merge them.
+        """
+        with self._lock:
+            return {
+                "stages": {k: dict(v) for k, v in self.stages.items()},
+                "operations": {k: dict(v) for k, v in self.operations.items()},
+                "counters": dict(self.counters),
+            }
+
+    def merge(self, exported):
+        """
+        Merge metrics exported by another process, e.g. a pool worker.
+        """
+        with self._lock:
+            for stage, other in exported["stages"].items():
+                totals = self.stages.setdefault(
+                    stage, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+                )
+                totals["count"] += other["count"]
+                totals["total_seconds"] += other["total_seconds"]
+                totals["max_seconds"] = max(totals["max_seconds"], other["max_seconds"])
+
+            for operation, stages in exported["operations"].items():
+                merged = self.operations.setdefault(operation, {})
+                for stage, seconds in stages.items():
+                    merged[stage] = merged.get(stage, 0.0) + seconds
+
+            for counter, value in exported["counters"].items():
+                self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def slowest_operations(self, limit=SLOWEST_OPERATIONS_LIMIT):
+        with self._lock:
+            ranked = sorted(
+                self.operations.items(),
+                key=lambda item: sum(item[1].values()),
+                reverse=True,
+            )
+
+        return [
+            {
+                "operation": operation,
+                "total_seconds": sum(stages.values()),
+                "stages": stages,
+            }
+            for operation, stages in ranked[:limit]
+        ]
+
+    def to_report(self):
+        """
+        Build the machine-readable run report.
+        """
+        with self._lock:
+            report = {
+                "wall_seconds": time.perf_counter() - self.started_at,
+                "stages": {k: dict(v) for k, v in sorted(self.stages.items())},
+                "counters": dict(sorted(self.counters.items())),
+                "operations": len(self.operations),
+            }
+
+        report["slowest_operations"] = self.slowest_operations()
+        return report
+
+    def write_report(self, report_path):
+        justsdk.write_file(self.to_report(), Path(report_path), atomic=True)
+        justsdk.print_info(f"Wrote run report to '{report_path}'")
+
+    def write_prometheus(self, textfile_path):
+        """
+        Write the run metrics in the Prometheus textfile exposition format.
+        """
+        report = self.to_report()
+        lines = [
+            f"# HELP {PROMETHEUS_PREFIX}_run_duration_seconds Wall-clock duration of the run.",
+            f"# TYPE {PROMETHEUS_PREFIX}_run_duration_seconds gauge",
+            f"{PROMETHEUS_PREFIX}_run_duration_seconds {report['wall_seconds']:.6f}",
+            f"# HELP {PROMETHEUS_PREFIX}_stage_seconds_total Time spent per pipeline stage.",
+            f"# TYPE {PROMETHEUS_PREFIX}_stage_seconds_total counter",
+        ]
+        lines.extend(
+            f'{PROMETHEUS_PREFIX}_stage_seconds_total{{stage="{stage}"}} {totals["total_seconds"]:.6f}'
+            for stage, totals in report["stages"].items()
+        )
+        lines.extend(
+            [
+                f"# HELP {PROMETHEUS_PREFIX}_stage_runs_total Number of times each stage ran.",
+                f"# TYPE {PROMETHEUS_PREFIX}_stage_runs_total counter",
+            ]
+        )
+        lines.extend(
+            f'{PROMETHEUS_PREFIX}_stage_runs_total{{stage="{stage}"}} {totals["count"]}'
+            for stage, totals in report["stages"].items()
+        )
+
+        for counter, value in report["counters"].items():
+            name = f"{PROMETHEUS_PREFIX}_{counter}_total"
+            lines.extend([f"# TYPE {name} counter", f"{name} {value}"])
+
+        justsdk.write_file("\n".join(lines) + "\n", Path(textfile_path), atomic=True)
+        justsdk.print_info(f"Wrote Prometheus metrics to '{textfile_path}'")
+
+
+# Metrics of the current process; pool workers export theirs to the parent
+run_metrics = RunMetrics()
+
+
+def operation_key(operation_id, mode=None):
+    return f"{mode}/{operation_id}" if mode else operation_id
@@ -0,0 +1,87 @@
+import justsdk
+
+from pathlib import Path
+from .manifest import hash_file
+from ._constants import ADD_MINT_STATE_FILE
+
+
+class MintState:
+    """
+    Record of the spec files that add-mint already processed, keyed by their
+    size, modification time and content hash, so unchanged specs are
+    skipped without being read.
+    """
+
+    def __init__(self, path=None, entries=None):
+        self.path = Path(path or ADD_MINT_STATE_FILE)
+        self.entries = entries or {}
+        self.changed = False
+
+    @classmethod
+    def load(cls, path=None):
+        """
+        Load the state file, or start an empty state.
+        """
+        path = Path(path or ADD_MINT_STATE_FILE)
+        try:
+            data = justsdk.read_file(path) if path.exists() else {}
+        except (OSError, ValueError):
+            justsdk.print_warning(f"Ignoring unreadable add-mint state '{path}'")
+            data = {}
+
+        return cls(path, data.get("specs", {}))
+
+    @staticmethod
+    def key(json_file):
+        return str(Path(json_file).resolve())
+
+    def is_current(self, json_file):
+        """
+        Check whether a spec is unchanged since it was last processed. Only a
+        stat is needed unless the file was touched without changing its size,
+        in which case its content hash decides.
+        """
+        entry = self.entries.get(self.key(json_file))
+        if entry is None:
+            return False
+
+        try:
+            stat = Path(json_file).stat()
+        except OSError:
+            return False
+
+        if stat.st_size != entry["size"]:
+            return False
+        if stat.st_mtime_ns == entry["mtime_ns"]:
+            return True
+
+        try:
+            if hash_file(json_file) != entry["sha256"]:
+                return False
+        except OSError:
+            return False
+
+        entry["mtime_ns"] = stat.st_mtime_ns
+        self.changed = True
+        return True
+
+    def record(self, json_file):
+        """
+        Record a spec as processed in its current state.
+        """
+        stat = Path(json_file).stat()
+        self.entries[self.key(json_file)] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": hash_file(json_file),
+        }
+        self.changed = True
+
+    def save(self):
+        if not self.changed:
+            return
+
+        justsdk.write_file(
+            {"specs": self.entries}, self.path, sort_keys=True, atomic=True
+        )
+        self.changed = False
@@ -0,0 +1,190 @@
+import justsdk
+
+from pathlib import Path
+from .convert_md_to_mdx import (
+    OutputRun,
+    SpecTarget,
+    add_frontmatter,
+    convert_callouts_and_links,
+    run_operations,
+)
+from .fetcher import get_base_url
+from .manifest import hash_bytes
+from .memo import LRUMemo
+from .metrics import run_metrics, PARSE_STAGE
+from .operation_index import OperationIndex
+from .parallel import collect_mode_specs
+from .reference_links import known_operation_ids
+from ._constants import DEFAULT_MDX_DIR, PAGE_MEMO_SIZE, VALID_MODES
+
+
+def normalize_base_urls(content):
+    """
+    Replace the documentation base URL of every mode with the same marker,
+    so pages that differ only in their base URL compare equal.
+    """
+    for base_url in sorted(
+        {get_base_url(mode) for mode in VALID_MODES}, key=len, reverse=True
+    ):
+        content = content.replace(base_url, "\0")
+    return content
+
+
+def retarget(content, from_mode, to_mode):
+    """
+    Swap the base URL of one mode for another's in content.
+    """
+    if from_mode == to_mode:
+        return content
+    return content.replace(get_base_url(from_mode), get_base_url(to_mode))
+
+
+class SharedPageConverter:
+    """
+    Converts markdown pages once per distinct content, whatever operation or
+    mode they belong to. Pages that differ only in their base URL share one
+    conversion, whose base URL is then swapped for the mode's own.
+    """
+
+    def __init__(self, max_entries=PAGE_MEMO_SIZE):
+        self.memo = LRUMemo("page_memo", max_entries)
+
+    def convert(self, md_content, openapi_metadata=None, mode=None):
+        """
+        Drop-in replacement for convert_markdown().
+        """
+        key = hash_bytes(normalize_base_urls(md_content))
+        source_mode, source, body, link_targets = self.memo.get(
+            key,
+            lambda: (mode, md_content, *convert_callouts_and_links(md_content, mode)),
+        )
+
+        if source_mode != mode or source != md_content:
+            # Only share the conversion when it maps back to this exact page
+            if retarget(source, source_mode, mode) == md_content:
+                body = retarget(body, source_mode, mode)
+                run_metrics.increment("shared_pages")
+            else:
+                body, link_targets = convert_callouts_and_links(md_content, mode)
+
+        return add_frontmatter(body, openapi_metadata), link_targets
+
+
+def plan_operations(reference_dir=None, modes=None, with_operations=False):
+    """
+    Build the union of the operations of every mode's specs.
+    Returns ({operation_id: [(mode, spec file), ...]}, {(mode, spec file):
+    OperationIndex}); an operationId in several specs of one mode is planned
+    for the last of them in name order, whose page a per-mode run leaves in
+    place.
+    """
+    plan = {}
+    indexes = {}
+
+    for mode, json_file in collect_mode_specs(reference_dir, modes):
+        with run_metrics.time_stage(PARSE_STAGE):
+            operation_index = OperationIndex.load(
+                json_file, with_operations=with_operations
+            )
+        operation_index.report_duplicates(json_file.name)
+        indexes[(mode, json_file)] = operation_index
+
+        for operation_id in operation_index.operation_ids:
+            targets = plan.setdefault(operation_id, [])
+            if targets and targets[-1][0] == mode:
+                targets[-1] = (mode, json_file)
+            else:
+                targets.append((mode, json_file))
+
+    return plan, indexes
+
+
+def convert_shared_modes(
+    reference_dir=None,
+    output_dir=None,
+    fetcher=None,
+    modes=None,
+    incremental=False,
+    pipeline=None,
+):
+    """
+    Convert the specs of every mode in one pass over the union of their
+    operations. Each page is fetched once per distinct source (see
+    MarkdownFetcher.page_key()) and converted once per distinct content,
+    then written to every mode that has the operation, with the mode's own
+    reference links and frontmatter.
+    """
+    output_dir = Path(output_dir or DEFAULT_MDX_DIR)
+    plan, indexes = plan_operations(reference_dir, modes, incremental)
+
+    if not plan:
+        justsdk.print_warning("No operation IDs found for any mode.")
+        return True
+
+    mode_names = sorted({mode for mode, _ in indexes})
+    outputs = {}
+    for mode in mode_names:
+        (output_dir / mode).mkdir(parents=True, exist_ok=True)
+        outputs[mode] = OutputRun(output_dir / mode, pipeline, incremental)
+
+    page_count = sum(len(targets) for targets in plan.values())
+    justsdk.print_info(
+        f"Found {len(plan)} distinct operation IDs across {len(mode_names)} mode(s), "
+        f"{page_count} pages to write"
+    )
+
+    try:
+        targets = {}
+        for (mode, json_file), operation_index in indexes.items():
+            output = outputs[mode]
+            if output.manifest is not None:
+                output.manifest.prune(json_file.name, operation_index.operation_ids)
+
+            output.open_journal(json_file)
+            targets[(mode, json_file)] = SpecTarget(
+                output,
+                json_file,
+                mode,
+                operation_index,
+                known_operation_ids(json_file.parent),
+            )
+
+        outcomes = run_operations(
+            {
+                operation_id: [targets[target] for target in spec_targets]
+                for operation_id, spec_targets in plan.items()
+            },
+            fetcher,
+            pipeline,
+            SharedPageConverter().convert,
+        )
+
+        for mode in mode_names:
+            outputs[mode].commit(outcomes)
+            if outputs[mode].manifest is not None:
+                justsdk.print_info(
+                    f"Operations in '{output_dir / mode}': "
+                    f"{outputs[mode].manifest.summary()}"
+                )
+    finally:
+        for output in outputs.values():
+            output.close()
+
+    success = True
+    for mode in mode_names:
+        results = [
+            outcomes[(json_file, operation_id)]
+            for operation_id, spec_targets in plan.items()
+            for target_mode, json_file in spec_targets
+            if target_mode == mode
+        ]
+        justsdk.print_info(
+            f"Successfully processed {sum(results)}/{len(results)} {mode} operations"
+        )
+        success = success and all(results)
+
+    justsdk.print_info(
+        f"{run_metrics.counters.get('shared_pages', 0)} page(s) reused the "
+        "conversion of another page"
+    )
+    return success
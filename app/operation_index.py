@@ -0,0 +1,159 @@
+import mmap
+import orjson
+import justsdk
+
+from collections import namedtuple
+from itertools import groupby
+from pathlib import Path
+from .spec_scanner import scan_operations
+from ._constants import HTTP_METHODS, SPEC_SCAN_MIN_SIZE
+
+OperationRef = namedtuple("OperationRef", ["path", "method", "operation"])
+
+
+def find_operation(openapi_data, operation_id):
+    """
+    Find the first operation with the given operationId in parsed OpenAPI
+    data, stopping at the first match. Returns an OperationRef or None.
+    For repeated lookups in the same spec, build an OperationIndex instead.
+    """
+    for path, path_item in openapi_data.get("paths", {}).items():
+        for method in HTTP_METHODS:
+            if method not in path_item:
+                continue
+
+            operation = path_item[method]
+            if operation.get("operationId") == operation_id:
+                return OperationRef(path, method, operation)
+
+    return None
+
+
+class OperationIndex:
+    """
+    Index of the operations in an OpenAPI specification, built in one pass.
+    Maps each operationId to its path, method and operation object, and keeps
+    track of operationIds that appear more than once.
+    """
+
+    def __init__(self, openapi_data):
+        self.has_paths = "paths" in openapi_data
+        # Every operation in spec order, with or without an operationId
+        self.operations = []
+        self.by_id = {}
+        self.duplicates = {}
+
+        if not self.has_paths:
+            return
+
+        for path, path_item in openapi_data["paths"].items():
+            for method in HTTP_METHODS:
+                if method not in path_item:
+                    continue
+
+                self.add(OperationRef(path, method, path_item[method]))
+
+    @classmethod
+    def load(cls, json_file, with_operations=False):
+        """
+        Build the index of a spec file. Specs of SPEC_SCAN_MIN_SIZE or more
+        are scanned (see scan()), smaller ones are parsed, which is faster.
+        """
+        if Path(json_file).stat().st_size >= SPEC_SCAN_MIN_SIZE:
+            return cls.scan(json_file, with_operations)
+        return cls(orjson.loads(Path(json_file).read_bytes()))
+
+    @classmethod
+    def scan(cls, json_file, with_operations=False):
+        """
+        Build the index from a spec file without parsing the whole document.
+        The file is memory-mapped and only the operations under `paths` are
+        located, so `components` and other large sections cost no memory.
+
+        Operation objects only hold their operationId unless
+        `with_operations` is set, in which case each one is parsed on its own.
+        """
+        index = cls({})
+        summary = {}
+
+        with (
+            open(json_file, "rb") as source,
+            mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as buffer,
+        ):
+            spans = scan_operations(buffer, summary)
+
+            # Methods of a path are indexed in HTTP_METHODS order, as when
+            # the index is built from the parsed spec
+            for _, path_spans in groupby(spans, key=lambda span: span.path):
+                for span in sorted(
+                    path_spans, key=lambda span: HTTP_METHODS.index(span.method)
+                ):
+                    if with_operations:
+                        operation = orjson.loads(buffer[span.start : span.end])
+                    elif span.operation_id is not None:
+                        operation = {"operationId": span.operation_id}
+                    else:
+                        operation = {}
+
+                    index.add(OperationRef(span.path, span.method, operation))
+
+        index.has_paths = summary["has_paths"]
+        return index
+
+    def add(self, ref):
+        """
+        Add an operation, keeping the first one for each operationId.
+        """
+        self.operations.append(ref)
+
+        operation_id = ref.operation.get("operationId")
+        if operation_id is None:
+            return
+
+        if operation_id in self.by_id:
+            self.duplicates.setdefault(operation_id, [self.by_id[operation_id]]).append(
+                ref
+            )
+        else:
+            self.by_id[operation_id] = ref
+
+    @property
+    def operation_ids(self):
+        """
+        All operationIds in spec order, repeated if they are duplicated.
+        """
+        return [
+            ref.operation["operationId"]
+            for ref in self.operations
+            if "operationId" in ref.operation
+        ]
+
+    def get(self, operation_id):
+        """
+        Get the first operation with the given operationId, or None.
+        """
+        return self.by_id.get(operation_id)
+
+    def find(self, operation_id):
+        """
+        Find the path and HTTP method for an operationId.
+        Returns tuple of (path, method) or (None, None) if not found.
+        """
+        ref = self.by_id.get(operation_id)
+        if ref is None:
+            return None, None
+        return ref.path, ref.method
+
+    def report_duplicates(self, source_name=None):
+        """
+        Print a warning for every operationId used by more than one operation.
+        """
+        where = f" in '{source_name}'" if source_name else ""
+
+        for operation_id, refs in self.duplicates.items():
+            locations = ", ".join(f"{ref.method.upper()} {ref.path}" for ref in refs)
+            justsdk.print_warning(
+                f"Duplicate operationId '{operation_id}'{where}: {locations}"
+            )
+
+        return len(self.duplicates)
@@ -0,0 +1,194 @@
+import os
+import shutil
+import tempfile
+import justsdk
+
+from pathlib import Path
+from .metrics import run_metrics
+
+
+class OutputSink:
+    """
+    Collects the generated files of an output directory and writes only the
+    ones whose bytes differ from what is already on disk.
+
+    Files are renamed into place without a sync of their own; commit() then
+    syncs the directory once for the whole batch. With `swap`, files are
+    staged in a sibling directory instead, which replaces the output
+    directory as a whole on commit (two renames), so readers never see a mix
+    of old and new files. Files removed from the output directory before
+    the commit stay removed.
+    """
+
+    def __init__(self, output_dir, swap=False):
+        self.output_dir = Path(output_dir)
+        self.swap = swap
+        self.staging_dir = None
+        self.written = 0
+        self.unchanged = 0
+
+    def is_current(self, file_path, data):
+        """
+        Whether `file_path` already holds exactly `data`.
+        """
+        try:
+            if file_path.stat().st_size != len(data):
+                return False
+            return file_path.read_bytes() == data
+        except OSError:
+            return False
+
+    def write(self, file_path, content):
+        """
+        Write `content` to `file_path` inside the output directory, unless it
+        is already there. Returns whether the file was written.
+        """
+        file_path = Path(file_path)
+        data = content.encode("utf-8")
+
+        if self.is_current(file_path, data):
+            self.unchanged += 1
+            run_metrics.increment("files_unchanged")
+            return False
+
+        if self.swap:
+            target = self._staging() / file_path.relative_to(self.output_dir)
+        else:
+            target = file_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_fd, temp_path = tempfile.mkstemp(
+            dir=target.parent, prefix=f".{target.stem}.", suffix=target.suffix
+        )
+        try:
+            with open(temp_fd, "wb") as output:
+                output.write(data)
+            os.replace(temp_path, target)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+
+        self.written += 1
+        return True
+
+    def commit(self):
+        """
+        Sync the output directory once for every file written to it, or swap
+        the staged directory into place.
+        """
+        if self.swap:
+            if self.staging_dir is not None:
+                self._swap()
+        elif self.written:
+            sync_directory(self.output_dir)
+
+        if self.written or self.unchanged:
+            justsdk.print_debug(
+                f"'{self.output_dir}': {self.written} file(s) written, "
+                f"{self.unchanged} unchanged"
+            )
+
+    def discard(self):
+        """
+        Drop staged files that were not committed.
+        """
+        if self.staging_dir is not None:
+            shutil.rmtree(self.staging_dir, ignore_errors=True)
+            self.staging_dir = None
+
+    def _staging(self):
+        if self.staging_dir is None:
+            self.output_dir.parent.mkdir(parents=True, exist_ok=True)
+            self.staging_dir = Path(
+                tempfile.mkdtemp(
+                    dir=self.output_dir.parent, prefix=f".{self.output_dir.name}."
+                )
+            )
+        return self.staging_dir
+
+    def _swap(self):
+        staging_dir = self.staging_dir
+
+        # Carry over everything that was not rewritten, as hard links where
+        # the filesystem allows it
+        if self.output_dir.is_dir():
+            for entry in os.scandir(self.output_dir):
+                target = staging_dir / entry.name
+                if target.exists():
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.copytree(entry.path, target, copy_function=link_or_copy)
+                else:
+                    link_or_copy(entry.path, target)
+
+        # mkdtemp() creates private directories
+        if self.output_dir.is_dir():
+            os.chmod(staging_dir, os.stat(self.output_dir).st_mode & 0o777)
+        else:
+            os.chmod(staging_dir, 0o777 & ~current_umask())
+        sync_directory(staging_dir)
+
+        previous_dir = None
+        if self.output_dir.exists():
+            previous_dir = Path(
+                tempfile.mkdtemp(
+                    dir=self.output_dir.parent, prefix=f".{self.output_dir.name}.old."
+                )
+            )
+            os.replace(self.output_dir, previous_dir / self.output_dir.name)
+
+        try:
+            os.replace(staging_dir, self.output_dir)
+        except BaseException:
+            # Put the previous output back rather than leave none
+            if previous_dir is not None:
+                os.replace(previous_dir / self.output_dir.name, self.output_dir)
+                shutil.rmtree(previous_dir, ignore_errors=True)
+            raise
+        self.staging_dir = None
+        sync_directory(self.output_dir.parent)
+
+        if previous_dir is not None:
+            shutil.rmtree(previous_dir, ignore_errors=True)
+
+
+def contains_path(directory, path):
+    """
+    Whether `path` is `directory` itself or somewhere inside it.
+    """
+    directory = Path(directory).resolve()
+    path = Path(path).resolve()
+    return path == directory or directory in path.parents
+
+
+def link_or_copy(source, target):
+    """
+    Hard link `source` to `target`, copying it when linking is not possible.
+    """
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+    return target
+
+
+def sync_directory(directory):
+    """
+    Flush a directory's entries, and the renames into it, to disk.
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:  # Directories cannot be opened on Windows
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def current_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
@@ -0,0 +1,218 @@
+import multiprocessing
+import os
+import justsdk
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from .metrics import run_metrics
+from .mint_state import MintState
+from ._constants import DEFAULT_REFERENCE_DIR, DEFAULT_MDX_DIR, VALID_MODES
+
+# Fetcher of the current worker process, shared by every spec it converts
+_worker_fetcher = None
+
+
+def default_workers(task_count):
+    """
+    Get the number of worker processes to use for a number of tasks.
+    """
+    return max(1, min(os.cpu_count() or 1, task_count))
+
+
+def collect_mode_specs(reference_dir=None, modes=None):
+    """
+    List (mode, spec file) pairs for every JSON spec in each mode directory,
+    sorted by mode and then by file name.
+    """
+    reference_dir = Path(reference_dir or DEFAULT_REFERENCE_DIR)
+    tasks = []
+
+    for mode in modes or VALID_MODES:
+        mode_reference_dir = reference_dir / mode
+
+        if not mode_reference_dir.exists():
+            justsdk.print_warning(f"Mode directory '{mode_reference_dir}' not found")
+            continue
+
+        for json_file in sorted(mode_reference_dir.glob("*.json")):
+            tasks.append((mode, json_file))
+
+    return tasks
+
+
+def _init_convert_worker(fetcher_options):
+    from .fetcher import create_fetcher
+
+    global _worker_fetcher
+    _worker_fetcher = create_fetcher(**fetcher_options)
+
+
+def _convert_spec(mode, json_file, output_dir, incremental, pipeline):
+    from . import convert_md_to_mdx
+
+    run_metrics.reset()
+    success = convert_md_to_mdx.process_file(
+        json_file, output_dir / mode, mode, _worker_fetcher, incremental, pipeline
+    )
+    metrics = run_metrics.export()
+    return {
+        "mode": mode,
+        "file": json_file.name,
+        "success": success,
+        # Counted by the HTTP client; bundle sources make no requests
+        "requests": metrics["counters"].get("http_requests", 0),
+        "retries": metrics["counters"].get("retries", 0),
+        "metrics": metrics,
+    }
+
+
+def print_summary(results, label):
+    """
+    Print the merged results of a parallel run in task order.
+    """
+    justsdk.print_info(f"\n{label} summary:")
+    for result in results:
+        if result.get("skipped"):
+            status = "unchanged"
+        else:
+            status = "ok" if result["success"] else "FAILED"
+        name = (
+            f"{result['mode']}/{result['file']}" if "mode" in result else result["file"]
+        )
+        print(f"  - {name}: {status}")
+
+    success_count = sum(result["success"] for result in results)
+    justsdk.print_info(
+        f"Completed processing {success_count}/{len(results)} files successfully!"
+    )
+    return success_count == len(results)
+
+
+def convert_all_modes(
+    reference_dir=None,
+    output_dir=None,
+    workers=None,
+    fetcher_options=None,
+    incremental=False,
+    pipeline=None,
+):
+    """
+    Convert every spec of every API mode to MDX on a process pool.
+    Each worker process keeps one fetcher. The request budget is shared by
+    every worker, whatever the size of the specs each one converts, while
+    rate limits are split evenly between workers.
+    """
+    output_dir = Path(output_dir or DEFAULT_MDX_DIR)
+    tasks = collect_mode_specs(reference_dir)
+
+    if not tasks:
+        justsdk.print_warning("No JSON files found for any mode.")
+        return True
+
+    workers = workers or default_workers(len(tasks))
+    fetcher_options = dict(fetcher_options or {})
+
+    if fetcher_options.get("budget"):
+        # Requests of every worker, counted against the whole budget
+        fetcher_options["budget_spent"] = multiprocessing.Value("q", 0)
+    if fetcher_options.get("rate_limits"):
+        from .rate_limiter import split_rate_limits
+
+        fetcher_options["rate_limits"] = split_rate_limits(
+            fetcher_options["rate_limits"], workers
+        )
+
+    justsdk.print_info(
+        f"Processing {len(tasks)} JSON file(s) across all modes with {workers} worker(s):"
+    )
+    for mode, json_file in tasks:
+        print(f"  - {mode}/{json_file.name}")
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_convert_worker,
+        initargs=(fetcher_options,),
+    ) as executor:
+        futures = [
+            executor.submit(
+                _convert_spec, mode, json_file, output_dir, incremental, pipeline
+            )
+            for mode, json_file in tasks
+        ]
+        results = [future.result() for future in futures]
+
+    for result in results:
+        run_metrics.merge(result.pop("metrics"))
+
+    justsdk.print_info(
+        f"Made {sum(r['requests'] for r in results)} HTTP request(s), "
+        f"{sum(r['retries'] for r in results)} of them retries"
+    )
+    return print_summary(results, "All modes")
+
+
+def _add_mint_spec(json_file):
+    from . import add_mint
+
+    run_metrics.reset()
+    success = add_mint.process_file(json_file)
+    return {"file": str(json_file), "success": success, "metrics": run_metrics.export()}
+
+
+def add_mint_parallel(reference_dir=None, workers=None, force=False):
+    """
+    Add x-mint fields to every JSON spec under the reference directory on a
+    process pool. Specs that are unchanged since they were last processed
+    are skipped, unless `force` is set.
+    """
+    reference_dir = Path(reference_dir or DEFAULT_REFERENCE_DIR)
+
+    if not reference_dir.exists():
+        justsdk.print_error(
+            f"Error: Reference directory '{reference_dir}' does not exist."
+        )
+        return False
+
+    json_files = sorted(reference_dir.rglob("*.json"))
+
+    if not json_files:
+        justsdk.print_warning("No JSON files found in the reference directory.")
+        return True
+
+    state = MintState.load()
+    skipped = []
+    if not force:
+        skipped = [json_file for json_file in json_files if state.is_current(json_file)]
+        json_files = [json_file for json_file in json_files if json_file not in skipped]
+
+    for json_file in skipped:
+        justsdk.print_info(f"'{json_file.name}' is unchanged, skipping...")
+    run_metrics.increment("specs_skipped", len(skipped))
+
+    results = []
+    if json_files:
+        workers = workers or default_workers(len(json_files))
+        justsdk.print_info(
+            f"Found {len(json_files)} JSON file(s) to process with {workers} worker(s)"
+        )
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_add_mint_spec, json_files))
+
+    for result in results:
+        run_metrics.merge(result.pop("metrics"))
+        if result["success"]:
+            state.record(result["file"])
+        result["file"] = str(Path(result["file"]).relative_to(reference_dir))
+    state.save()
+
+    results.extend(
+        {
+            "file": str(json_file.relative_to(reference_dir)),
+            "success": True,
+            "skipped": True,
+        }
+        for json_file in skipped
+    )
+    results.sort(key=lambda result: result["file"])
+    return print_summary(results, "add-mint")
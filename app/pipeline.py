@@ -0,0 +1,137 @@
+import queue
+import threading
+
+from collections import namedtuple
+from . import console
+from .profiling import profile_thread
+from ._constants import DEFAULT_CONVERT_WORKERS, PIPELINE_QUEUE_SIZE, WRITE_BATCH_SIZE
+
+PipelineSettings = namedtuple(
+    "PipelineSettings",
+    ["convert_workers", "queue_size", "write_batch", "swap_output", "resume"],
+    defaults=[
+        DEFAULT_CONVERT_WORKERS,
+        PIPELINE_QUEUE_SIZE,
+        WRITE_BATCH_SIZE,
+        False,
+        False,
+    ],
+)
+
+# Tells a stage that its input is exhausted
+_DONE = object()
+
+
+def run_pipeline(items, fetch, convert, write, fetch_workers=1, settings=None):
+    """
+    Stream items through fetch, convert and write stages that run at the same
+    time, connected by bounded queues so a slow stage holds back the ones
+    before it instead of piling up their results in memory.
+
+    - fetch(item) returns a payload, or None if the item failed.
+    - convert(item, payload) returns (success, job); the job is None when
+      there is nothing to write.
+    - write(jobs) writes a batch of (item, job) pairs in one call and
+      returns a success flag for each of them.
+
+    Returns a list of success flags in item order.
+    """
+    settings = settings or PipelineSettings()
+    items = list(items)
+    results = [False] * len(items)
+
+    pending = queue.Queue()
+    for index in range(len(items)):
+        pending.put(index)
+
+    converting = queue.Queue(maxsize=settings.queue_size)
+    writing = queue.Queue(maxsize=settings.queue_size)
+
+    def fetch_worker():
+        while True:
+            try:
+                index = pending.get_nowait()
+            except queue.Empty:
+                return
+
+            payload = _run_stage("fetch", items[index], fetch, items[index])
+            if payload is not None:
+                converting.put((index, payload))
+
+    def convert_worker():
+        while True:
+            task = converting.get()
+            if task is _DONE:
+                return
+
+            index, payload = task
+            success, job = _run_stage(
+                "convert", items[index], convert, items[index], payload
+            ) or (False, None)
+
+            if success and job is not None:
+                writing.put((index, job))
+            else:
+                results[index] = success
+
+    def write_worker():
+        while True:
+            batch = [writing.get()]
+            while len(batch) < settings.write_batch and batch[-1] is not _DONE:
+                try:
+                    batch.append(writing.get_nowait())
+                except queue.Empty:
+                    break
+
+            done = batch[-1] is _DONE
+            batch = [task for task in batch if task is not _DONE]
+
+            if batch:
+                jobs = [(items[index], job) for index, job in batch]
+                written = _run_stage("write", None, write, jobs) or []
+                for (index, _), success in zip(batch, written):
+                    results[index] = success
+
+            if done:
+                return
+
+    fetchers = _start(fetch_worker, max(1, min(fetch_workers, len(items))))
+    converters = _start(convert_worker, max(1, settings.convert_workers))
+    writer = _start(write_worker, 1)
+
+    _join(fetchers)
+    for _ in converters:
+        converting.put(_DONE)
+    _join(converters)
+    writing.put(_DONE)
+    _join(writer)
+
+    return results
+
+
+def _run_stage(stage, item, func, *args):
+    """
+    Run a stage function, reporting unexpected errors instead of letting
+    them stop the stage's worker and stall the pipeline.
+    """
+    try:
+        return func(*args)
+    except Exception as e:
+        where = f" for '{item}'" if item is not None else ""
+        console.print_error(f"Unexpected error in {stage} stage{where}: {e}")
+        return None
+
+
+def _start(target, count):
+    threads = [
+        threading.Thread(target=profile_thread(target), daemon=True)
+        for _ in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def _join(threads):
+    for thread in threads:
+        thread.join()
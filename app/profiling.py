@@ -0,0 +1,234 @@
+import cProfile
+import io
+import linecache
+import pstats
+import sys
+import threading
+import tracemalloc
+import justsdk
+
+from pathlib import Path
+from ._constants import PROFILE_OUTPUTS, PROFILE_TOP, PROFILE_SAMPLE_INTERVAL
+
+CPU_PROFILE = "cpu"
+MEMORY_PROFILE = "mem"
+PROFILE_KINDS = [CPU_PROFILE, MEMORY_PROFILE]
+
+# Allocations are attributed to the innermost frame in this package, so the
+# stack is recorded deep enough to reach it from inside the standard library
+TRACEMALLOC_FRAMES = 32
+PACKAGE_DIR = str(Path(__file__).resolve().parent)
+
+# Since Python 3.12, cProfile is built on sys.monitoring, so the profiler
+# enabled by the main thread sees every thread, and a second profiler cannot
+# be enabled alongside it
+PROFILER_SEES_THREADS = sys.version_info >= (3, 12)
+
+# A new memory snapshot is taken once traced memory grows by this factor
+# over the last one, so the snapshot nearest the peak is kept
+PEAK_SNAPSHOT_GROWTH = 1.1
+
+# CPU profile of the current run, which threads started by the pipeline join
+_active_profile = None
+
+
+class RunProfile:
+    """
+    Capture a cProfile or tracemalloc profile around a CLI run.
+
+    A CPU profile is written as a .prof file (for pstats, snakeviz, etc.) and
+    its top functions by own time are printed. A memory profile is written
+    as a report of the top allocation sites around the peak of traced
+    memory, which is sampled while the run goes on, and of what is still
+    allocated at the end. Worker processes are not profiled, only the main
+    process and its threads.
+    """
+
+    def __init__(self, kind, output_path=None, top=PROFILE_TOP):
+        if kind not in PROFILE_KINDS:
+            raise ValueError(
+                f"Unknown profile '{kind}', expected one of: {', '.join(PROFILE_KINDS)}"
+            )
+
+        self.kind = kind
+        self.output_path = Path(output_path or PROFILE_OUTPUTS[kind])
+        self.top = top
+        self.profile = None
+        self.thread_profiles = []
+        self._lock = threading.Lock()
+        self.peak_snapshot = None
+        self.peak_snapshot_size = 0
+        self._sampling = threading.Event()
+        self._sampler = None
+
+    def start(self):
+        global _active_profile
+
+        if self.kind == CPU_PROFILE:
+            self.profile = cProfile.Profile()
+            _active_profile = self
+            self.profile.enable()
+        else:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            self._sampler = threading.Thread(target=self._sample_peak, daemon=True)
+            self._sampler.start()
+
+    def stop(self):
+        """
+        Stop profiling and write the results.
+        """
+        global _active_profile
+
+        if self.kind == CPU_PROFILE:
+            self.profile.disable()
+            _active_profile = None
+            self.write_cpu_profile()
+        else:
+            self._sampling.set()
+            self._sampler.join()
+            self._take_peak_snapshot()
+            snapshot = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            self.write_memory_report(self.peak_snapshot, snapshot, peak)
+
+    def _sample_peak(self):
+        """
+        Poll traced memory until the profile stops, keeping a snapshot of
+        the allocations near its peak.
+        """
+        while not self._sampling.wait(PROFILE_SAMPLE_INTERVAL):
+            self._take_peak_snapshot()
+
+    def _take_peak_snapshot(self):
+        current, _ = tracemalloc.get_traced_memory()
+        if current > self.peak_snapshot_size * PEAK_SNAPSHOT_GROWTH:
+            self.peak_snapshot = tracemalloc.take_snapshot()
+            self.peak_snapshot_size = current
+
+    def profile_thread(self, target):
+        """
+        Wrap a thread target so its calls are added to this profile, since
+        cProfile only sees the thread that enabled it before Python 3.12.
+        """
+        if PROFILER_SEES_THREADS:
+            return target
+
+        def run(*args, **kwargs):
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:  # Another profiler is already active
+                return target(*args, **kwargs)
+
+            try:
+                return target(*args, **kwargs)
+            finally:
+                profile.disable()
+                with self._lock:
+                    self.thread_profiles.append(profile)
+
+        return run
+
+    def write_cpu_profile(self):
+        with self._lock:
+            stats = pstats.Stats(self.profile)
+            for profile in self.thread_profiles:
+                stats.add(profile)
+
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+        stats.dump_stats(self.output_path)
+
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+        justsdk.print_info(
+            f"Top {self.top} functions by own time "
+            f"(full profile in '{self.output_path}'):",
+            newline_before=True,
+        )
+        print(stream.getvalue().strip())
+
+    def write_memory_report(self, peak_snapshot, end_snapshot, peak):
+        peak_sites = allocation_sites(peak_snapshot)
+        end_sites = allocation_sites(end_snapshot)
+
+        lines = [
+            f"Peak traced memory: {format_size(peak)}",
+            f"Allocated near the peak by {PACKAGE_DIR}: "
+            f"{format_size(total_size(peak_sites))} "
+            f"(of {format_size(self.peak_snapshot_size)} traced)",
+            f"Still allocated at the end by {PACKAGE_DIR}: "
+            f"{format_size(total_size(end_sites))}",
+        ]
+        lines += self.format_sites("near the peak", peak_sites)
+        lines += self.format_sites("still allocated at the end", end_sites)
+
+        justsdk.write_file("\n".join(lines) + "\n", self.output_path, atomic=True)
+        justsdk.print_info(
+            f"Memory profile (full report in '{self.output_path}'):",
+            newline_before=True,
+        )
+        print("\n".join(lines[:3]))
+
+    def format_sites(self, title, sites):
+        lines = ["", f"Top {self.top} allocation sites {title}:"]
+        ranked = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)
+        for index, ((filename, lineno), (size, count)) in enumerate(
+            ranked[: self.top], 1
+        ):
+            lines.append(
+                f"{index:>3}. {filename}:{lineno}: "
+                f"{format_size(size)} in {count} block(s)"
+            )
+            line = linecache.getline(filename, lineno).strip()
+            if line:
+                lines.append(f"       {line}")
+        return lines
+
+
+def allocation_sites(snapshot):
+    """
+    Sum the memory still allocated in a snapshot by the innermost line of
+    this package that led to each allocation.
+    Returns {(filename, lineno): (size, count)}.
+    """
+    sites = {}
+    for stat in snapshot.statistics("traceback"):
+        # Frames go from the oldest to the most recent
+        frame = next(
+            (
+                frame
+                for frame in reversed(stat.traceback)
+                if frame.filename.startswith(PACKAGE_DIR)
+            ),
+            None,
+        )
+        if frame is None:
+            continue
+
+        size, count = sites.get((frame.filename, frame.lineno), (0, 0))
+        sites[(frame.filename, frame.lineno)] = (size + stat.size, count + stat.count)
+
+    return sites
+
+
+def total_size(sites):
+    return sum(size for size, _ in sites.values())
+
+
+def profile_thread(target):
+    """
+    Wrap a thread target for the CPU profile of the run, if one is active.
+    """
+    if _active_profile is None:
+        return target
+    return _active_profile.profile_thread(target)
+
+
+def format_size(size):
+    for unit in ["B", "KiB", "MiB"]:
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
@@ -0,0 +1,227 @@
+import math
+import threading
+import time
+
+from collections import namedtuple
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from .metrics import run_metrics, QUEUE_STAGE
+from ._constants import (
+    RATE_LIMIT_DECREASE,
+    RATE_LIMIT_RECOVERY,
+    RATE_LIMIT_MIN_RATE,
+)
+
+# Requests per second, bucket size and maximum requests in flight (None for
+# no limit) for one host
+HostLimit = namedtuple("HostLimit", ["rate", "burst", "concurrency"])
+
+REMAINING_HEADERS = ["X-RateLimit-Remaining", "RateLimit-Remaining"]
+RESET_HEADERS = ["X-RateLimit-Reset", "RateLimit-Reset"]
+# Reset values above this are Unix timestamps rather than seconds from now
+EPOCH_THRESHOLD = 1e9
+
+
+def parse_rate_limit(value):
+    """
+    Parse a '[HOST=]RATE[:BURST[:CONCURRENCY]]' option into (host, HostLimit).
+    The host is None when the limit applies to every host.
+    """
+    host, _, spec = value.rpartition("=")
+    parts = spec.split(":")
+
+    try:
+        if len(parts) > 3:
+            raise ValueError
+        rate = float(parts[0])
+        burst = int(parts[1]) if len(parts) > 1 and parts[1] else math.ceil(rate)
+        concurrency = int(parts[2]) if len(parts) > 2 and parts[2] else None
+    except ValueError:
+        raise ValueError(
+            f"'{value}' is not of the form [HOST=]RATE[:BURST[:CONCURRENCY]]"
+        )
+
+    if rate <= 0 or burst < 1 or (concurrency is not None and concurrency < 1):
+        raise ValueError(f"'{value}' must use a positive rate, burst and concurrency")
+
+    return host or None, HostLimit(rate, burst, concurrency)
+
+
+def split_rate_limits(rate_limits, workers):
+    """
+    Share per-host limits between worker processes so that together they
+    stay within the configured limits.
+    """
+    return {
+        host: HostLimit(
+            limit.rate / workers,
+            max(1, limit.burst // workers),
+            limit.concurrency and max(1, limit.concurrency // workers),
+        )
+        for host, limit in rate_limits.items()
+    }
+
+
+def _header_number(headers, names):
+    for name in names:
+        try:
+            return float(headers[name])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
+
+
+class TokenBucket:
+    """
+    Token bucket pacing the requests to one host.
+
+    The rate is cut on 429 responses and recovers gradually on success, and
+    is capped by what the rate-limit headers say is left in the current
+    window, so fetches settle at the highest rate the server sustains.
+    `clock` returns the current time in seconds (time.monotonic by default).
+    """
+
+    def __init__(self, limit, clock=time.monotonic):
+        self.clock = clock
+        self.max_rate = limit.rate
+        self.rate = limit.rate
+        # Rate that spreads the rest of the server's window until it resets
+        self.window_rate = None
+        self.burst = limit.burst
+        self.concurrency = limit.concurrency
+        self.tokens = float(limit.burst)
+        self.updated = clock()
+        self.paused_until = 0.0
+        self.in_flight = 0
+        # Bumped on every rate cut; responses to requests sent before the
+        # latest cut were paced at the old rate and must not cut it again
+        self.generation = 0
+        self._condition = threading.Condition()
+
+    def current_rate(self):
+        if self.window_rate is None:
+            return self.rate
+        return min(self.rate, self.window_rate)
+
+    def _refill(self, now):
+        rate = self.current_rate()
+        # The burst shrinks with the rate, so a cut rate cannot burst as before
+        burst = max(1.0, self.burst * rate / self.max_rate)
+        self.tokens = min(burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+
+    def acquire(self):
+        """
+        Wait for a token and a free concurrency slot.
+        Returns (seconds spent waiting, rate generation the request is sent in).
+        """
+        start = self.clock()
+
+        with self._condition:
+            while True:
+                now = self.clock()
+                self._refill(now)
+
+                if now < self.paused_until:
+                    self._wait(self.paused_until - now)
+                elif self.concurrency and self.in_flight >= self.concurrency:
+                    self._wait(None)
+                elif self.tokens < 1:
+                    self._wait((1 - self.tokens) / self.current_rate())
+                else:
+                    self.tokens -= 1
+                    self.in_flight += 1
+                    return self.clock() - start, self.generation
+
+    def _wait(self, timeout):
+        """
+        Wait until the bucket changes or `timeout` seconds pass (None for no
+        limit), with the condition held.
+        """
+        self._condition.wait(timeout)
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def pause(self, seconds):
+        with self._condition:
+            self.paused_until = max(self.paused_until, self.clock() + seconds)
+
+    def observe(self, status_code, headers, retry_after=None, generation=None):
+        """
+        Adapt the rate to a response and its rate-limit headers.
+        """
+        remaining = _header_number(headers, REMAINING_HEADERS)
+        reset = _header_number(headers, RESET_HEADERS)
+
+        if reset is not None and reset > EPOCH_THRESHOLD:
+            reset = reset - time.time()
+
+        with self._condition:
+            self._refill(self.clock())
+
+            if status_code == 429:
+                if generation is None or generation == self.generation:
+                    self.rate = max(
+                        RATE_LIMIT_MIN_RATE, self.rate * RATE_LIMIT_DECREASE
+                    )
+                    self.generation += 1
+                self.tokens = 0.0
+            else:
+                self.rate = min(self.max_rate, self.rate + RATE_LIMIT_RECOVERY)
+
+            if remaining is not None and remaining >= 1 and reset and reset > 0:
+                self.window_rate = max(RATE_LIMIT_MIN_RATE, remaining / reset)
+            else:
+                # An exhausted window pauses the host until it resets instead
+                self.window_rate = None
+
+            self._condition.notify_all()
+
+        if status_code == 429 and retry_after is not None:
+            self.pause(retry_after)
+        elif remaining is not None and remaining < 1 and reset is not None:
+            self.pause(max(0.0, reset))
+
+
+class RateLimiter:
+    """
+    Per-host request scheduler; hosts without a configured limit fall back to
+    the default limit, or are not limited at all.
+    """
+
+    def __init__(self, rate_limits):
+        self.rate_limits = dict(rate_limits)
+        self.buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket_for(self, url):
+        host = urlsplit(url).netloc
+
+        with self._lock:
+            if host not in self.buckets:
+                limit = self.rate_limits.get(host) or self.rate_limits.get(None)
+                self.buckets[host] = TokenBucket(limit) if limit else None
+            return self.buckets[host]
+
+    @contextmanager
+    def slot(self, url):
+        """
+        Hold a request slot for a URL, recording the time spent queueing.
+        Yields the host's TokenBucket and the rate generation of the request,
+        or (None, None) if the host is not limited.
+        """
+        bucket = self.bucket_for(url)
+
+        if bucket is None:
+            yield None, None
+            return
+
+        waited, generation = bucket.acquire()
+        run_metrics.record(QUEUE_STAGE, waited)
+        try:
+            yield bucket, generation
+        finally:
+            bucket.release()
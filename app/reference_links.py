@@ -0,0 +1,98 @@
+import re
+
+from pathlib import Path
+from .fetcher import get_base_url
+from .operation_index import OperationIndex
+from ._constants import VALID_MODES
+
+# `[`/endpoint`](/reference/id)` links, whose text may span lines, and plain
+# `[text](/reference/id)` links within one line
+REFERENCE_LINK_PATTERN = re.compile(
+    r"\[(`[^`]+`)\]\(/reference/([^)]+)\)|\[([^\]\n]+)\]\(/reference/([^)\s]+)\)"
+)
+CODE_LINK_START = "[`"
+
+
+def reference_target(reference):
+    """
+    Get the operationId a reference link points to, without anchor or query.
+    """
+    return re.split(r"[#?]", reference, maxsplit=1)[0]
+
+
+def count_code_links(content):
+    """
+    Count the `[`/endpoint`](/reference/id)` links in content.
+    """
+    return sum(
+        1 for match in REFERENCE_LINK_PATTERN.finditer(content) if match.group(1)
+    )
+
+
+class ReferenceLinkRewriter:
+    """
+    Rewrite relative /reference/ links to full documentation URLs.
+    The link prefix of every mode is computed once, and a single scan of the
+    content produces the variants of several modes together.
+    """
+
+    def __init__(self, modes=None):
+        self.prefixes = {
+            mode: f"](<{get_base_url(mode)}/"
+            for mode in [None, *(modes or VALID_MODES)]
+        }
+
+    def rewrite(self, content, modes=(None,)):
+        """
+        Rewrite the reference links of content for each of the given modes.
+        Returns ({mode: rewritten content}, [link targets in order]).
+        """
+        pieces = []
+        links = []
+        last_end = 0
+
+        for match in REFERENCE_LINK_PATTERN.finditer(content):
+            text = match.group(1) or match.group(3)
+            reference = match.group(2) or match.group(4)
+
+            pieces.append(content[last_end : match.start()])
+            links.append((len(pieces), text, reference))
+            pieces.append(None)
+            last_end = match.end()
+
+        if not links:
+            return {mode: content for mode in modes}, []
+
+        pieces.append(content[last_end:])
+        rewritten = {}
+
+        for mode in modes:
+            prefix = self.prefixes.get(mode) or f"](<{get_base_url(mode)}/"
+            for index, text, reference in links:
+                pieces[index] = f"[{text}{prefix}{reference}>)"
+            rewritten[mode] = "".join(pieces)
+
+        return rewritten, [reference for _, _, reference in links]
+
+
+_known_operation_ids = {}
+
+
+def known_operation_ids(spec_dir):
+    """
+    Get the operationIds of every spec in a directory, i.e. of one API mode.
+    Cached until one of the specs changes.
+    """
+    json_files = sorted(Path(spec_dir).glob("*.json"))
+    signature = tuple(
+        (json_file.name, json_file.stat().st_mtime_ns) for json_file in json_files
+    )
+    cached = _known_operation_ids.get(str(spec_dir))
+
+    if cached is None or cached[0] != signature:
+        operation_ids = set()
+        for json_file in json_files:
+            operation_ids.update(OperationIndex.load(json_file).by_id)
+        cached = _known_operation_ids[str(spec_dir)] = (signature, operation_ids)
+
+    return cached[1]
@@ -0,0 +1,167 @@
+import re
+import orjson
+
+from collections import namedtuple
+from ._constants import HTTP_METHODS
+
+# A JSON string, optionally followed by the colon that makes it an object key,
+# or a bracket. Numbers, literals, commas and whitespace are skipped over.
+TOKEN_PATTERN = re.compile(rb'("[^"\\]*(?:\\.[^"\\]*)*")(\s*:\s*)?|[{}\[\]]')
+# Everything up to the next bracket outside a string, in one match; group 1
+# is set for an opening bracket
+SKIP_PATTERN = re.compile(
+    rb'(?:[^"{}\[\]]++|"[^"\\]*+(?:\\.[^"\\]*+)*+")*+(?:([{\[])|[}\]])'
+)
+
+OPEN_BRACKETS = b"{["
+QUOTE = ord('"')
+
+PATHS_KEY = b'"paths"'
+OPERATION_ID_KEY = b'"operationId"'
+MINT_KEY = b'"x-mint"'
+METHOD_KEYS = {f'"{method}"'.encode() for method in HTTP_METHODS}
+
+OperationSpan = namedtuple(
+    "OperationSpan",
+    [
+        "path",
+        "method",
+        "operation_id",
+        # Offsets of the operationId key and of the end of its value
+        "id_key_start",
+        "id_value_end",
+        # Separator between the operationId key and its value, e.g. b": "
+        "key_separator",
+        "has_mint",
+        # Offsets of the operation object itself
+        "start",
+        "end",
+    ],
+)
+
+
+class SpecScanError(ValueError):
+    """
+    Raised when a buffer does not hold a well-formed JSON object.
+    """
+
+
+def _skip_container(buffer, pos):
+    """
+    Skip to the end of the container whose opening bracket ends at `pos`.
+    """
+    depth = 1
+
+    for match in SKIP_PATTERN.finditer(buffer, pos):
+        if match.lastindex:
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return match.end()
+
+    raise SpecScanError("Unterminated JSON container")
+
+
+def scan_operations(buffer, summary=None):
+    """
+    Yield an OperationSpan for every operation under `paths` in a JSON
+    OpenAPI document, without parsing it into Python objects.
+
+    `buffer` can be bytes or an mmap, so large specs are scanned with flat
+    memory use: everything outside `paths`, and everything nested inside an
+    operation, is skipped bracket by bracket.
+
+    If a `summary` dict is given, its 'has_paths' item tells whether the
+    document has a top-level `paths` object.
+    """
+    if summary is not None:
+        summary["has_paths"] = False
+
+    # Keys of the open containers; the root object has no key
+    keys = []
+    pending_key = None
+    expect_operation_id = False
+    operation = None
+    pos = 0
+
+    while True:
+        match = TOKEN_PATTERN.search(buffer, pos)
+
+        if match is None:
+            break
+
+        pos = match.end()
+        char = buffer[match.start()]
+        depth = len(keys)
+
+        if char == QUOTE:
+            if match.group(2) is not None:
+                pending_key = match.group(1)
+                expect_operation_id = False
+
+                if operation is not None and depth == 4:
+                    if pending_key == OPERATION_ID_KEY:
+                        expect_operation_id = True
+                        operation["id_key_start"] = match.start()
+                        operation["key_separator"] = match.group(2)
+                    elif pending_key == MINT_KEY:
+                        operation["has_mint"] = True
+            elif expect_operation_id:
+                operation["operation_id"] = orjson.loads(match.group(1))
+                operation["id_value_end"] = match.end(1)
+                expect_operation_id = False
+            continue
+
+        expect_operation_id = False
+
+        if depth == 0 and char != ord("{"):
+            raise SpecScanError("OpenAPI document is not a JSON object")
+
+        if char in OPEN_BRACKETS:
+            key = pending_key
+            pending_key = None
+            keys.append(key)
+            depth += 1
+
+            in_paths = depth >= 2 and keys[1] == PATHS_KEY
+
+            if summary is not None and depth == 2 and in_paths:
+                summary["has_paths"] = True
+            is_operation = (
+                in_paths and depth == 4 and char == ord("{") and key in METHOD_KEYS
+            )
+
+            if depth == 1 or (in_paths and depth < 4) or is_operation:
+                if is_operation:
+                    operation = {
+                        "path": orjson.loads(keys[2]),
+                        "method": orjson.loads(key),
+                        "operation_id": None,
+                        "id_key_start": None,
+                        "id_value_end": None,
+                        "key_separator": None,
+                        "has_mint": False,
+                        "start": match.start(),
+                        "end": None,
+                    }
+                continue
+
+            # Nothing below this container can hold an operation
+            pos = _skip_container(buffer, pos)
+            keys.pop()
+            continue
+
+        if not keys:
+            raise SpecScanError("Unbalanced JSON brackets")
+
+        if operation is not None and depth == 4:
+            operation["end"] = pos
+            yield OperationSpan(**operation)
+            operation = None
+
+        keys.pop()
+        if not keys:
+            return
+
+    raise SpecScanError("Unterminated JSON document")
@@ -0,0 +1,244 @@
+import time
+import orjson
+import justsdk
+
+from pathlib import Path
+from .add_mint import splice_mint_fields
+from .convert_md_to_mdx import write_operation_mdx
+from .manifest import hash_bytes
+from .operation_index import OperationIndex
+from ._constants import (
+    DEFAULT_REFERENCE_DIR,
+    DEFAULT_MDX_DIR,
+    VALID_MODES,
+    WATCH_INTERVAL,
+    WATCH_DEBOUNCE,
+)
+
+
+def file_signature(json_file):
+    """
+    Get a cheap signature of a file that changes whenever it is written.
+    """
+    try:
+        stat = json_file.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def fingerprint_operations(operation_index):
+    """
+    Map each operationId to its path, method and a hash of its definition.
+    x-mint is left out, so adding it does not count as a change.
+    """
+    fingerprints = {}
+
+    for ref in operation_index.by_id.values():
+        operation = {k: v for k, v in ref.operation.items() if k != "x-mint"}
+        fingerprints[ref.operation["operationId"]] = (
+            ref.path,
+            ref.method,
+            hash_bytes(orjson.dumps(operation, option=orjson.OPT_SORT_KEYS)),
+        )
+
+    return fingerprints
+
+
+def diff_operations(old, new):
+    """
+    Compare two operation fingerprints.
+    Returns (changed, removed): operationIds that are new or differ, and
+    operationIds that are gone.
+    """
+    changed = [
+        operation_id
+        for operation_id in new
+        if old.get(operation_id) != new[operation_id]
+    ]
+    removed = [operation_id for operation_id in old if operation_id not in new]
+    return changed, removed
+
+
+class SpecWatcher:
+    """
+    Watch the reference specs and regenerate only the MDX of operations that
+    changed, reusing one fetcher (and its connections) for the whole session.
+    """
+
+    def __init__(
+        self,
+        fetcher,
+        reference_dir=None,
+        output_dir=None,
+        modes=None,
+        interval=WATCH_INTERVAL,
+        debounce=WATCH_DEBOUNCE,
+    ):
+        self.fetcher = fetcher
+        self.reference_dir = Path(reference_dir or DEFAULT_REFERENCE_DIR)
+        self.output_dir = Path(output_dir or DEFAULT_MDX_DIR)
+        self.modes = modes or VALID_MODES
+        self.interval = interval
+        self.debounce = debounce
+        self.signatures = {}
+        self.fingerprints = {}
+
+    def spec_files(self):
+        return [
+            json_file
+            for mode in self.modes
+            for json_file in sorted((self.reference_dir / mode).glob("*.json"))
+        ]
+
+    def load_fingerprints(self, json_file):
+        """
+        Parse a spec and fingerprint its operations.
+        Returns (operation_index, fingerprints), or (None, None) if the spec
+        cannot be parsed, e.g. while it is being saved.
+        """
+        try:
+            openapi_data = justsdk.read_file(json_file, use_orjson=True)
+        except (OSError, ValueError) as e:
+            justsdk.print_warning(f"Cannot read '{json_file.name}' yet: {e}")
+            return None, None
+
+        operation_index = OperationIndex(openapi_data)
+        return operation_index, fingerprint_operations(operation_index)
+
+    def start(self):
+        for json_file in self.spec_files():
+            self.signatures[json_file] = file_signature(json_file)
+            _, fingerprints = self.load_fingerprints(json_file)
+            self.fingerprints[json_file] = fingerprints or {}
+
+        justsdk.print_info(
+            f"Watching {len(self.signatures)} spec file(s) under '{self.reference_dir}'..."
+        )
+
+    def changed_files(self):
+        current = {
+            json_file: file_signature(json_file) for json_file in self.spec_files()
+        }
+        # Specs that were deleted since the last poll
+        for json_file in self.signatures:
+            current.setdefault(json_file, None)
+
+        return [
+            json_file
+            for json_file, signature in current.items()
+            if self.signatures.get(json_file) != signature
+        ]
+
+    def wait_until_settled(self, json_files):
+        """
+        Wait until the given files stop changing for the debounce period.
+        """
+        signatures = {json_file: file_signature(json_file) for json_file in json_files}
+
+        while True:
+            time.sleep(self.debounce)
+            latest = {json_file: file_signature(json_file) for json_file in json_files}
+            if latest == signatures:
+                return
+            signatures = latest
+
+    def is_defined_elsewhere(self, operation_id, mode, json_file):
+        return any(
+            operation_id in fingerprints
+            for other_file, fingerprints in self.fingerprints.items()
+            if other_file != json_file and other_file.parent.name == mode
+        )
+
+    def handle_change(self, json_file):
+        """
+        Bring the MDX of one changed spec up to date.
+        Returns the number of MDX files regenerated or removed.
+        """
+        mode = json_file.parent.name
+        mode_output_dir = self.output_dir / mode
+        old_fingerprints = self.fingerprints.get(json_file, {})
+
+        if file_signature(json_file) is None:
+            operation_index, new_fingerprints = None, {}
+        else:
+            operation_index, new_fingerprints = self.load_fingerprints(json_file)
+            if operation_index is None:
+                # Wait for the next write instead of retrying the same content
+                self.signatures[json_file] = file_signature(json_file)
+                return 0
+
+            if any(
+                "x-mint" not in ref.operation for ref in operation_index.by_id.values()
+            ):
+                try:
+                    splice_mint_fields(json_file)
+                except (OSError, ValueError) as e:
+                    # The spec may have been rewritten since it was parsed
+                    justsdk.print_warning(
+                        f"Cannot add x-mint to '{json_file.name}' yet: {e}"
+                    )
+
+        changed, removed = diff_operations(old_fingerprints, new_fingerprints)
+        self.fingerprints[json_file] = new_fingerprints
+        self.signatures[json_file] = file_signature(json_file)
+        mode_output_dir.mkdir(parents=True, exist_ok=True)
+
+        known_ids = set().union(
+            *(
+                fingerprints
+                for other_file, fingerprints in self.fingerprints.items()
+                if other_file.parent.name == mode
+            )
+        )
+
+        for operation_id in changed:
+            md_content = self.fetcher.fetch(operation_id, mode)
+            if md_content is not None:
+                write_operation_mdx(
+                    operation_id,
+                    md_content,
+                    mode_output_dir,
+                    json_file.stem,
+                    mode=mode,
+                    operation_index=operation_index,
+                    known_ids=known_ids,
+                )
+
+        for operation_id in removed:
+            mdx_path = mode_output_dir / f"{operation_id}.mdx"
+            if mdx_path.exists() and not self.is_defined_elsewhere(
+                operation_id, mode, json_file
+            ):
+                mdx_path.unlink()
+                justsdk.print_info(f"Removed '{mdx_path.name}'")
+
+        return len(changed) + len(removed)
+
+    def run(self):
+        """
+        Poll the specs until interrupted.
+        """
+        self.start()
+
+        try:
+            while True:
+                json_files = self.changed_files()
+
+                if not json_files:
+                    time.sleep(self.interval)
+                    continue
+
+                self.wait_until_settled(json_files)
+                start = time.perf_counter()
+                updated = sum(self.handle_change(json_file) for json_file in json_files)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+
+                names = ", ".join(json_file.name for json_file in json_files)
+                justsdk.print_success(
+                    f"Updated {updated} operation(s) from {names} in {elapsed_ms:.0f} ms"
+                )
+        except KeyboardInterrupt:
+            justsdk.print_info("Stopped watching.", newline_before=True)
+
+        return True
@@ -0,0 +1,110 @@
+import random
+
+from app._constants import HTTP_METHODS
+
+CALLOUT_HEADERS = {
+    "notice": "> 🚧 Notice",
+    "tips": "> 👍 Tips",
+    "notes": "> 📘 Notes",
+}
+
+
+def operation_id_for(index, method):
+    return f"resource-{index}-{method}"
+
+
+def build_spec(operation_count, schema_count=None, seed=0):
+    """
+    Build a synthetic OpenAPI spec with `operation_count` operations spread
+    over paths with one or two methods each, plus a components section.
+    """
+    rng = random.Random(seed)
+    schema_count = operation_count if schema_count is None else schema_count
+    paths = {}
+    index = 0
+
+    while index < operation_count:
+        path_item = {}
+        for method in HTTP_METHODS[: rng.choice([1, 2])]:
+            if index >= operation_count:
+                break
+            path_item[method] = {
+                "tags": [f"Tag {index % 12}"],
+                "summary": f"Operation {index}",
+                "description": f"This endpoint allows you to **query resource {index}**",
+                "operationId": operation_id_for(index, method),
+                "parameters": [
+                    {
+                        "name": "id",
+                        "in": "path",
+                        "required": True,
+                        "schema": {"type": "string"},
+                    }
+                ],
+                "responses": {
+                    "200": {
+                        "description": "OK",
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "$ref": f"#/components/schemas/Schema{index % max(schema_count, 1)}"
+                                }
+                            }
+                        },
+                    }
+                },
+            }
+            index += 1
+        paths[f"/resource{index}/{{id}}"] = path_item
+
+    schemas = {
+        f"Schema{i}": {
+            "type": "object",
+            "properties": {
+                f"field_{j}": {"type": "string", "description": f"Field {j} [x]"}
+                for j in range(8)
+            },
+        }
+        for i in range(schema_count)
+    }
+
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Synthetic API", "version": "1.0.0"},
+        "paths": paths,
+        "components": {"schemas": schemas},
+    }
+
+
+def build_callout(kind, bullet_count, rng):
+    lines = [CALLOUT_HEADERS[kind], ">"]
+    for i in range(bullet_count):
+        lines.append(
+            rng.choice(
+                [
+                    f"> * Item {i} refers to [`/coins/list`](/reference/coins-list) endpoint.",
+                    f'> * Item {i} with ‘smart’ “quotes” and `"escaped"` text.',
+                    f">   * Nested item {i}",
+                    "> * Cache / Update Frequency: every 60 seconds.",
+                ]
+            )
+        )
+    return "\n".join(lines)
+
+
+def build_markdown(operation_id, bullet_count=4, seed=0):
+    """
+    Build a ReadMe-style markdown page with Notice, Tips and Notes callouts
+    of `bullet_count` bullets each, followed by an OpenAPI definition block.
+    """
+    rng = random.Random(f"{seed}-{operation_id}")
+    parts = [
+        f"# {operation_id}",
+        "This endpoint allows you to query data.",
+        build_callout("notice", max(1, bullet_count // 4), rng),
+        build_callout("tips", bullet_count, rng),
+        build_callout("notes", bullet_count, rng),
+        "# OpenAPI definition",
+        '```json\n{"openapi": "3.0.0", "info": {"title": "Notes > Tips"}}\n```',
+    ]
+    return "\n\n".join(parts) + "\n"
@@ -0,0 +1,47 @@
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .corpus import build_markdown
+
+
+class MarkdownStubHandler(BaseHTTPRequestHandler):
+    """
+    Serve a synthetic markdown page for any `/<operation_id>.md` request.
+    """
+
+    # Keep connections alive like the real docs host does
+    protocol_version = "HTTP/1.1"
+    bullet_count = 4
+    latency = 0.0
+
+    def do_GET(self):
+        if self.latency:
+            threading.Event().wait(self.latency)
+
+        operation_id = self.path.rsplit("/", 1)[-1].removesuffix(".md")
+        body = build_markdown(operation_id, self.bullet_count).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/markdown; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(bullet_count=4, latency=0.0, handler=MarkdownStubHandler):
+    """
+    Start the markdown stub on a free local port in a background thread.
+    `handler` may be a subclass of MarkdownStubHandler, e.g. one that fails
+    some requests. Returns the server and its base URL.
+    """
+    handler = type(
+        "ConfiguredStubHandler",
+        (handler,),
+        {"bullet_count": bullet_count, "latency": latency},
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
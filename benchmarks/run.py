@@ -0,0 +1,249 @@
+import argparse
+import contextlib
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import orjson
+import justsdk
+
+from pathlib import Path
+from app.add_mint import add_mint_fields
+from app.convert_md_to_mdx import (
+    block_memo,
+    callout_memo,
+    convert_md_to_mdx,
+    extract_operation_ids,
+    find_operation_path_and_method,
+    process_mode_files,
+)
+from app.fetcher import MarkdownFetcher
+from app.operation_index import OperationIndex
+from app._constants import PRO_MODE
+from .corpus import build_markdown, build_spec
+from .http_stub import start_stub_server
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+DEFAULT_OUTPUT = "bench-results.json"
+# Past this many operations, the quadratic per-operation lookups and full
+# runs against the stub take too long to be worth timing
+MAX_LOOKUP_SIZE = 1000
+MAX_PIPELINE_SIZE = 1000
+
+
+@contextlib.contextmanager
+def silenced():
+    """
+    Silence stdout at the file descriptor level, since the justsdk printers
+    hold on to the original sys.stdout.
+    """
+    sys.stdout.flush()
+    saved_fd = os.dup(1)
+    with open(os.devnull, "w") as devnull:
+        os.dup2(devnull.fileno(), 1)
+        try:
+            yield
+        finally:
+            sys.stdout.flush()
+            os.dup2(saved_fd, 1)
+            os.close(saved_fd)
+
+
+def clear_memos():
+    """
+    Empty the converter's memos, so that every timed run converts each
+    callout block again instead of timing memo hits.
+    """
+    callout_memo.clear()
+    block_memo.clear()
+
+
+def measure(func, repeat, setup=None):
+    """
+    Time `func` `repeat` times, calling `setup` before each run untimed.
+    Returns a dict of timing statistics in seconds.
+    """
+    timings = []
+
+    for _ in range(repeat):
+        argument = setup() if setup else None
+        with silenced():
+            start = time.perf_counter()
+            func(argument) if setup else func()
+            timings.append(time.perf_counter() - start)
+
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "max": max(timings),
+        "repeat": repeat,
+    }
+
+
+def bench_spec(size, repeat):
+    spec_bytes = orjson.dumps(build_spec(size))
+    spec = orjson.loads(spec_bytes)
+    operation_ids = extract_operation_ids(spec)
+    results = {}
+
+    def fresh_spec_without_mint():
+        return orjson.loads(spec_bytes)
+
+    results["add_mint_fields"] = measure(
+        add_mint_fields, repeat, fresh_spec_without_mint
+    )
+    results["extract_operation_ids"] = measure(
+        lambda: extract_operation_ids(spec), repeat
+    )
+
+    with tempfile.TemporaryDirectory() as spec_dir:
+        spec_path = Path(spec_dir) / "spec.json"
+        spec_path.write_bytes(spec_bytes)
+
+        results["index_parsed_spec"] = measure(
+            lambda: OperationIndex(justsdk.read_file(spec_path, use_orjson=True)),
+            repeat,
+        )
+        results["index_scanned_spec"] = measure(
+            lambda: OperationIndex.scan(spec_path), repeat
+        )
+
+    if size <= MAX_LOOKUP_SIZE:
+        results["find_operation_path_and_method"] = measure(
+            lambda: [
+                find_operation_path_and_method(spec, operation_id)
+                for operation_id in operation_ids
+            ],
+            repeat,
+        )
+
+    return results
+
+
+def bench_markdown(bullet_counts, repeat, pages=50):
+    results = {}
+
+    for bullet_count in bullet_counts:
+        documents = [build_markdown(f"page-{i}", bullet_count) for i in range(pages)]
+        metadata = {"reference_file": "spec.json", "path": "/x", "method": "get"}
+        results[f"convert_md_to_mdx[bullets={bullet_count}]"] = measure(
+            lambda _: [
+                convert_md_to_mdx(document, metadata, PRO_MODE)
+                for document in documents
+            ],
+            repeat,
+            clear_memos,
+        )
+
+    return results
+
+
+def bench_pipeline(size, repeat, base_url, jobs):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        reference_dir = Path(temp_dir) / "reference"
+        justsdk.write_file(
+            build_spec(size), reference_dir / PRO_MODE / "synthetic.json"
+        )
+        fetcher = MarkdownFetcher(jobs=jobs, base_url=base_url)
+
+        # Every run writes every file to an empty directory, as a first run
+        # would, rather than finding them unchanged from the previous run
+        def fresh_output_dir():
+            clear_memos()
+            return Path(tempfile.mkdtemp(dir=temp_dir))
+
+        try:
+            return measure(
+                lambda output_dir: process_mode_files(
+                    PRO_MODE, reference_dir, output_dir, fetcher
+                ),
+                repeat,
+                fresh_output_dir,
+            )
+        finally:
+            fetcher.close()
+
+
+def create_parser():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the OAS to MDX conversion pipeline",
+        prog="python -m benchmarks.run",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help=f"Operation counts of the synthetic specs (default: {DEFAULT_SIZES})",
+    )
+    parser.add_argument(
+        "--bullets",
+        type=int,
+        nargs="+",
+        default=[2, 8, 32],
+        help="Bullets per callout in the synthetic markdown (default: 2 8 32)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Runs per benchmark (default: 5)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=8,
+        help="Concurrent fetches for the pipeline benchmark (default: 8)",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Simulated per-request latency of the HTTP stub in seconds",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default=DEFAULT_OUTPUT,
+        help=f"JSON file to write results to (default: {DEFAULT_OUTPUT})",
+    )
+    return parser
+
+
+def main():
+    args = create_parser().parse_args()
+    server, base_url = start_stub_server(latency=args.latency)
+    results = {}
+
+    try:
+        for size in args.sizes:
+            justsdk.print_info(f"Benchmarking spec with {size} operations...")
+            for name, timing in bench_spec(size, args.repeat).items():
+                results[f"{name}[ops={size}]"] = timing
+
+            if size <= MAX_PIPELINE_SIZE:
+                results[f"process_mode_files[ops={size}]"] = bench_pipeline(
+                    size, max(1, args.repeat // 2), base_url, args.jobs
+                )
+
+        justsdk.print_info("Benchmarking markdown conversion...")
+        results.update(bench_markdown(args.bullets, args.repeat))
+    finally:
+        server.shutdown()
+
+    for name, timing in results.items():
+        print(f"  {name:<55} median {timing['median'] * 1000:10.2f} ms")
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "jobs": args.jobs,
+        "latency": args.latency,
+        "results": results,
+    }
+    justsdk.write_file(report, Path(args.output), atomic=True)
+    justsdk.print_success(f"Wrote benchmark results to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
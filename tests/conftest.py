@@ -0,0 +1,32 @@
+import pytest
+
+from benchmarks.http_stub import start_stub_server
+from app.metrics import run_metrics
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    run_metrics.reset()
+    yield
+    run_metrics.reset()
+
+
+@pytest.fixture
+def stub_server():
+    """
+    Start local markdown stubs (see benchmarks.http_stub) for a test.
+    Returns a function taking start_stub_server()'s arguments and returning
+    the stub's base URL; every stub is shut down after the test.
+    """
+    servers = []
+
+    def start(**kwargs):
+        server, base_url = start_stub_server(**kwargs)
+        servers.append(server)
+        return base_url
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
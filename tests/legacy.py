@@ -0,0 +1,191 @@
+# The converter as it was before callouts were scanned in one pass and links
+# rewritten per block, kept verbatim as the reference for differential tests
+import re
+
+from app._constants import (
+    COINGECKO_DOCS_BASE_URL,
+    COINGECKO_DEMO_DOCS_BASE_URL,
+    DEMO_MODE,
+)
+
+
+def extract_tips_and_notes(content):
+    """
+    Extract Tips, Notes, and Notice sections from markdown content.
+    """
+    patterns = [
+        # Capture Notice section
+        ("notice", r"(>\s*🚧.*?(?:Notice|Warning).*?)(?=\n\n>\s*[👍📘]|\n\n[^>]|\Z)"),
+        # Capture Tips section
+        ("tips", r"(>\s*👍.*?Tips.*?)(?=\n\n>\s*[📘🚧]|\n\n[^>]|\Z)"),
+        # Capture Notes section
+        ("notes", r"(>\s*📘.*?Notes.*?)(?=\n\n>\s*[👍🚧]|\n\n[^>]|\Z)"),
+    ]
+
+    # Dictionary to store matches by type
+    matches_by_type = {"notice": [], "tips": [], "notes": []}
+
+    for section_type, pattern in patterns:
+        matches = re.findall(pattern, content, flags=re.MULTILINE | re.DOTALL)
+        if matches:
+            matches_by_type[section_type].extend(matches)
+
+    # Combine matches in the desired order: Notice, Tips, Notes
+    all_matches = []
+    for section_type in ["notice", "tips", "notes"]:
+        all_matches.extend(matches_by_type[section_type])
+
+    if not all_matches:
+        return ""
+
+    unique_matches = []
+    for match in all_matches:
+        if match not in unique_matches:
+            unique_matches.append(match)
+
+    return "\n\n".join(unique_matches)
+
+
+def convert_blockquote_to_component(content):
+    """
+    Convert blockquote-style Tips, Notes, and Notice to Mintlify MDX components.
+    """
+
+    def process_blockquote_match(match):
+        """Process a single blockquote match and convert it to MDX component."""
+        full_match = match.group(0)
+
+        # Check the content for section type
+        if "👍" in full_match or "Tips" in full_match:
+            component_type = "Tip"
+            title = "Tips"
+        elif "📘" in full_match or "Notes" in full_match:
+            component_type = "Note"
+            title = "Note"
+        elif "🚧" in full_match or "Notice" in full_match or "Warning" in full_match:
+            component_type = "Warning"
+            title = "Notice"
+        else:
+            component_type = "Note"
+            title = "Note"
+
+        # Process the entire content, removing blockquote markers
+        lines = full_match.split("\n")
+        cleaned_lines = []
+
+        # Skip the header line (first line with emoji and title)
+        content_started = False
+
+        for line in lines:
+            # Remove leading > and minimal whitespace
+            cleaned_line = re.sub(r"^>\s?", "", line)
+
+            if not content_started:
+                if (
+                    cleaned_line.strip() == ""
+                    or "👍" in cleaned_line
+                    and "Tips" in cleaned_line
+                    or "📘" in cleaned_line
+                    and "Notes" in cleaned_line
+                    or "🚧" in cleaned_line
+                    and ("Notice" in cleaned_line or "Warning" in cleaned_line)
+                ):
+                    continue
+                content_started = True
+
+            # Convert * to - for consistency, preserving indentation
+            cleaned_line = re.sub(r"^(\s*)\*\s+", r"\1- ", cleaned_line)
+
+            cleaned_line = cleaned_line.replace("‘", "'")
+            cleaned_line = cleaned_line.replace("’", "'")
+            cleaned_line = cleaned_line.replace("“", '"')
+            cleaned_line = cleaned_line.replace("”", '"')
+
+            # Remove extra escaping from quotes in URLs/text
+            cleaned_line = cleaned_line.replace('`"', '"').replace('"`', '"')
+
+            cleaned_lines.append(cleaned_line)
+
+        component_content = "\n".join(cleaned_lines).strip()
+
+        # Indent the content by 2 spaces for proper MDX formatting
+        indented_lines = []
+        for line in component_content.split("\n"):
+            if line.strip():  # Only indent non-empty lines
+                indented_lines.append("  " + line)
+            else:
+                indented_lines.append(line)
+        indented_content = "\n".join(indented_lines)
+
+        mdx_component = f"<{component_type}>\n  ### {title}\n\n{indented_content}\n</{component_type}>"
+
+        return mdx_component
+
+    # Process patterns in the desired order: Notice, Tips, Notes
+    patterns = [
+        r"(>\s*🚧.*?(?:Notice|Warning).*?)(?=\n\n>\s*[👍📘]|\n\n[^>]|\Z)",
+        r"(>\s*👍.*?Tips.*?)(?=\n\n>\s*[📘🚧]|\n\n[^>]|\Z)",
+        r"(>\s*📘.*?Notes.*?)(?=\n\n>\s*[👍🚧]|\n\n[^>]|\Z)",
+    ]
+
+    converted_content = content
+
+    for pattern in patterns:
+        converted_content = re.sub(
+            pattern,
+            process_blockquote_match,
+            converted_content,
+            flags=re.MULTILINE | re.DOTALL,
+        )
+
+    return converted_content
+
+
+def convert_reference_links(content, mode=None):
+    """
+    Convert relative reference links to full CoinGecko documentation URLs.
+    Uses different base URLs for demo and pro modes.
+    """
+    pattern = r"\[`([^`]+)`\]\(/reference/([^)]+)\)"
+
+    def replace_link(match):
+        endpoint = match.group(1)
+        reference_id = match.group(2)
+
+        if mode == DEMO_MODE:
+            base_url = COINGECKO_DEMO_DOCS_BASE_URL
+        else:
+            base_url = COINGECKO_DOCS_BASE_URL
+
+        return f"[`{endpoint}`](<{base_url}/{reference_id}>)"
+
+    converted_content = re.sub(pattern, replace_link, content)
+
+    return converted_content
+
+
+def convert_md_to_mdx(content, openapi_metadata=None, mode=None):
+    """
+    Convert markdown content to MDX format with optional OpenAPI frontmatter.
+    """
+    extracted_content = extract_tips_and_notes(content)
+
+    if not extracted_content:
+        return ""
+
+    converted_content = convert_blockquote_to_component(extracted_content)
+    converted_content = convert_reference_links(converted_content, mode)
+
+    if openapi_metadata and all(
+        key in openapi_metadata for key in ["reference_file", "path", "method"]
+    ):
+        reference_file = openapi_metadata["reference_file"]
+        path = openapi_metadata["path"]
+        method = openapi_metadata["method"]
+
+        frontmatter = (
+            f"---\nopenapi: api-reference/{reference_file} {method} {path}\n---\n\n"
+        )
+        converted_content = frontmatter + converted_content
+
+    return converted_content
@@ -0,0 +1,94 @@
+import orjson
+import justsdk
+import pytest
+
+from pathlib import Path
+from benchmarks.corpus import build_spec
+from app.add_mint import add_mint_fields, splice_mint_fields
+from app._constants import DEFAULT_REFERENCE_DIR, HTTP_METHODS
+
+REFERENCE_SPECS = sorted(Path(DEFAULT_REFERENCE_DIR).glob("*/*.json"))
+
+
+def strip_mint_fields(openapi_data, keep_every=0):
+    """
+    Remove x-mint from the operations of a spec, keeping it on every
+    `keep_every`-th operation when given.
+    """
+    operations = [
+        operation
+        for path_item in openapi_data["paths"].values()
+        for method, operation in path_item.items()
+        if method in HTTP_METHODS
+    ]
+    for index, operation in enumerate(operations):
+        if not keep_every or index % keep_every:
+            operation.pop("x-mint", None)
+    return openapi_data
+
+
+def add_mint_by_parsing(json_file, indent=True):
+    """
+    Add x-mint the way add-mint did before splicing: parse, add, dump.
+    """
+    openapi_data = add_mint_fields(justsdk.read_file(json_file, use_orjson=True))
+    option = orjson.OPT_INDENT_2 if indent else 0
+    return orjson.dumps(openapi_data, option=option)
+
+
+def assert_splice_matches_parsing(openapi_data, json_file, indent=True):
+    json_file.write_bytes(
+        orjson.dumps(openapi_data, option=orjson.OPT_INDENT_2 if indent else 0)
+    )
+    expected = add_mint_by_parsing(json_file, indent)
+
+    splice_mint_fields(json_file)
+
+    assert json_file.read_bytes() == expected
+
+
+@pytest.mark.parametrize(
+    "spec_file",
+    REFERENCE_SPECS,
+    ids=[f"{f.parent.name}/{f.name}" for f in REFERENCE_SPECS],
+)
+@pytest.mark.parametrize("keep_every", [0, 3])
+def test_splice_matches_parse_and_dump_on_reference_specs(
+    spec_file, keep_every, tmp_path, capsys
+):
+    openapi_data = strip_mint_fields(
+        justsdk.read_file(spec_file, use_orjson=True), keep_every
+    )
+
+    assert_splice_matches_parsing(openapi_data, tmp_path / spec_file.name)
+
+
+@pytest.mark.parametrize("indent", [True, False], ids=["indented", "compact"])
+def test_splice_matches_parse_and_dump_on_synthetic_specs(indent, tmp_path, capsys):
+    openapi_data = build_spec(200)
+    # An operation without operationId is reported and left alone by both
+    next(iter(openapi_data["paths"].values()))["get"].pop("operationId")
+    strip_mint_fields(openapi_data)
+
+    assert_splice_matches_parsing(openapi_data, tmp_path / "spec.json", indent)
+
+
+def test_splice_reports_the_same_operations(tmp_path, capsys):
+    json_file = tmp_path / "spec.json"
+    justsdk.write_file(build_spec(20), json_file)
+
+    add_mint_by_parsing(json_file)
+    parsed_report = capsys.readouterr().out
+    splice_mint_fields(json_file)
+
+    assert capsys.readouterr().out == parsed_report
+
+
+def test_splice_leaves_complete_specs_untouched(tmp_path, capsys):
+    json_file = tmp_path / "spec.json"
+    justsdk.write_file(build_spec(20), json_file)
+    splice_mint_fields(json_file)
+    spliced = json_file.stat().st_mtime_ns, json_file.read_bytes()
+
+    assert splice_mint_fields(json_file) == []
+    assert (json_file.stat().st_mtime_ns, json_file.read_bytes()) == spliced
@@ -0,0 +1,162 @@
+import random
+import re
+import pytest
+
+from pathlib import Path
+from app.callouts import convert_callouts
+from app.convert_md_to_mdx import convert_md_to_mdx
+from app.fetcher import get_base_url
+from app._constants import DEFAULT_MDX_DIR, DEMO_MODE, PRO_MODE
+from . import legacy
+
+MDX_FILES = sorted(Path(DEFAULT_MDX_DIR).glob("*/*.mdx"))
+MODES = [None, DEMO_MODE, PRO_MODE]
+
+COMPONENT_HEADERS = {
+    "Warning": "🚧 Notice",
+    "Tip": "👍 Tips",
+    "Note": "📘 Notes",
+}
+FRONTMATTER_PATTERN = re.compile(
+    r"---\nopenapi: api-reference/(\S+) (\S+) (\S+)\n---\n\n", re.DOTALL
+)
+COMPONENT_PATTERN = re.compile(
+    r"<(Warning|Tip|Note)>\n  ### [^\n]*\n\n(.*?)\n</\1>", re.DOTALL
+)
+
+
+def mdx_to_markdown(mdx_content, mode):
+    """
+    Rebuild a ReadMe-style markdown page that converts to the given MDX: each
+    component becomes a blockquote callout, and documentation links become
+    relative reference links again.
+    """
+    base_url = get_base_url(mode)
+    callouts = []
+
+    for component_type, body in COMPONENT_PATTERN.findall(mdx_content):
+        lines = [f"> {COMPONENT_HEADERS[component_type]}", ">"]
+        for line in body.split("\n"):
+            line = line.removeprefix("  ")
+            lines.append(f"> {line}" if line else ">")
+        callouts.append("\n".join(lines))
+
+    markdown = "\n\n".join(callouts)
+    markdown = re.sub(
+        rf"\(<{re.escape(base_url)}/([^>]+)>\)", r"(/reference/\1)", markdown
+    )
+    return (
+        "# Endpoint\n\nThis endpoint allows you to query data.\n\n"
+        f"{markdown}\n\n# OpenAPI definition\n\n```json\n{{}}\n```\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "mdx_file", MDX_FILES, ids=[f"{f.parent.name}/{f.name}" for f in MDX_FILES]
+)
+def test_mdx_corpus_converts_as_with_the_legacy_converter(mdx_file):
+    mode = mdx_file.parent.name
+    expected = mdx_file.read_text(encoding="utf-8")
+    markdown = mdx_to_markdown(expected, mode)
+
+    frontmatter = FRONTMATTER_PATTERN.match(expected)
+    openapi_metadata = None
+    if frontmatter:
+        reference_file, method, path = frontmatter.groups()
+        openapi_metadata = {
+            "reference_file": reference_file,
+            "path": path,
+            "method": method,
+        }
+
+    assert convert_callouts(markdown) == legacy.convert_blockquote_to_component(
+        legacy.extract_tips_and_notes(markdown)
+    )
+    # The legacy converter left plain [text](/reference/id) links relative, so
+    # only the callouts are compared with it and the full page with the corpus
+    assert convert_md_to_mdx(markdown, openapi_metadata, mode) == expected
+
+
+def random_line(rng):
+    return rng.choice(
+        [
+            "* Item with [`/coins/list`](/reference/coins-list) endpoint.",
+            "- Dash item",
+            "  * Nested item",
+            "    *   Deeply nested item",
+            "*not a bullet*",
+            'Plain text with ‘smart’ “quotes” and `"escaped"` text.',
+            "Two links: [`/a`](/reference/a-b) and [`/c`](/reference/c-d?x=1)",
+            "A link split [`/coins/{id}",
+            "`](/reference/coins-id) over two lines",
+            "Mentions Tips, Notes, Notice and Warning in passing",
+            "Emoji in text 👍 📘 🚧",
+            "",
+        ]
+    )
+
+
+def random_callout(rng):
+    emoji, title = rng.choice(
+        [
+            ("🚧", "Notice"),
+            ("🚧", "Warning"),
+            ("👍", "Tips"),
+            ("📘", "Notes"),
+            ("📘", "Tips"),
+            ("👍", "Notes"),
+            ("🚧", "Tips"),
+        ]
+    )
+    lines = [
+        f">{rng.choice([' ', '  ', ''])}{emoji} {title}{rng.choice(['', ' ', ':'])}"
+    ]
+    lines.append(rng.choice([">", "> ", ">  "]))
+    for _ in range(rng.randint(0, 5)):
+        line = random_line(rng)
+        lines.append(f"> {line}" if line else ">")
+    return "\n".join(lines)
+
+
+def random_markdown(rng):
+    parts = []
+    for _ in range(rng.randint(0, 7)):
+        parts.append(
+            rng.choice(
+                [
+                    random_callout,
+                    random_callout,
+                    random_callout,
+                    lambda rng: "# Heading",
+                    lambda rng: random_line(rng) or "Paragraph",
+                    lambda rng: "> A plain quote\n> over two lines",
+                    lambda rng: "```\n> 👍 Tips\n> * In a code block\n```",
+                ]
+            )(rng)
+        )
+    separator = rng.choice(["\n\n", "\n\n", "\n", "\n\n\n"])
+    return separator.join(parts) + rng.choice(["", "\n", "\n\n"])
+
+
+# Only code links are generated, which both converters rewrite alike
+@pytest.mark.parametrize("seed", range(40))
+def test_fuzzed_markdown_converts_as_with_the_legacy_converter(seed):
+    rng = random.Random(seed)
+
+    for _ in range(25):
+        markdown = random_markdown(rng)
+
+        assert convert_callouts(markdown) == legacy.convert_blockquote_to_component(
+            legacy.extract_tips_and_notes(markdown)
+        ), markdown
+        for mode in MODES:
+            assert convert_md_to_mdx(markdown, None, mode) == legacy.convert_md_to_mdx(
+                markdown, None, mode
+            ), markdown
+
+
+def test_callout_helpers_are_importable_from_the_converter():
+    from app import callouts, convert_md_to_mdx
+
+    assert convert_md_to_mdx.convert_callouts is callouts.convert_callouts
+    assert convert_md_to_mdx.extract_tips_and_notes is callouts.extract_tips_and_notes
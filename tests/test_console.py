@@ -0,0 +1,56 @@
+import sys
+import threading
+import time
+import justsdk
+
+from app import console
+
+THREADS = 8
+LINES = 20
+
+
+def print_from_threads(print_func):
+    barrier = threading.Barrier(THREADS)
+
+    def run(thread_index):
+        barrier.wait()
+        for line_index in range(LINES):
+            print_func(f"thread {thread_index} line {line_index}")
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def expected_lines(prefix=""):
+    return sorted(
+        f"{prefix}thread {thread_index} line {line_index}"
+        for thread_index in range(THREADS)
+        for line_index in range(LINES)
+    )
+
+
+def test_lines_written_in_parts_are_printed_whole(capsys):
+    def print_in_two_writes(message):
+        # Like justsdk, which writes the newline separately
+        sys.stdout.write(message)
+        time.sleep(0.0001)
+        sys.stdout.write("\n")
+
+    print_from_threads(console._locked(print_in_two_writes))
+
+    assert sorted(capsys.readouterr().out.splitlines()) == expected_lines()
+
+
+def test_console_prints_like_justsdk(capfd):
+    print_from_threads(console.print_info)
+    console_lines = capfd.readouterr().out.splitlines()
+
+    justsdk.print_info("thread 0 line 0")
+    prefix = capfd.readouterr().out.splitlines()[0].removesuffix("thread 0 line 0")
+
+    assert sorted(console_lines) == expected_lines(prefix)
+    assert console.print_info.__name__ == justsdk.print_info.__name__
+    assert console.print_info.__doc__ == justsdk.print_info.__doc__
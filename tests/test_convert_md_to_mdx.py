@@ -0,0 +1,87 @@
+import justsdk
+import pytest
+
+from benchmarks.corpus import build_markdown
+from app.convert_md_to_mdx import process_file, process_operation_id
+from app.fetcher import create_fetcher
+from app.markdown_bundle import BundleFetcher
+
+
+class BrokenPageFetcher(BundleFetcher):
+    """
+    Fail with an unexpected error for operations whose name starts with
+    'broken'.
+    """
+
+    def _fetch(self, operation_id, mode=None):
+        if operation_id.startswith("broken"):
+            raise RuntimeError("corrupt page")
+        return super()._fetch(operation_id, mode)
+
+
+@pytest.fixture
+def pages_dir(tmp_path):
+    pages_dir = tmp_path / "pages"
+    pages_dir.mkdir()
+    for operation_id in ["first", "second", "broken"]:
+        (pages_dir / f"{operation_id}.md").write_text(build_markdown(operation_id))
+    return pages_dir
+
+
+def write_spec(json_file, operation_ids):
+    justsdk.write_file(
+        {
+            "paths": {
+                f"/{operation_id}": {"get": {"operationId": operation_id}}
+                for operation_id in operation_ids
+            }
+        },
+        json_file,
+    )
+
+
+def test_unexpected_fetch_error_fails_only_its_operation(pages_dir, tmp_path):
+    output_dir = tmp_path / "mdx"
+    output_dir.mkdir()
+
+    with BrokenPageFetcher(pages_dir) as fetcher:
+        assert process_operation_id("broken", output_dir, fetcher=fetcher) is False
+        assert process_operation_id("first", output_dir, fetcher=fetcher) is True
+
+    assert [path.name for path in output_dir.iterdir()] == ["first.mdx"]
+
+
+def test_unwritable_output_fails_the_operation(pages_dir, tmp_path):
+    output_dir = tmp_path / "not-a-directory"
+    output_dir.write_text("")
+
+    with BundleFetcher(pages_dir) as fetcher:
+        assert process_operation_id("first", output_dir, fetcher=fetcher) is False
+
+
+def test_pipeline_keeps_going_past_a_failed_operation(pages_dir, tmp_path):
+    json_file = tmp_path / "specs" / "spec.json"
+    write_spec(json_file, ["first", "broken", "second"])
+    output_dir = tmp_path / "mdx"
+
+    with BrokenPageFetcher(pages_dir) as fetcher:
+        assert process_file(json_file, output_dir, fetcher=fetcher) is False
+
+    assert sorted(path.name for path in output_dir.glob("*.mdx")) == [
+        "first.mdx",
+        "second.mdx",
+    ]
+
+
+def test_page_that_cannot_be_cached_is_still_converted(stub_server, tmp_path):
+    base_url = stub_server()
+    cache_dir = tmp_path / "cache"
+    # The cache cannot create its directories under a file
+    cache_dir.write_text("")
+    output_dir = tmp_path / "mdx"
+    output_dir.mkdir()
+
+    with create_fetcher(jobs=1, cache_dir=cache_dir, base_url=base_url) as fetcher:
+        assert process_operation_id("first", output_dir, fetcher=fetcher) is True
+
+    assert (output_dir / "first.mdx").exists()
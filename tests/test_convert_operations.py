@@ -0,0 +1,106 @@
+import justsdk
+
+from benchmarks.corpus import build_markdown
+from app import convert_operations
+from app.convert_md_to_mdx import process_file
+from app.markdown_bundle import BundleFetcher
+from app.operation_index import OperationIndex
+from app._constants import PRO_MODE
+
+OPERATIONS = {
+    "coins-list": ("/coins/list", "get"),
+    "coins-id": ("/coins/{id}", "get"),
+    "nft-post": ("/nfts", "post"),
+    "plain": ("/plain", "get"),
+}
+PLAIN_PAGE = "# Plain\n\nNothing to convert here.\n"
+
+
+def make_spec():
+    paths = {}
+    for operation_id, (path, method) in OPERATIONS.items():
+        paths.setdefault(path, {})[method] = {"operationId": operation_id}
+    return {"openapi": "3.0.0", "paths": paths}
+
+
+def make_sources():
+    sources = {
+        operation_id: build_markdown(operation_id)
+        for operation_id in OPERATIONS
+        if operation_id != "plain"
+    }
+    sources["plain"] = PLAIN_PAGE
+    return sources
+
+
+def test_in_memory_conversion_matches_process_file(tmp_path):
+    sources = make_sources()
+    json_file = tmp_path / "coingecko-pro.json"
+    justsdk.write_file(make_spec(), json_file)
+
+    pages_dir = tmp_path / "pages"
+    pages_dir.mkdir()
+    for operation_id, md_content in sources.items():
+        (pages_dir / f"{operation_id}.md").write_text(md_content, encoding="utf-8")
+
+    with BundleFetcher(pages_dir) as fetcher:
+        assert process_file(json_file, tmp_path / "mdx", PRO_MODE, fetcher)
+
+    converted = {
+        operation_id: mdx
+        for operation_id, mdx, _ in convert_operations(
+            make_spec(), sources, PRO_MODE, json_file.name
+        )
+    }
+    written = {
+        path.stem: path.read_text(encoding="utf-8")
+        for path in (tmp_path / "mdx").glob("*.mdx")
+    }
+
+    # Pages with nothing to convert are yielded empty and not written
+    assert converted.pop("plain") == ""
+    assert converted == written
+
+
+def test_metadata_and_unknown_links():
+    results = list(
+        convert_operations(
+            OperationIndex(make_spec()),
+            [("coins-id", build_markdown("coins-id")), ("extra", PLAIN_PAGE)],
+            PRO_MODE,
+            known_ids={"coins-id"},
+        )
+    )
+
+    (operation_id, mdx, metadata), extra = results
+    assert operation_id == "coins-id"
+    assert not mdx.startswith("---")
+    assert metadata["path"] == "/coins/{id}"
+    assert metadata["method"] == "get"
+    assert metadata["mode"] == PRO_MODE
+    assert metadata["links"] == ["coins-list"]
+    assert metadata["unknown_links"] == ["coins-list"]
+    assert extra[0] == "extra"
+    assert extra[2]["path"] is None and extra[2]["method"] is None
+
+    _, _, metadata = next(
+        convert_operations(
+            make_spec(),
+            [("coins-id", build_markdown("coins-id"))],
+            known_ids={"coins-id", "coins-list"},
+        )
+    )
+    assert metadata["unknown_links"] == []
+
+
+def test_conversion_is_lazy(tmp_path):
+    def sources():
+        yield "coins-list", build_markdown("coins-list")
+        raise AssertionError("read past the first page")
+
+    results = convert_operations(make_spec(), sources())
+    operation_id, mdx, _ = next(results)
+
+    assert operation_id == "coins-list"
+    assert mdx == next(convert_operations(make_spec(), make_sources()))[1]
+    assert list(tmp_path.iterdir()) == []
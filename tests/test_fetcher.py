@@ -0,0 +1,147 @@
+import socket
+import threading
+import time
+
+from benchmarks.corpus import build_markdown
+from benchmarks.http_stub import MarkdownStubHandler
+from app.fetcher import MarkdownFetcher, get_base_url
+from app.http_client import ReadMeClient
+from app.metrics import run_metrics
+from app.pipeline import run_pipeline
+from app._constants import COINGECKO_DEMO_DOCS_BASE_URL, DEMO_MODE, PRO_MODE
+
+
+class SlowFirstHandler(MarkdownStubHandler):
+    """
+    Answer earlier operations later, so responses complete out of order.
+    """
+
+    def do_GET(self):
+        index = int(self.path.rsplit("-", 1)[-1].removesuffix(".md"))
+        time.sleep(0.01 * (10 - index))
+        super().do_GET()
+
+
+class ConcurrencyTrackingHandler(MarkdownStubHandler):
+    """
+    Record the largest number of requests handled at the same time.
+    """
+
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def do_GET(self):
+        cls = ConcurrencyTrackingHandler
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            time.sleep(0.05)
+            super().do_GET()
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+
+class MissingPageHandler(MarkdownStubHandler):
+    """
+    Serve 404 for operations whose name starts with 'missing'.
+    """
+
+    def do_GET(self):
+        if self.path.rsplit("/", 1)[-1].startswith("missing"):
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        super().do_GET()
+
+
+def fetch_all(fetcher, operation_ids, mode=None):
+    """
+    Fetch pages through the fetch stage of the pipeline, as convert-mdx does.
+    Returns the success flags and the fetched pages in item order.
+    """
+    pages = {}
+
+    def write(jobs):
+        for operation_id, page in jobs:
+            pages[operation_id] = page
+        return [True] * len(jobs)
+
+    results = run_pipeline(
+        operation_ids,
+        lambda operation_id: fetcher.fetch(operation_id, mode),
+        lambda operation_id, page: (True, page),
+        write,
+        fetcher.jobs,
+    )
+    return results, [pages.get(operation_id) for operation_id in operation_ids]
+
+
+def test_fetch_returns_the_page_of_the_operation(stub_server):
+    fetcher = MarkdownFetcher(jobs=1, base_url=stub_server())
+
+    with fetcher:
+        assert fetcher.fetch("coins-list", PRO_MODE) == build_markdown("coins-list")
+
+
+def test_base_url_depends_on_the_mode():
+    assert get_base_url(DEMO_MODE) == COINGECKO_DEMO_DOCS_BASE_URL
+    assert get_base_url(PRO_MODE) != COINGECKO_DEMO_DOCS_BASE_URL
+
+
+def test_pages_keep_their_operation_when_responses_complete_out_of_order(
+    stub_server,
+):
+    base_url = stub_server(handler=SlowFirstHandler)
+    operation_ids = [f"operation-{index}" for index in range(10)]
+
+    with MarkdownFetcher(jobs=5, base_url=base_url) as fetcher:
+        results, pages = fetch_all(fetcher, operation_ids)
+
+    assert results == [True] * len(operation_ids)
+    assert pages == [build_markdown(operation_id) for operation_id in operation_ids]
+
+
+def test_jobs_bound_the_requests_in_flight(stub_server):
+    ConcurrencyTrackingHandler.max_in_flight = 0
+    base_url = stub_server(handler=ConcurrencyTrackingHandler)
+    operation_ids = [f"operation-{index}" for index in range(12)]
+
+    with MarkdownFetcher(jobs=3, base_url=base_url) as fetcher:
+        results, _ = fetch_all(fetcher, operation_ids)
+
+    assert all(results)
+    assert 1 < ConcurrencyTrackingHandler.max_in_flight <= 3
+
+
+def test_http_errors_fail_only_their_operation(stub_server):
+    base_url = stub_server(handler=MissingPageHandler)
+    operation_ids = ["coins-list", "missing-page", "ping-server"]
+    client = ReadMeClient(pool_size=2, max_retries=0)
+
+    with MarkdownFetcher(jobs=2, base_url=base_url, client=client) as fetcher:
+        results, pages = fetch_all(fetcher, operation_ids)
+
+    assert results == [True, False, True]
+    assert pages[1] is None
+    assert run_metrics.counters["fetch_failures"] == 1
+
+
+def test_connection_errors_return_none():
+    # Nothing listens on a port that was just released
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    client = ReadMeClient(pool_size=1, max_retries=0)
+    fetcher = MarkdownFetcher(
+        jobs=1, base_url=f"http://127.0.0.1:{port}", client=client
+    )
+
+    with fetcher:
+        assert fetcher.fetch("coins-list") is None
+
+    assert run_metrics.counters["fetch_failures"] == 1
@@ -0,0 +1,99 @@
+import justsdk
+
+from app.frontmatter import refresh_frontmatter, render_frontmatter
+from app._constants import DEMO_MODE, PRO_MODE
+
+BODY = "# Title\n\n<Note>\nKeep --- this body\n</Note>\n\nText.\n"
+
+
+def write_spec(json_file, operations):
+    """
+    Write a spec from (operationId, method, path) triples.
+    """
+    paths = {}
+    for operation_id, method, path in operations:
+        paths.setdefault(path, {})[method] = {"operationId": operation_id}
+    justsdk.write_file({"openapi": "3.0.0", "paths": paths}, json_file)
+
+
+def write_mdx(mdx_file, openapi_line=None, body=BODY):
+    mdx_file.parent.mkdir(parents=True, exist_ok=True)
+    frontmatter = render_frontmatter(openapi_line) if openapi_line else ""
+    mdx_file.write_text(frontmatter + body, encoding="utf-8")
+
+
+def read_mdx(mdx_file):
+    return mdx_file.read_text(encoding="utf-8")
+
+
+def test_frontmatter_follows_the_specs_and_bodies_are_untouched(tmp_path):
+    reference_dir = tmp_path / "reference"
+    output_dir = tmp_path / "mdx"
+    write_spec(
+        reference_dir / PRO_MODE / "a.json",
+        [("moved", "post", "/moved/new"), ("current", "get", "/current")],
+    )
+    write_spec(reference_dir / PRO_MODE / "b.json", [("shared", "get", "/shared")])
+
+    mode_output_dir = output_dir / PRO_MODE
+    write_mdx(mode_output_dir / "moved.mdx", "api-reference/a.json get /moved/old")
+    write_mdx(mode_output_dir / "current.mdx", "api-reference/a.json get /current")
+    write_mdx(mode_output_dir / "shared.mdx", "api-reference/a.json get /shared")
+    write_mdx(mode_output_dir / "bare.mdx", body="# No frontmatter\n")
+    write_mdx(mode_output_dir / "unknown.mdx", "api-reference/a.json get /gone")
+    current_mtime = (mode_output_dir / "current.mdx").stat().st_mtime_ns
+
+    assert refresh_frontmatter(reference_dir, output_dir, [PRO_MODE])
+
+    assert read_mdx(mode_output_dir / "moved.mdx") == (
+        render_frontmatter("api-reference/a.json post /moved/new") + BODY
+    )
+    assert read_mdx(mode_output_dir / "shared.mdx") == (
+        render_frontmatter("api-reference/b.json get /shared") + BODY
+    )
+    # Files that are already right, or unknown to the specs, are not rewritten
+    assert (mode_output_dir / "current.mdx").stat().st_mtime_ns == current_mtime
+    assert read_mdx(mode_output_dir / "unknown.mdx") == (
+        render_frontmatter("api-reference/a.json get /gone") + BODY
+    )
+    assert read_mdx(mode_output_dir / "bare.mdx") == "# No frontmatter\n"
+
+
+def test_missing_frontmatter_is_added(tmp_path):
+    reference_dir = tmp_path / "reference"
+    output_dir = tmp_path / "mdx"
+    write_spec(reference_dir / PRO_MODE / "a.json", [("bare", "get", "/bare")])
+    write_mdx(output_dir / PRO_MODE / "bare.mdx", body=BODY)
+
+    assert refresh_frontmatter(reference_dir, output_dir, [PRO_MODE])
+    assert read_mdx(output_dir / PRO_MODE / "bare.mdx") == (
+        render_frontmatter("api-reference/a.json get /bare") + BODY
+    )
+
+
+def test_the_spec_already_referenced_is_preferred(tmp_path):
+    reference_dir = tmp_path / "reference"
+    output_dir = tmp_path / "mdx"
+    write_spec(reference_dir / PRO_MODE / "a.json", [("both", "get", "/a/both")])
+    write_spec(reference_dir / PRO_MODE / "b.json", [("both", "put", "/b/both")])
+    write_spec(reference_dir / PRO_MODE / "c.json", [("new", "get", "/new")])
+    write_spec(reference_dir / PRO_MODE / "d.json", [("new", "get", "/d/new")])
+    write_mdx(output_dir / PRO_MODE / "both.mdx", "api-reference/b.json get /both")
+    write_mdx(output_dir / PRO_MODE / "new.mdx", "api-reference/x.json get /new")
+
+    assert refresh_frontmatter(reference_dir, output_dir, [PRO_MODE])
+
+    assert read_mdx(output_dir / PRO_MODE / "both.mdx").startswith(
+        render_frontmatter("api-reference/b.json put /b/both")
+    )
+    # Otherwise the first spec in name order wins
+    assert read_mdx(output_dir / PRO_MODE / "new.mdx").startswith(
+        render_frontmatter("api-reference/c.json get /new")
+    )
+
+
+def test_missing_mode_fails(tmp_path):
+    reference_dir = tmp_path / "reference"
+    write_spec(reference_dir / PRO_MODE / "a.json", [("op", "get", "/op")])
+
+    assert not refresh_frontmatter(reference_dir, tmp_path / "mdx", [DEMO_MODE])
@@ -0,0 +1,142 @@
+import multiprocessing
+import threading
+import pytest
+
+from email.utils import formatdate
+from benchmarks.http_stub import MarkdownStubHandler
+from app import http_client
+from app.http_client import ReadMeClient, RequestBudgetExceeded, parse_retry_after
+
+
+class FlakyHandler(MarkdownStubHandler):
+    """
+    Fail the first `failures` requests of every page with `status`.
+    """
+
+    failures = 2
+    status = 503
+    retry_after = None
+    lock = threading.Lock()
+    attempts = {}
+
+    def do_GET(self):
+        with self.lock:
+            attempt = self.attempts.get(self.path, 0)
+            self.attempts[self.path] = attempt + 1
+
+        if attempt < self.failures:
+            self.send_response(self.status)
+            if self.retry_after is not None:
+                self.send_header("Retry-After", self.retry_after)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        super().do_GET()
+
+
+def flaky_handler(**attributes):
+    return type("Flaky", (FlakyHandler,), {"attempts": {}, **attributes})
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """
+    Record backoff delays instead of sleeping through them.
+    """
+    delays = []
+    monkeypatch.setattr(http_client.time, "sleep", delays.append)
+    return delays
+
+
+def test_transient_errors_are_retried_until_success(stub_server, sleeps):
+    base_url = stub_server(handler=flaky_handler(failures=2))
+    client = ReadMeClient(pool_size=1, max_retries=3, backoff_base=0.5)
+
+    response = client.get(f"{base_url}/coins-list.md")
+
+    assert response.status_code == 200
+    assert client.requests_made == 3
+    assert client.retries == 2
+    # Full jitter: each delay is at most the exponential ceiling
+    assert 0 <= sleeps[0] <= 0.5
+    assert 0 <= sleeps[1] <= 1.0
+    client.close()
+
+
+def test_retries_give_up_with_the_last_response(stub_server, sleeps):
+    base_url = stub_server(handler=flaky_handler(failures=10, status=502))
+    client = ReadMeClient(pool_size=1, max_retries=2)
+
+    response = client.get(f"{base_url}/coins-list.md")
+
+    assert response.status_code == 502
+    assert client.requests_made == 3
+    assert len(sleeps) == 2
+    client.close()
+
+
+def test_client_errors_are_not_retried(stub_server, sleeps):
+    base_url = stub_server(handler=flaky_handler(failures=1, status=404))
+    client = ReadMeClient(pool_size=1, max_retries=3)
+
+    assert client.get(f"{base_url}/coins-list.md").status_code == 404
+    assert client.retries == 0
+    assert sleeps == []
+    client.close()
+
+
+def test_retry_after_is_used_as_the_delay(stub_server, sleeps):
+    base_url = stub_server(
+        handler=flaky_handler(failures=1, status=429, retry_after="7")
+    )
+    client = ReadMeClient(pool_size=1, max_retries=1, backoff_max=30)
+
+    assert client.get(f"{base_url}/coins-list.md").status_code == 200
+    assert sleeps == [7.0]
+    client.close()
+
+
+def test_backoff_is_capped():
+    client = ReadMeClient(pool_size=1, backoff_base=1, backoff_max=4)
+
+    assert client.backoff_delay(0, retry_after=60) == 4
+    assert all(0 <= client.backoff_delay(10) <= 4 for _ in range(100))
+    client.close()
+
+
+def test_request_budget_counts_retries(stub_server, sleeps):
+    base_url = stub_server(handler=flaky_handler(failures=5))
+    client = ReadMeClient(pool_size=1, max_retries=5, budget=2)
+
+    with pytest.raises(RequestBudgetExceeded):
+        client.get(f"{base_url}/coins-list.md")
+
+    assert client.requests_made == 2
+    client.close()
+
+
+def test_shared_budget_counts_every_client(stub_server):
+    base_url = stub_server()
+    budget_spent = multiprocessing.Value("q", 0)
+    clients = [
+        ReadMeClient(pool_size=1, budget=3, budget_spent=budget_spent) for _ in range(2)
+    ]
+
+    clients[0].get(f"{base_url}/a.md")
+    clients[1].get(f"{base_url}/b.md")
+    clients[1].get(f"{base_url}/c.md")
+    with pytest.raises(RequestBudgetExceeded):
+        clients[0].get(f"{base_url}/d.md")
+
+    assert budget_spent.value == 3
+    assert [client.requests_made for client in clients] == [1, 2]
+    for client in clients:
+        client.close()
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert 0 < parse_retry_after(formatdate(http_client.time.time() + 60)) <= 60
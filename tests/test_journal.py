@@ -0,0 +1,148 @@
+import justsdk
+import pytest
+
+from benchmarks.corpus import build_markdown
+from app import journal as journal_module
+from app.convert_md_to_mdx import process_file
+from app.journal import RunJournal
+from app.markdown_bundle import BundleFetcher
+from app.pipeline import PipelineSettings
+
+OPERATION_IDS = ["first", "second", "third"]
+
+
+@pytest.fixture
+def json_file(tmp_path):
+    json_file = tmp_path / "specs" / "spec.json"
+    justsdk.write_file(
+        {
+            "paths": {
+                f"/{operation_id}": {"get": {"operationId": operation_id}}
+                for operation_id in OPERATION_IDS
+            }
+        },
+        json_file,
+    )
+    return json_file
+
+
+def recorded_journal(output_dir, json_file, operation_ids):
+    journal = RunJournal.open(output_dir, json_file)
+    for operation_id in operation_ids:
+        journal.record(operation_id)
+    journal.close()
+    return journal.path
+
+
+def test_resume_keeps_recorded_operations(tmp_path, json_file):
+    recorded_journal(tmp_path, json_file, ["first", "second"])
+
+    journal = RunJournal.open(tmp_path, json_file, resume=True)
+
+    assert journal.is_done("first") and journal.is_done("second")
+    assert not journal.is_done("third")
+
+
+def test_without_resume_the_journal_starts_over(tmp_path, json_file):
+    path = recorded_journal(tmp_path, json_file, ["first"])
+
+    journal = RunJournal.open(tmp_path, json_file)
+
+    assert not journal.is_done("first")
+    assert not path.exists()
+
+
+def test_journal_of_other_spec_content_is_ignored(tmp_path, json_file):
+    path = recorded_journal(tmp_path, json_file, ["first"])
+    json_file.write_bytes(json_file.read_bytes() + b"\n")
+
+    journal = RunJournal.open(tmp_path, json_file, resume=True)
+
+    assert not journal.is_done("first")
+    assert not path.exists()
+
+
+def test_journal_of_other_converter_version_is_ignored(
+    tmp_path, json_file, monkeypatch
+):
+    recorded_journal(tmp_path, json_file, ["first"])
+    monkeypatch.setattr(journal_module, "CONVERTER_VERSION", "0")
+
+    assert not RunJournal.open(tmp_path, json_file, resume=True).is_done("first")
+
+
+def test_truncated_last_entry_is_skipped(tmp_path, json_file):
+    path = recorded_journal(tmp_path, json_file, ["first"])
+    # A run killed halfway through writing its second entry
+    with open(path, "ab") as journal_file:
+        journal_file.write(b'{"operation_id": "sec')
+
+    journal = RunJournal.open(tmp_path, json_file, resume=True)
+    assert journal.completed == {"first"}
+
+    journal.record("third")
+    journal.close()
+    assert RunJournal.open(tmp_path, json_file, resume=True).completed == {
+        "first",
+        "third",
+    }
+
+
+def test_unreadable_header_is_ignored(tmp_path, json_file):
+    path = recorded_journal(tmp_path, json_file, ["first"])
+    path.write_bytes(b'{"spec": "spe')
+
+    assert RunJournal.open(tmp_path, json_file, resume=True).completed == set()
+
+
+def test_finished_journal_is_removed(tmp_path, json_file):
+    journal = RunJournal.open(tmp_path, json_file)
+    journal.record("first")
+    journal.close(finished=True)
+
+    assert not journal.path.exists()
+
+
+def convert(json_file, pages_dir, output_dir, resume):
+    with BundleFetcher(pages_dir) as fetcher:
+        return process_file(
+            json_file,
+            output_dir,
+            fetcher=fetcher,
+            pipeline=PipelineSettings(resume=resume),
+        )
+
+
+def test_resumed_run_skips_operations_completed_before(tmp_path, json_file):
+    pages_dir = tmp_path / "pages"
+    pages_dir.mkdir()
+    output_dir = tmp_path / "mdx"
+    for operation_id in ["first", "second"]:
+        (pages_dir / f"{operation_id}.md").write_text(build_markdown(operation_id))
+
+    # The page of 'third' is missing, so the run fails and keeps its journal
+    assert convert(json_file, pages_dir, output_dir, resume=False) is False
+    journal_path = RunJournal(output_dir, json_file).path
+    assert journal_path.exists()
+
+    # Only 'third' is converted; the pages of the others are no longer there
+    (pages_dir / "first.md").unlink()
+    (pages_dir / "second.md").unlink()
+    (pages_dir / "third.md").write_text(build_markdown("third"))
+
+    assert convert(json_file, pages_dir, output_dir, resume=True) is True
+    assert sorted(path.stem for path in output_dir.glob("*.mdx")) == OPERATION_IDS
+    assert not journal_path.exists()
+
+
+def test_run_without_resume_redoes_every_operation(tmp_path, json_file):
+    pages_dir = tmp_path / "pages"
+    pages_dir.mkdir()
+    output_dir = tmp_path / "mdx"
+    (pages_dir / "first.md").write_text(build_markdown("first"))
+
+    assert convert(json_file, pages_dir, output_dir, resume=False) is False
+    (output_dir / "first.mdx").unlink()
+
+    assert convert(json_file, pages_dir, output_dir, resume=False) is False
+    assert (output_dir / "first.mdx").exists()
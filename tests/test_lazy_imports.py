@@ -0,0 +1,46 @@
+import subprocess
+import sys
+import pytest
+import app
+
+from pathlib import Path
+
+HEAVY_MODULES = ["requests", "app.convert_md_to_mdx", "app.add_mint", "app.fetcher"]
+
+
+def loaded_modules(statement):
+    """
+    Run `statement` in a fresh interpreter and list which of the heavy
+    modules it loaded.
+    """
+    script = (
+        f"import sys\n{statement}\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(app.__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip().split(",") if result.stdout.strip() else []
+
+
+@pytest.mark.parametrize("statement", ["import app", "import app.cli"])
+def test_importing_the_cli_loads_no_processing_modules(statement):
+    assert loaded_modules(statement) == []
+
+
+def test_exports_are_loaded_on_first_access():
+    assert "app.fetcher" in loaded_modules("from app import convert_operations")
+
+    from app.convert_md_to_mdx import convert_operations
+
+    assert app.convert_operations is convert_operations
+    assert set(app.__all__) <= set(dir(app))
+
+
+def test_unknown_attributes_raise():
+    with pytest.raises(AttributeError, match="has no attribute 'missing'"):
+        app.missing
@@ -0,0 +1,128 @@
+import justsdk
+import pytest
+
+from benchmarks.corpus import build_markdown
+from app.convert_md_to_mdx import process_file
+from app.manifest import OutputManifest
+from app.markdown_bundle import BundleFetcher
+
+NO_CALLOUTS = "# Page\n\nNothing to convert here.\n"
+
+
+def write_spec(json_file, operations):
+    """
+    Write a spec with one GET operation per (operationId, path) pair.
+    """
+    justsdk.write_file(
+        {
+            "openapi": "3.0.0",
+            "paths": {
+                path: {"get": {"operationId": operation_id}}
+                for operation_id, path in operations
+            },
+        },
+        json_file,
+    )
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    pages_dir = tmp_path / "pages"
+    pages_dir.mkdir()
+    for operation_id in ["kept", "edited", "removed", "added"]:
+        (pages_dir / f"{operation_id}.md").write_text(
+            build_markdown(operation_id), encoding="utf-8"
+        )
+    (pages_dir / "empty.md").write_text(NO_CALLOUTS, encoding="utf-8")
+
+    json_file = tmp_path / "specs" / "spec.json"
+    write_spec(
+        json_file,
+        [("kept", "/kept"), ("edited", "/edited"), ("removed", "/removed")]
+        + [("empty", "/empty")],
+    )
+    return tmp_path, json_file
+
+
+def run(workspace, capfd):
+    """
+    Run an incremental conversion of the workspace's spec.
+    Returns the summary of the manifest and the MDX files in the output.
+    """
+    tmp_path, json_file = workspace
+    output_dir = tmp_path / "mdx"
+    capfd.readouterr()
+
+    with BundleFetcher(tmp_path / "pages") as fetcher:
+        assert process_file(json_file, output_dir, fetcher=fetcher, incremental=True)
+
+    summary = next(
+        line.split(": ", 1)[1]
+        for line in capfd.readouterr().out.splitlines()
+        if "Operations in 'spec.json'" in line
+    )
+    return summary, sorted(path.name for path in output_dir.glob("*.mdx"))
+
+
+def test_first_run_adds_every_page_with_content(workspace, capfd):
+    summary, files = run(workspace, capfd)
+
+    assert summary == "3 added, 0 changed, 1 unchanged, 0 deleted"
+    assert files == ["edited.mdx", "kept.mdx", "removed.mdx"]
+
+    manifest = OutputManifest.load(workspace[0] / "mdx")
+    assert set(manifest.entries) == {"kept", "edited", "removed", "empty"}
+    assert manifest.entries["empty"]["output_hash"] is None
+
+
+def test_later_run_classifies_and_prunes_operations(workspace, capfd):
+    tmp_path, json_file = workspace
+    run(workspace, capfd)
+    kept_file = tmp_path / "mdx" / "kept.mdx"
+    kept_mtime = kept_file.stat().st_mtime_ns
+
+    # A new operation, a moved one whose frontmatter changes, and one that
+    # is no longer in the spec
+    write_spec(
+        json_file,
+        [("kept", "/kept"), ("edited", "/moved"), ("empty", "/empty")]
+        + [("added", "/added")],
+    )
+    summary, files = run(workspace, capfd)
+
+    assert summary == "1 added, 1 changed, 2 unchanged, 1 deleted"
+    assert files == ["added.mdx", "edited.mdx", "kept.mdx"]
+    assert "get /moved" in (tmp_path / "mdx" / "edited.mdx").read_text()
+    assert kept_file.stat().st_mtime_ns == kept_mtime
+    assert "removed" not in OutputManifest.load(tmp_path / "mdx").entries
+
+
+def test_unchanged_run_writes_nothing(workspace, capfd):
+    run(workspace, capfd)
+    summary, _ = run(workspace, capfd)
+
+    assert summary == "0 added, 0 changed, 4 unchanged, 0 deleted"
+
+
+def test_edited_output_is_regenerated(workspace, capfd):
+    tmp_path, _ = workspace
+    run(workspace, capfd)
+    edited_file = tmp_path / "mdx" / "edited.mdx"
+    expected = edited_file.read_text()
+    edited_file.write_text("edited by hand")
+
+    summary, _ = run(workspace, capfd)
+
+    assert summary == "0 added, 1 changed, 3 unchanged, 0 deleted"
+    assert edited_file.read_text() == expected
+
+
+def test_page_that_loses_its_callouts_is_deleted(workspace, capfd):
+    tmp_path, _ = workspace
+    run(workspace, capfd)
+    (tmp_path / "pages" / "kept.md").write_text(NO_CALLOUTS, encoding="utf-8")
+
+    summary, files = run(workspace, capfd)
+
+    assert summary == "0 added, 0 changed, 3 unchanged, 1 deleted"
+    assert files == ["edited.mdx", "removed.mdx"]
@@ -0,0 +1,129 @@
+import io
+import tarfile
+import orjson
+import justsdk
+import pytest
+
+from benchmarks.corpus import build_markdown
+from app.convert_md_to_mdx import process_file
+from app.markdown_bundle import BundleFetcher, bundle_format
+from app._constants import DEMO_MODE, PRO_MODE
+
+# {(mode, operation_id): body}; a None mode is a page outside a mode folder
+PAGES = {
+    (PRO_MODE, "coins-list"): build_markdown("coins-list"),
+    (DEMO_MODE, "coins-list"): build_markdown("coins-list-demo"),
+    (None, "coins-list"): build_markdown("coins-list-flat"),
+    (None, "ping-server"): build_markdown("ping-server"),
+    (PRO_MODE, "unicode"): "# Café ✓\n\n> 📘 Note\n>\n> Ünïcode body\n",
+}
+
+
+def member_name(mode, operation_id):
+    return f"{mode}/{operation_id}.md" if mode else f"{operation_id}.md"
+
+
+def write_directory(path):
+    for (mode, operation_id), body in PAGES.items():
+        page_path = path / member_name(mode, operation_id)
+        page_path.parent.mkdir(parents=True, exist_ok=True)
+        page_path.write_text(body, encoding="utf-8")
+    return path
+
+
+def write_tar(path, mode="w"):
+    with tarfile.open(path, mode) as archive:
+        for (page_mode, operation_id), body in PAGES.items():
+            data = body.encode("utf-8")
+            member = tarfile.TarInfo(member_name(page_mode, operation_id))
+            member.size = len(data)
+            archive.addfile(member, io.BytesIO(data))
+        # Other files in the export are ignored
+        readme = tarfile.TarInfo("README.txt")
+        archive.addfile(readme, io.BytesIO(b""))
+    return path
+
+
+def write_jsonl(path):
+    lines = [
+        orjson.dumps({"mode": mode, "operation_id": operation_id, "body": body})
+        for (mode, operation_id), body in PAGES.items()
+    ]
+    path.write_bytes(b"\n".join(lines) + b"\n\n")
+    return path
+
+
+@pytest.fixture(params=["directory", "tar", "tar.gz", "jsonl"])
+def bundle(request, tmp_path):
+    if request.param == "directory":
+        return write_directory(tmp_path / "pages")
+    if request.param == "tar":
+        return write_tar(tmp_path / "pages.tar")
+    if request.param == "tar.gz":
+        return write_tar(tmp_path / "pages.tar.gz", "w:gz")
+    return write_jsonl(tmp_path / "pages.jsonl")
+
+
+def test_bundle_format(tmp_path, bundle):
+    expected = {".jsonl": "jsonl", "": "directory"}.get(bundle.suffix, "tar")
+    assert bundle_format(bundle) == expected
+
+    (tmp_path / "notes.txt").write_text("not a bundle", encoding="utf-8")
+    assert bundle_format(tmp_path / "notes.txt") is None
+    assert bundle_format(tmp_path / "missing") is None
+
+
+def test_pages_are_looked_up_by_mode_then_flat(bundle):
+    with BundleFetcher(bundle) as fetcher:
+        assert fetcher.fetch("coins-list", PRO_MODE) == PAGES[PRO_MODE, "coins-list"]
+        assert fetcher.fetch("coins-list", DEMO_MODE) == PAGES[DEMO_MODE, "coins-list"]
+        # Without a mode, the pro folder is used
+        assert fetcher.fetch("coins-list") == PAGES[PRO_MODE, "coins-list"]
+        assert fetcher.fetch("ping-server", DEMO_MODE) == PAGES[None, "ping-server"]
+        assert fetcher.fetch("unicode") == PAGES[PRO_MODE, "unicode"]
+        assert fetcher.fetch("missing", PRO_MODE) is None
+
+        assert fetcher.page_key("ping-server", PRO_MODE) == (None, "ping-server")
+        assert fetcher.page_key("coins-list", DEMO_MODE) == (DEMO_MODE, "coins-list")
+
+
+def test_bundles_convert_like_a_directory(tmp_path, bundle):
+    json_file = tmp_path / "spec.json"
+    justsdk.write_file(
+        {
+            "openapi": "3.0.0",
+            "paths": {
+                f"/{operation_id}": {"get": {"operationId": operation_id}}
+                for operation_id in ["coins-list", "ping-server", "unicode"]
+            },
+        },
+        json_file,
+    )
+
+    with BundleFetcher(write_directory(tmp_path / "expected-pages")) as fetcher:
+        assert process_file(json_file, tmp_path / "expected", PRO_MODE, fetcher)
+    with BundleFetcher(bundle) as fetcher:
+        assert process_file(json_file, tmp_path / "actual", PRO_MODE, fetcher)
+
+    expected = sorted((tmp_path / "expected").iterdir())
+    actual = sorted((tmp_path / "actual").iterdir())
+    assert [path.name for path in actual] == [path.name for path in expected]
+    assert [path.read_bytes() for path in actual] == [
+        path.read_bytes() for path in expected
+    ]
+
+
+def test_invalid_jsonl_entries_are_reported(tmp_path):
+    jsonl_file = tmp_path / "pages.jsonl"
+    jsonl_file.write_bytes(
+        orjson.dumps({"operation_id": "a", "body": "# A"})
+        + b'\n{"operation_id": "b"}\n'
+    )
+
+    with pytest.raises(ValueError, match="line 2"):
+        BundleFetcher(jsonl_file)
+
+
+def test_unsupported_sources_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="not a directory, tarball or JSONL"):
+        BundleFetcher(tmp_path / "missing")
@@ -0,0 +1,90 @@
+import threading
+
+from benchmarks.corpus import build_markdown
+from benchmarks.http_stub import MarkdownStubHandler
+from app.fetcher import create_fetcher
+from app.markdown_cache import MarkdownCache
+from app.metrics import run_metrics
+from app._constants import DEMO_MODE, PRO_MODE
+
+ETAG = '"v1"'
+
+
+class ETagHandler(MarkdownStubHandler):
+    """
+    Serve pages with an ETag and answer matching If-None-Match with 304.
+    """
+
+    lock = threading.Lock()
+    requests = []
+
+    def do_GET(self):
+        with self.lock:
+            self.requests.append(dict(self.headers))
+
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        operation_id = self.path.rsplit("/", 1)[-1].removesuffix(".md")
+        body = build_markdown(operation_id).encode("utf-8")
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def etag_server(stub_server):
+    handler = type("Tracked", (ETagHandler,), {"requests": []})
+    return handler, stub_server(handler=handler)
+
+
+def test_cached_pages_are_revalidated_with_their_etag(stub_server, tmp_path):
+    handler, base_url = etag_server(stub_server)
+
+    with create_fetcher(jobs=1, cache_dir=tmp_path, base_url=base_url) as fetcher:
+        first = fetcher.fetch("coins-list", PRO_MODE)
+        second = fetcher.fetch("coins-list", PRO_MODE)
+
+    assert first == second == build_markdown("coins-list")
+    assert "If-None-Match" not in handler.requests[0]
+    assert handler.requests[1]["If-None-Match"] == ETAG
+    assert run_metrics.counters["cache_hits"] == 1
+    # Only the first response carried a body
+    assert run_metrics.counters["bytes_downloaded"] == len(first.encode("utf-8"))
+
+
+def test_cache_is_kept_per_mode(stub_server, tmp_path):
+    handler, base_url = etag_server(stub_server)
+
+    with create_fetcher(jobs=1, cache_dir=tmp_path, base_url=base_url) as fetcher:
+        fetcher.fetch("coins-list", PRO_MODE)
+        fetcher.fetch("coins-list", DEMO_MODE)
+
+    assert all("If-None-Match" not in headers for headers in handler.requests)
+    assert MarkdownCache(tmp_path).load("coins-list", DEMO_MODE)["etag"] == ETAG
+
+
+def test_offline_fetches_serve_only_the_cache(tmp_path):
+    MarkdownCache(tmp_path).store("coins-list", "# Cached", ETAG, None, PRO_MODE)
+
+    with create_fetcher(jobs=1, cache_dir=tmp_path, offline=True) as fetcher:
+        assert fetcher.fetch("coins-list", PRO_MODE) == "# Cached"
+        assert fetcher.fetch("ping-server", PRO_MODE) is None
+
+    assert run_metrics.counters["cache_hits"] == 1
+    assert run_metrics.counters.get("http_requests", 0) == 0
+
+
+def test_conditional_headers():
+    assert MarkdownCache.conditional_headers(None) == {}
+    assert MarkdownCache.conditional_headers(
+        {"etag": ETAG, "last_modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+    ) == {
+        "If-None-Match": ETAG,
+        "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+    }
@@ -0,0 +1,118 @@
+import re
+import justsdk
+
+from app.metrics import RunMetrics, operation_key, FETCH_STAGE, CONVERT_STAGE
+
+SAMPLE_PATTERN = re.compile(
+    r'^(?P<name>[a-zA-Z_:][a-zA-Z0-9_:]*)(\{[a-zA-Z_][a-zA-Z0-9_]*="[^"\\]*"\})? '
+    r"(?P<value>-?[0-9.]+(e[+-]?[0-9]+)?)$"
+)
+
+
+def sample_metrics():
+    metrics = RunMetrics()
+    metrics.record(FETCH_STAGE, 0.5, operation_key("coins-list", "pro"))
+    metrics.record(FETCH_STAGE, 1.5, operation_key("coins-id", "pro"))
+    metrics.record(CONVERT_STAGE, 0.25, operation_key("coins-list", "pro"))
+    metrics.increment("http_requests", 2)
+    metrics.increment("files_unchanged")
+    return metrics
+
+
+def parse_textfile(text):
+    """
+    Parse a Prometheus textfile into {metric name: type} and the samples,
+    asserting that every sample follows the TYPE line of its metric.
+    """
+    types = {}
+    samples = []
+
+    assert text.endswith("\n")
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, metric_type = line.split(" ")
+            assert name not in types
+            types[name] = metric_type
+        elif line.startswith("# HELP "):
+            assert line.split(" ", 3)[3]
+        else:
+            match = SAMPLE_PATTERN.match(line)
+            assert match, line
+            assert match.group("name") in types
+            samples.append((line.rsplit(" ", 1)[0], float(match.group("value"))))
+
+    return types, dict(samples)
+
+
+def test_record_accumulates_stages_and_operations():
+    metrics = sample_metrics()
+
+    assert metrics.stages[FETCH_STAGE] == {
+        "count": 2,
+        "total_seconds": 2.0,
+        "max_seconds": 1.5,
+    }
+    assert metrics.operations["pro/coins-list"] == {
+        FETCH_STAGE: 0.5,
+        CONVERT_STAGE: 0.25,
+    }
+    assert [entry["operation"] for entry in metrics.slowest_operations()] == [
+        "pro/coins-id",
+        "pro/coins-list",
+    ]
+
+
+def test_merge_adds_exported_metrics():
+    metrics = sample_metrics()
+    metrics.merge(sample_metrics().export())
+
+    assert metrics.stages[FETCH_STAGE]["count"] == 4
+    assert metrics.stages[FETCH_STAGE]["max_seconds"] == 1.5
+    assert metrics.operations["pro/coins-list"][FETCH_STAGE] == 1.0
+    assert metrics.counters == {"http_requests": 4, "files_unchanged": 2}
+
+
+def test_report(tmp_path):
+    report_path = tmp_path / "report.json"
+    sample_metrics().write_report(report_path)
+
+    report = justsdk.read_file(report_path)
+    assert report["operations"] == 2
+    assert list(report["stages"]) == [CONVERT_STAGE, FETCH_STAGE]
+    assert report["counters"] == {"files_unchanged": 1, "http_requests": 2}
+    assert report["slowest_operations"][0]["total_seconds"] == 1.5
+    assert report["wall_seconds"] >= 0
+
+
+def test_prometheus_textfile_format(tmp_path):
+    textfile_path = tmp_path / "metrics.prom"
+    sample_metrics().write_prometheus(textfile_path)
+
+    types, samples = parse_textfile(textfile_path.read_text(encoding="utf-8"))
+
+    assert types == {
+        "mintlify_oas_run_duration_seconds": "gauge",
+        "mintlify_oas_stage_seconds_total": "counter",
+        "mintlify_oas_stage_runs_total": "counter",
+        "mintlify_oas_files_unchanged_total": "counter",
+        "mintlify_oas_http_requests_total": "counter",
+    }
+    assert samples['mintlify_oas_stage_seconds_total{stage="fetch"}'] == 2.0
+    assert samples['mintlify_oas_stage_seconds_total{stage="convert"}'] == 0.25
+    assert samples['mintlify_oas_stage_runs_total{stage="fetch"}'] == 2
+    assert samples["mintlify_oas_http_requests_total"] == 2
+    assert samples["mintlify_oas_run_duration_seconds"] >= 0
+
+
+def test_prometheus_textfile_of_an_empty_run(tmp_path):
+    textfile_path = tmp_path / "metrics.prom"
+    RunMetrics().write_prometheus(textfile_path)
+
+    types, samples = parse_textfile(textfile_path.read_text(encoding="utf-8"))
+
+    assert set(types) == {
+        "mintlify_oas_run_duration_seconds",
+        "mintlify_oas_stage_seconds_total",
+        "mintlify_oas_stage_runs_total",
+    }
+    assert list(samples) == ["mintlify_oas_run_duration_seconds"]
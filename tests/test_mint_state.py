@@ -0,0 +1,114 @@
+import os
+import justsdk
+import pytest
+
+from benchmarks.corpus import build_spec
+from app import add_mint
+from app.metrics import run_metrics
+from app.mint_state import MintState
+from app.parallel import add_mint_parallel
+from app._constants import ADD_MINT_STATE_FILE, DEMO_MODE, PRO_MODE
+
+
+@pytest.fixture
+def reference_dir(tmp_path, monkeypatch):
+    # The state file lives under the working directory
+    monkeypatch.chdir(tmp_path)
+    reference_dir = tmp_path / "reference"
+    justsdk.write_file(build_spec(3, seed=1), reference_dir / DEMO_MODE / "demo.json")
+    justsdk.write_file(build_spec(5, seed=2), reference_dir / PRO_MODE / "pro.json")
+    return reference_dir
+
+
+@pytest.fixture
+def processed(monkeypatch):
+    """
+    Record the specs add-mint actually reads.
+    """
+    names = []
+    process_file = add_mint.process_file
+
+    def recording_process_file(json_file):
+        names.append(json_file.name)
+        return process_file(json_file)
+
+    monkeypatch.setattr(add_mint, "process_file", recording_process_file)
+    return names
+
+
+def test_unchanged_specs_are_skipped(reference_dir, processed):
+    assert add_mint.process_reference_files(reference_dir)
+    assert sorted(processed) == ["demo.json", "pro.json"]
+
+    processed.clear()
+    assert add_mint.process_reference_files(reference_dir)
+    assert processed == []
+    assert run_metrics.counters["specs_skipped"] == 2
+
+    # An edited spec is processed again
+    pro_file = reference_dir / PRO_MODE / "pro.json"
+    justsdk.write_file(build_spec(6, seed=2), pro_file)
+    assert add_mint.process_reference_files(reference_dir)
+    assert processed == ["pro.json"]
+
+
+def test_force_processes_every_spec(reference_dir, processed):
+    assert add_mint.process_reference_files(reference_dir)
+    processed.clear()
+
+    assert add_mint.process_reference_files(reference_dir, force=True)
+    assert sorted(processed) == ["demo.json", "pro.json"]
+
+
+def test_parallel_add_mint_shares_the_state(reference_dir):
+    assert add_mint.process_reference_files(reference_dir)
+    run_metrics.reset()
+
+    assert add_mint_parallel(reference_dir, workers=1)
+    assert run_metrics.counters["specs_skipped"] == 2
+
+
+def test_touched_specs_are_checked_by_hash(tmp_path):
+    json_file = tmp_path / "spec.json"
+    json_file.write_text('{"paths": {}}', encoding="utf-8")
+    state = MintState(tmp_path / "state.json")
+    state.record(json_file)
+
+    stat = json_file.stat()
+    os.utime(json_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert state.is_current(json_file)
+    # The new modification time is remembered, so the hash is read only once
+    assert state.entries[MintState.key(json_file)]["mtime_ns"] == (
+        stat.st_mtime_ns + 10**9
+    )
+
+    json_file.write_text('{"paths": []}', encoding="utf-8")
+    os.utime(json_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert not state.is_current(json_file)
+
+    json_file.unlink()
+    assert not state.is_current(json_file)
+    assert not state.is_current(tmp_path / "unknown.json")
+
+
+def test_state_is_saved_and_loaded(tmp_path):
+    json_file = tmp_path / "spec.json"
+    json_file.write_text("{}", encoding="utf-8")
+    state_file = tmp_path / ".cache" / "state.json"
+
+    state = MintState(state_file)
+    state.save()
+    assert not state_file.exists()
+
+    state.record(json_file)
+    state.save()
+    assert MintState.load(state_file).is_current(json_file)
+
+
+def test_unreadable_state_is_ignored(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    state_file = tmp_path / ADD_MINT_STATE_FILE
+    state_file.parent.mkdir(parents=True)
+    state_file.write_text("{not json", encoding="utf-8")
+
+    assert MintState.load().entries == {}
@@ -0,0 +1,107 @@
+import justsdk
+import pytest
+
+from benchmarks.corpus import build_markdown
+from app.convert_md_to_mdx import process_mode_files
+from app.fetcher import get_base_url
+from app.markdown_bundle import BundleFetcher
+from app.metrics import run_metrics
+from app.mode_planner import convert_shared_modes
+from app._constants import DEMO_MODE, PRO_MODE
+
+
+def write_spec(json_file, operation_ids):
+    justsdk.write_file(
+        {
+            "openapi": "3.0.0",
+            "paths": {
+                f"/{operation_id}": {"get": {"operationId": operation_id}}
+                for operation_id in operation_ids
+            },
+        },
+        json_file,
+    )
+
+
+def mode_page(operation_id, mode):
+    """
+    A page that links to the docs of its own mode, as ReadMe serves them.
+    """
+    return (
+        build_markdown(operation_id)
+        + f"\nSee [ping]({get_base_url(mode)}/ping-server) first.\n"
+    )
+
+
+def write_page(pages_dir, name, content):
+    page_path = pages_dir / name
+    page_path.parent.mkdir(parents=True, exist_ok=True)
+    page_path.write_text(content, encoding="utf-8")
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    reference_dir = tmp_path / "reference"
+    write_spec(reference_dir / DEMO_MODE / "demo.json", ["shared", "ping-server"])
+    write_spec(
+        reference_dir / PRO_MODE / "pro.json", ["shared", "ping-server", "pro-only"]
+    )
+    # Operations defined twice in a mode are written for the first spec
+    write_spec(reference_dir / PRO_MODE / "pro-extra.json", ["pro-only", "extra"])
+
+    pages_dir = tmp_path / "pages"
+    for mode in (DEMO_MODE, PRO_MODE):
+        write_page(pages_dir, f"{mode}/shared.md", mode_page("shared", mode))
+    write_page(pages_dir, f"{PRO_MODE}/pro-only.md", build_markdown("pro-only"))
+    # Flat pages are the same source for every mode
+    write_page(pages_dir, "ping-server.md", build_markdown("ping-server"))
+    write_page(pages_dir, "extra.md", "# Extra\n\nNothing to convert.\n")
+    return tmp_path
+
+
+def read_tree(output_dir):
+    return {
+        str(path.relative_to(output_dir)): path.read_bytes()
+        for path in sorted(output_dir.rglob("*.mdx"))
+    }
+
+
+def test_shared_pages_match_per_mode_runs(workspace):
+    reference_dir = workspace / "reference"
+
+    with BundleFetcher(workspace / "pages") as fetcher:
+        for mode in (DEMO_MODE, PRO_MODE):
+            assert process_mode_files(
+                mode, reference_dir, workspace / "per-mode", fetcher
+            )
+    run_metrics.reset()
+
+    with BundleFetcher(workspace / "pages") as fetcher:
+        assert convert_shared_modes(reference_dir, workspace / "shared", fetcher)
+
+    expected = read_tree(workspace / "per-mode")
+    assert sorted(expected) == [
+        "demo/ping-server.mdx",
+        "demo/shared.mdx",
+        "pro/ping-server.mdx",
+        "pro/pro-only.mdx",
+        "pro/shared.mdx",
+    ]
+    assert read_tree(workspace / "shared") == expected
+
+    # The flat page is loaded once for both modes, and the per-mode copies of
+    # the shared page are converted once
+    assert run_metrics.counters["bundle_pages"] == 5
+    assert run_metrics.counters["shared_pages"] == 2
+
+
+def test_shared_pages_can_be_limited_to_some_modes(workspace):
+    with BundleFetcher(workspace / "pages") as fetcher:
+        assert convert_shared_modes(
+            workspace / "reference", workspace / "mdx", fetcher, modes=[DEMO_MODE]
+        )
+
+    assert sorted(read_tree(workspace / "mdx")) == [
+        "demo/ping-server.mdx",
+        "demo/shared.mdx",
+    ]
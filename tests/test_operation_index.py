@@ -0,0 +1,115 @@
+import orjson
+import justsdk
+import pytest
+
+from pathlib import Path
+from benchmarks.corpus import build_spec
+from app import operation_index
+from app.operation_index import OperationIndex, find_operation
+from app.spec_scanner import SpecScanError, scan_operations
+from app._constants import DEFAULT_REFERENCE_DIR
+
+REFERENCE_SPECS = sorted(Path(DEFAULT_REFERENCE_DIR).glob("*/*.json"))
+
+
+def edge_case_spec():
+    """
+    A spec with what the scanner has to skip or keep apart: path-level keys
+    that are not methods, methods out of HTTP_METHODS order, an operation
+    without operationId, a duplicated operationId, escaped strings and
+    "paths" or method keys nested where they are not operations.
+    """
+    return {
+        "info": {"title": "Edge cases", "paths": {"/not": {"get": {}}}},
+        "paths": {
+            "/a": {
+                "summary": "Path-level keys { [ are not operations",
+                "parameters": [{"name": "get", "in": "query"}],
+                "post": {"operationId": "a-post", "x-mint": {"href": "/x"}},
+                "get": {
+                    "description": 'Quotes \\" and braces } ] in text',
+                    "operationId": 'a-"get"-é',
+                    "responses": {"200": {"get": {"operationId": "nested"}}},
+                },
+            },
+            "/b/{id}": {
+                "delete": {"summary": "No operationId"},
+                "patch": {"operationId": "a-post"},
+                "x-get": {"operationId": "extension"},
+            },
+            "/c": {},
+        },
+        "components": {"schemas": {"get": {"operationId": "schema"}}},
+    }
+
+
+def assert_scan_matches_parsing(json_file):
+    parsed = OperationIndex(justsdk.read_file(json_file, use_orjson=True))
+    scanned = OperationIndex.scan(json_file, with_operations=True)
+    ids_only = OperationIndex.scan(json_file)
+
+    assert scanned.has_paths == ids_only.has_paths == parsed.has_paths
+    assert scanned.operations == parsed.operations
+    assert scanned.by_id == parsed.by_id
+    assert scanned.duplicates == parsed.duplicates
+    assert ids_only.operation_ids == parsed.operation_ids
+    assert [(ref.path, ref.method) for ref in ids_only.operations] == [
+        (ref.path, ref.method) for ref in parsed.operations
+    ]
+    for operation_id in parsed.by_id:
+        assert ids_only.find(operation_id) == parsed.find(operation_id)
+
+
+@pytest.mark.parametrize(
+    "spec_file",
+    REFERENCE_SPECS,
+    ids=[f"{f.parent.name}/{f.name}" for f in REFERENCE_SPECS],
+)
+def test_scan_matches_parsing_on_reference_specs(spec_file):
+    assert_scan_matches_parsing(spec_file)
+
+
+@pytest.mark.parametrize("indent", [True, False], ids=["indented", "compact"])
+@pytest.mark.parametrize(
+    "openapi_data",
+    [build_spec(300), edge_case_spec(), {"openapi": "3.0.0"}],
+    ids=["synthetic", "edge-cases", "no-paths"],
+)
+def test_scan_matches_parsing_on_synthetic_specs(openapi_data, indent, tmp_path):
+    json_file = tmp_path / "spec.json"
+    json_file.write_bytes(
+        orjson.dumps(openapi_data, option=orjson.OPT_INDENT_2 if indent else 0)
+    )
+
+    assert_scan_matches_parsing(json_file)
+
+
+def test_scan_spans_hold_each_operation(tmp_path):
+    openapi_data = edge_case_spec()
+    buffer = orjson.dumps(openapi_data, option=orjson.OPT_INDENT_2)
+
+    for span in scan_operations(buffer):
+        operation = openapi_data["paths"][span.path][span.method]
+        assert orjson.loads(buffer[span.start : span.end]) == operation
+        assert span.operation_id == operation.get("operationId")
+        assert span.has_mint == ("x-mint" in operation)
+
+
+@pytest.mark.parametrize("buffer", [b"[]", b'{"paths": {"/a": {"get": {}}', b'"paths"'])
+def test_scan_rejects_malformed_documents(buffer):
+    with pytest.raises(SpecScanError):
+        list(scan_operations(buffer))
+
+
+@pytest.mark.parametrize("min_size", [0, 1 << 40], ids=["scanned", "parsed"])
+def test_load_finds_the_same_operations_either_way(min_size, monkeypatch):
+    monkeypatch.setattr(operation_index, "SPEC_SCAN_MIN_SIZE", min_size)
+
+    for spec_file in REFERENCE_SPECS:
+        openapi_data = justsdk.read_file(spec_file, use_orjson=True)
+        loaded = OperationIndex.load(spec_file)
+
+        assert loaded.operation_ids == OperationIndex(openapi_data).operation_ids
+        for operation_id in loaded.by_id:
+            ref = find_operation(openapi_data, operation_id)
+            assert loaded.find(operation_id) == (ref.path, ref.method)
@@ -0,0 +1,167 @@
+import os
+import sys
+import pytest
+
+from app import cli, output_sink
+from app.convert_md_to_mdx import process_file
+from app.fetcher import MarkdownFetcher
+from app.output_sink import OutputSink, contains_path
+from app.pipeline import PipelineSettings
+
+
+def read_tree(directory):
+    """
+    Map the relative path of every file under a directory to its content.
+    """
+    return {
+        str(path.relative_to(directory)): path.read_text(encoding="utf-8")
+        for path in sorted(directory.rglob("*"))
+        if path.is_file()
+    }
+
+
+@pytest.fixture
+def output_dir(tmp_path):
+    output_dir = tmp_path / "mdx"
+    (output_dir / "nested").mkdir(parents=True)
+    (output_dir / "changed.mdx").write_text("old", encoding="utf-8")
+    (output_dir / "same.mdx").write_text("same", encoding="utf-8")
+    (output_dir / "nested" / "kept.mdx").write_text("kept", encoding="utf-8")
+    return output_dir
+
+
+def test_unchanged_files_are_not_rewritten(output_dir):
+    sink = OutputSink(output_dir)
+    same_file = output_dir / "same.mdx"
+    os.utime(same_file, ns=(0, 0))
+
+    assert sink.write(same_file, "same") is False
+    assert sink.write(output_dir / "changed.mdx", "new") is True
+    assert sink.write(output_dir / "added.mdx", "added") is True
+    sink.commit()
+
+    assert same_file.stat().st_mtime_ns == 0
+    assert (sink.written, sink.unchanged) == (2, 1)
+    assert read_tree(output_dir) == {
+        "added.mdx": "added",
+        "changed.mdx": "new",
+        "nested/kept.mdx": "kept",
+        "same.mdx": "same",
+    }
+
+
+def test_swap_replaces_the_output_on_commit(output_dir):
+    sink = OutputSink(output_dir, swap=True)
+    old_tree = read_tree(output_dir)
+
+    assert sink.write(output_dir / "same.mdx", "same") is False
+    sink.write(output_dir / "changed.mdx", "new")
+    sink.write(output_dir / "added.mdx", "added")
+
+    # Nothing is visible before the commit
+    assert read_tree(output_dir) == old_tree
+
+    sink.commit()
+
+    assert read_tree(output_dir) == {
+        "added.mdx": "added",
+        "changed.mdx": "new",
+        "nested/kept.mdx": "kept",
+        "same.mdx": "same",
+    }
+    assert os.listdir(output_dir.parent) == ["mdx"]
+
+
+def test_swap_creates_a_missing_output(tmp_path):
+    output_dir = tmp_path / "mdx"
+    sink = OutputSink(output_dir, swap=True)
+
+    sink.write(output_dir / "added.mdx", "added")
+    sink.commit()
+
+    assert read_tree(output_dir) == {"added.mdx": "added"}
+
+
+def test_discarded_run_leaves_the_old_output(output_dir):
+    sink = OutputSink(output_dir, swap=True)
+    old_tree = read_tree(output_dir)
+
+    sink.write(output_dir / "changed.mdx", "new")
+    sink.write(output_dir / "added.mdx", "added")
+    sink.discard()
+
+    assert read_tree(output_dir) == old_tree
+    assert os.listdir(output_dir.parent) == ["mdx"]
+
+
+def test_failed_swap_restores_the_old_output(output_dir, monkeypatch):
+    sink = OutputSink(output_dir, swap=True)
+    old_tree = read_tree(output_dir)
+    replace = os.replace
+
+    def failing_replace(source, target):
+        if source == sink.staging_dir:
+            raise OSError("rename failed")
+        return replace(source, target)
+
+    sink.write(output_dir / "changed.mdx", "new")
+    monkeypatch.setattr(output_sink.os, "replace", failing_replace)
+
+    with pytest.raises(OSError):
+        sink.commit()
+    sink.discard()
+
+    assert read_tree(output_dir) == old_tree
+    assert os.listdir(output_dir.parent) == ["mdx"]
+
+
+def test_contains_path(tmp_path):
+    assert contains_path(tmp_path, tmp_path)
+    assert contains_path(tmp_path, tmp_path / "pro" / "spec.json")
+    assert contains_path(tmp_path / "pro" / "..", tmp_path / "spec.json")
+    assert not contains_path(tmp_path / "mdx", tmp_path / "mdx-old" / "a.mdx")
+
+
+def test_swap_is_refused_in_the_spec_directory(tmp_path):
+    json_file = tmp_path / "spec.json"
+    json_file.write_bytes(b'{"paths": {"/a": {"get": {"operationId": "a"}}}}')
+    pipeline = PipelineSettings(swap_output=True)
+
+    with MarkdownFetcher() as fetcher:
+        assert process_file(json_file, fetcher=fetcher, pipeline=pipeline) is False
+
+    assert sorted(os.listdir(tmp_path)) == ["spec.json"]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [[], ["--file", "{dir}/spec.json"], ["--output", "{dir}"]],
+    ids=["default-output", "file", "output"],
+)
+def test_cli_refuses_to_swap_the_spec_directory(options, tmp_path, monkeypatch):
+    (tmp_path / "spec.json").write_bytes(b'{"paths": {}}')
+    options = [option.format(dir=tmp_path) for option in options]
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["main", "convert-mdx", "--dir", str(tmp_path), "--swap-output", *options],
+    )
+
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+
+    assert exit_info.value.code == 1
+    assert sorted(os.listdir(tmp_path)) == ["spec.json"]
+
+
+def test_cli_checks_the_mode_directories(tmp_path):
+    args = cli.create_parser().parse_args(
+        ["convert-mdx", "--dir", str(tmp_path), "--api-mode", "pro"]
+    )
+    (tmp_path / "pro").mkdir()
+    (tmp_path / "pro" / "spec.json").write_bytes(b"{}")
+
+    spec_files, output_dirs = cli.convert_mdx_paths(args)
+
+    assert spec_files == [tmp_path / "pro" / "spec.json"]
+    assert [output_dir.as_posix() for output_dir in output_dirs] == ["mdx/pro"]
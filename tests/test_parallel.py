@@ -0,0 +1,95 @@
+import justsdk
+
+from app.metrics import run_metrics
+from app.parallel import collect_mode_specs, convert_all_modes
+from app._constants import DEMO_MODE, PRO_MODE
+
+
+def write_spec(json_file, operation_ids):
+    justsdk.write_file(
+        {
+            "paths": {
+                f"/{operation_id}": {"get": {"operationId": operation_id}}
+                for operation_id in operation_ids
+            }
+        },
+        json_file,
+    )
+
+
+def make_reference(tmp_path, pro_operations=6):
+    reference_dir = tmp_path / "reference"
+    write_spec(reference_dir / DEMO_MODE / "small.json", ["demo-only"])
+    write_spec(
+        reference_dir / PRO_MODE / "large.json",
+        [f"pro-{index}" for index in range(pro_operations)],
+    )
+    return reference_dir
+
+
+def convert(reference_dir, output_dir, base_url, budget=None):
+    return convert_all_modes(
+        reference_dir,
+        output_dir,
+        workers=2,
+        fetcher_options={
+            "jobs": 2,
+            "max_retries": 0,
+            "budget": budget,
+            "base_url": base_url,
+        },
+    )
+
+
+def test_collect_mode_specs_in_mode_and_name_order(tmp_path):
+    reference_dir = make_reference(tmp_path)
+    write_spec(reference_dir / PRO_MODE / "another.json", ["x"])
+
+    assert [
+        (mode, json_file.name) for mode, json_file in collect_mode_specs(reference_dir)
+    ] == [
+        (DEMO_MODE, "small.json"),
+        (PRO_MODE, "another.json"),
+        (PRO_MODE, "large.json"),
+    ]
+
+
+def test_all_modes_match_sequential_runs(stub_server, tmp_path):
+    from app.convert_md_to_mdx import process_mode_files
+    from app.fetcher import create_fetcher
+
+    base_url = stub_server()
+    reference_dir = make_reference(tmp_path)
+
+    assert convert(reference_dir, tmp_path / "parallel", base_url)
+    with create_fetcher(base_url=base_url) as fetcher:
+        for mode in (DEMO_MODE, PRO_MODE):
+            assert process_mode_files(
+                mode, reference_dir, tmp_path / "sequential", fetcher
+            )
+
+    for mode in (DEMO_MODE, PRO_MODE):
+        parallel = sorted((tmp_path / "parallel" / mode).glob("*.mdx"))
+        sequential = sorted((tmp_path / "sequential" / mode).glob("*.mdx"))
+        assert [path.name for path in parallel] == [path.name for path in sequential]
+        assert [path.read_bytes() for path in parallel] == [
+            path.read_bytes() for path in sequential
+        ]
+
+
+def test_request_budget_is_shared_by_the_workers(stub_server, tmp_path):
+    base_url = stub_server()
+    reference_dir = make_reference(tmp_path)
+
+    # One worker needs 6 of the 7 requests, more than an even split gives it
+    assert convert(reference_dir, tmp_path / "mdx", base_url, budget=7)
+    assert run_metrics.counters["http_requests"] == 7
+
+
+def test_request_budget_caps_the_whole_run(stub_server, tmp_path):
+    base_url = stub_server()
+    reference_dir = make_reference(tmp_path)
+
+    assert not convert(reference_dir, tmp_path / "mdx", base_url, budget=4)
+    assert run_metrics.counters["http_requests"] == 4
+    assert len(list((tmp_path / "mdx").rglob("*.mdx"))) == 4
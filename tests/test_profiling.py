@@ -0,0 +1,86 @@
+import pstats
+import justsdk
+import pytest
+
+from benchmarks.corpus import build_markdown
+from app import profiling
+from app.convert_md_to_mdx import process_file
+from app.markdown_bundle import BundleFetcher
+from app.profiling import RunProfile, format_size, CPU_PROFILE, MEMORY_PROFILE
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    operation_ids = [f"operation-{index}" for index in range(8)]
+    pages_dir = tmp_path / "pages"
+    pages_dir.mkdir()
+    for operation_id in operation_ids:
+        (pages_dir / f"{operation_id}.md").write_text(
+            build_markdown(operation_id), encoding="utf-8"
+        )
+
+    json_file = tmp_path / "spec.json"
+    justsdk.write_file(
+        {
+            "openapi": "3.0.0",
+            "paths": {
+                f"/{operation_id}": {"get": {"operationId": operation_id}}
+                for operation_id in operation_ids
+            },
+        },
+        json_file,
+    )
+    return tmp_path, json_file
+
+
+def profile_run(kind, workspace):
+    tmp_path, json_file = workspace
+    output_path = tmp_path / "profiles" / f"run.{kind}"
+    profile = RunProfile(kind, output_path, top=5)
+
+    profile.start()
+    try:
+        with BundleFetcher(tmp_path / "pages") as fetcher:
+            assert process_file(json_file, tmp_path / "mdx", fetcher=fetcher)
+    finally:
+        profile.stop()
+
+    return output_path
+
+
+def test_cpu_profile_includes_pipeline_threads(workspace, capfd):
+    output_path = profile_run(CPU_PROFILE, workspace)
+
+    functions = {
+        function_name for _, _, function_name in pstats.Stats(str(output_path)).stats
+    }
+    # The pages are converted on the pipeline's converter threads
+    assert "convert_markdown" in functions
+    assert "process_file" in functions
+    assert profiling._active_profile is None
+    assert "Top 5 functions by own time" in capfd.readouterr().out
+
+
+def test_memory_profile_reports_allocation_sites(workspace, capfd):
+    output_path = profile_run(MEMORY_PROFILE, workspace)
+
+    report = output_path.read_text(encoding="utf-8").splitlines()
+    assert report[0].startswith("Peak traced memory: ")
+    assert "Top 5 allocation sites near the peak:" in report
+    assert "Top 5 allocation sites still allocated at the end:" in report
+    # Sites are lines of this package
+    sites = [line for line in report if line[:3].strip().isdigit()]
+    assert sites
+    assert all(profiling.PACKAGE_DIR in line for line in sites)
+    assert "Memory profile" in capfd.readouterr().out
+
+
+def test_unknown_profile_kind():
+    with pytest.raises(ValueError, match="Unknown profile 'disk'"):
+        RunProfile("disk")
+
+
+def test_format_size():
+    assert format_size(512) == "512 B"
+    assert format_size(1536) == "1.5 KiB"
+    assert format_size(3 * 1024**3) == "3.0 GiB"
@@ -0,0 +1,159 @@
+import pytest
+
+from app.rate_limiter import (
+    HostLimit,
+    RateLimiter,
+    TokenBucket,
+    parse_rate_limit,
+    split_rate_limits,
+)
+from app._constants import RATE_LIMIT_DECREASE, RATE_LIMIT_RECOVERY
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeClockBucket(TokenBucket):
+    """
+    A TokenBucket whose waits advance a fake clock instead of sleeping.
+    """
+
+    def __init__(self, limit):
+        super().__init__(limit, FakeClock())
+        self.waits = []
+
+    def _wait(self, timeout):
+        assert timeout is not None, "would wait for another thread forever"
+        self.waits.append(timeout)
+        # A little past the deadline, as real waits return, so float rounding
+        # cannot leave the bucket a hair short of a token forever
+        self.clock.now += timeout + 1e-9
+
+    def send(self, count=1):
+        """
+        Acquire and release `count` requests. Returns the fake time it took.
+        """
+        start = self.clock()
+        for _ in range(count):
+            self.acquire()
+            self.release()
+        return self.clock() - start
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("5", (None, HostLimit(5.0, 5, None))),
+        ("2.5", (None, HostLimit(2.5, 3, None))),
+        ("0.5:1", (None, HostLimit(0.5, 1, None))),
+        ("docs.coingecko.com=5:10:4", ("docs.coingecko.com", HostLimit(5.0, 10, 4))),
+        ("localhost:8000=1::2", ("localhost:8000", HostLimit(1.0, 1, 2))),
+    ],
+)
+def test_parse_rate_limit(value, expected):
+    assert parse_rate_limit(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["", "fast", "host=", "1:2:3:4", "1:x", "1.5:2.5", "0", "-1", "1:0", "1:1:0"],
+)
+def test_parse_rate_limit_rejects_malformed_values(value):
+    with pytest.raises(ValueError):
+        parse_rate_limit(value)
+
+
+def test_split_rate_limits_between_workers():
+    limits = {None: HostLimit(8.0, 8, 4), "host": HostLimit(1.0, 1, None)}
+
+    assert split_rate_limits(limits, 4) == {
+        None: HostLimit(2.0, 2, 1),
+        "host": HostLimit(0.25, 1, None),
+    }
+
+
+def test_bucket_bursts_then_paces_requests():
+    bucket = FakeClockBucket(HostLimit(10.0, 2, None))
+
+    assert bucket.send(2) == 0
+    assert bucket.send(10) == pytest.approx(1.0)
+    assert bucket.waits == pytest.approx([0.1] * 10)
+
+
+def test_bucket_refills_while_idle_up_to_its_burst():
+    bucket = FakeClockBucket(HostLimit(10.0, 3, None))
+    bucket.send(3)
+    bucket.clock.now += 60
+
+    assert bucket.send(3) == 0
+    assert bucket.send(1) == pytest.approx(0.1)
+
+
+def test_429_cuts_the_rate_once_per_generation():
+    bucket = FakeClockBucket(HostLimit(10.0, 1, None))
+    _, generation = bucket.acquire()
+    bucket.release()
+
+    bucket.observe(429, {}, generation=generation)
+    # A response to a request sent before the cut does not cut it again
+    bucket.observe(429, {}, generation=generation)
+
+    assert bucket.rate == pytest.approx(10.0 * RATE_LIMIT_DECREASE)
+    assert bucket.send(1) == pytest.approx(1 / bucket.rate)
+
+
+def test_retry_after_pauses_the_host():
+    bucket = FakeClockBucket(HostLimit(10.0, 5, None))
+
+    bucket.observe(429, {}, retry_after=3.0)
+
+    assert bucket.send(1) == pytest.approx(3.0)
+
+
+def test_rate_recovers_on_success_up_to_the_limit():
+    bucket = FakeClockBucket(HostLimit(2.0, 1, None))
+    bucket.observe(429, {})
+    cut_rate = bucket.rate
+
+    bucket.observe(200, {})
+    assert bucket.rate == pytest.approx(cut_rate + RATE_LIMIT_RECOVERY)
+
+    for _ in range(100):
+        bucket.observe(200, {})
+    assert bucket.rate == 2.0
+
+
+def test_rate_limit_headers_cap_the_rate_and_pause_when_exhausted():
+    bucket = FakeClockBucket(HostLimit(10.0, 1, None))
+
+    bucket.observe(200, {"X-RateLimit-Remaining": "5", "X-RateLimit-Reset": "10"})
+    assert bucket.current_rate() == pytest.approx(0.5)
+
+    bucket.observe(200, {"RateLimit-Remaining": "0", "RateLimit-Reset": "4"})
+    assert bucket.current_rate() == bucket.rate
+    assert bucket.send(1) == pytest.approx(4.0)
+
+
+def test_limiter_keeps_one_bucket_per_host():
+    limiter = RateLimiter({"docs.example": HostLimit(5.0, 5, None)})
+
+    bucket = limiter.bucket_for("https://docs.example/reference/a.md")
+    assert limiter.bucket_for("https://docs.example/reference/b.md") is bucket
+    assert limiter.bucket_for("https://other.example/a.md") is None
+
+    with limiter.slot("https://other.example/a.md") as (unlimited, generation):
+        assert (unlimited, generation) == (None, None)
+
+
+def test_limiter_falls_back_to_the_default_limit():
+    limiter = RateLimiter({None: HostLimit(1.0, 1, 1)})
+
+    with limiter.slot("https://any.example/a.md") as (bucket, generation):
+        assert bucket.max_rate == 1.0
+        assert (bucket.in_flight, generation) == (1, 0)
+    assert bucket.in_flight == 0
@@ -0,0 +1,124 @@
+import os
+import justsdk
+
+from app.convert_md_to_mdx import convert_md_to_mdx, write_operation_mdx
+from app.metrics import run_metrics
+from app.reference_links import (
+    ReferenceLinkRewriter,
+    count_code_links,
+    known_operation_ids,
+    reference_target,
+)
+from app._constants import (
+    COINGECKO_DEMO_DOCS_BASE_URL,
+    COINGECKO_DOCS_BASE_URL,
+    DEMO_MODE,
+    PRO_MODE,
+)
+
+CALLOUT = """> 📘 Notes
+>
+> * See [`/coins/list`](/reference/coins-list) and the [ping](/reference/ping-server#response) page.
+"""
+
+
+def test_plain_and_code_links_are_rewritten():
+    rewritten, targets = ReferenceLinkRewriter().rewrite(
+        "[ping](/reference/ping-server) and [`/coins/{id}`](/reference/coins-id?x=1)"
+    )
+
+    assert rewritten[None] == (
+        f"[ping](<{COINGECKO_DOCS_BASE_URL}/ping-server>) and "
+        f"[`/coins/{{id}}`](<{COINGECKO_DOCS_BASE_URL}/coins-id?x=1>)"
+    )
+    assert targets == ["ping-server", "coins-id?x=1"]
+
+
+def test_code_links_may_span_lines_but_plain_links_may_not():
+    content = (
+        "[`/coins/{id}\n/tickers`](/reference/coins-id-tickers) [a\nb](/reference/x)"
+    )
+    rewritten, targets = ReferenceLinkRewriter().rewrite(content)
+
+    assert rewritten[None] == (
+        f"[`/coins/{{id}}\n/tickers`](<{COINGECKO_DOCS_BASE_URL}/coins-id-tickers>) "
+        "[a\nb](/reference/x)"
+    )
+    assert targets == ["coins-id-tickers"]
+    assert count_code_links(content) == 1
+
+
+def test_other_links_are_left_alone():
+    content = (
+        "[docs](/docs/setup) [site](https://www.coingecko.com/reference/x) "
+        f"[done](<{COINGECKO_DOCS_BASE_URL}/ping-server>)"
+    )
+
+    assert ReferenceLinkRewriter().rewrite(content) == ({None: content}, [])
+
+
+def test_every_mode_gets_its_own_prefix_from_one_scan():
+    content = "[`/a`](/reference/a-b) then [c](/reference/c-d)"
+    rewritten, targets = ReferenceLinkRewriter().rewrite(
+        content, [None, DEMO_MODE, PRO_MODE]
+    )
+
+    assert rewritten[DEMO_MODE] == (
+        f"[`/a`](<{COINGECKO_DEMO_DOCS_BASE_URL}/a-b>) then "
+        f"[c](<{COINGECKO_DEMO_DOCS_BASE_URL}/c-d>)"
+    )
+    assert rewritten[PRO_MODE] == rewritten[None]
+    assert rewritten[PRO_MODE] == (
+        f"[`/a`](<{COINGECKO_DOCS_BASE_URL}/a-b>) then "
+        f"[c](<{COINGECKO_DOCS_BASE_URL}/c-d>)"
+    )
+    assert targets == ["a-b", "c-d"]
+
+
+def test_links_inside_callouts_use_the_mode_base_url():
+    for mode, base_url in [
+        (DEMO_MODE, COINGECKO_DEMO_DOCS_BASE_URL),
+        (PRO_MODE, COINGECKO_DOCS_BASE_URL),
+    ]:
+        assert convert_md_to_mdx(CALLOUT, mode=mode) == (
+            "<Note>\n  ### Note\n\n"
+            f"  - See [`/coins/list`](<{base_url}/coins-list>) and the "
+            f"[ping](<{base_url}/ping-server#response>) page.\n</Note>"
+        )
+
+
+def test_reference_target_drops_anchor_and_query():
+    assert reference_target("coins-id#response") == "coins-id"
+    assert reference_target("coins-id?x=1#y") == "coins-id"
+    assert reference_target("coins-id") == "coins-id"
+
+
+def test_unknown_targets_keep_their_link_and_warn(tmp_path, capfd):
+    assert write_operation_mdx(
+        "notes",
+        CALLOUT,
+        tmp_path,
+        mode=PRO_MODE,
+        known_ids={"coins-list", "notes"},
+    )
+
+    output = capfd.readouterr().out
+    assert "links to unknown reference '/reference/ping-server#response'" in output
+    assert "coins-list'" not in output
+    assert (
+        f"[ping](<{COINGECKO_DOCS_BASE_URL}/ping-server#response>)"
+        in (tmp_path / "notes.mdx").read_text()
+    )
+    assert run_metrics.counters["unknown_reference_links"] == 1
+
+
+def test_known_operation_ids_follow_spec_changes(tmp_path):
+    json_file = tmp_path / "spec.json"
+    justsdk.write_file({"paths": {"/a": {"get": {"operationId": "a"}}}}, json_file)
+    assert known_operation_ids(tmp_path) == {"a"}
+
+    justsdk.write_file({"paths": {"/b": {"get": {"operationId": "b"}}}}, json_file)
+    stat = json_file.stat()
+    os.utime(json_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert known_operation_ids(tmp_path) == {"b"}
@@ -0,0 +1,133 @@
+import justsdk
+import pytest
+
+from benchmarks.corpus import build_markdown
+from app.watch import SpecWatcher
+from app._constants import PRO_MODE
+
+
+class RecordingFetcher:
+    """
+    Serve synthetic pages and record which operations were fetched.
+    """
+
+    def __init__(self):
+        self.fetched = []
+
+    def fetch(self, operation_id, mode=None):
+        self.fetched.append((mode, operation_id))
+        return build_markdown(operation_id)
+
+
+def write_spec(json_file, operations):
+    """
+    Write a spec with one GET operation per operationId, using the given
+    summaries to tell versions of an operation apart.
+    """
+    justsdk.write_file(
+        {
+            "openapi": "3.0.0",
+            "paths": {
+                f"/{operation_id}": {
+                    "get": {"operationId": operation_id, "summary": summary}
+                }
+                for operation_id, summary in operations.items()
+            },
+        },
+        json_file,
+    )
+
+
+@pytest.fixture
+def watcher(tmp_path):
+    reference_dir = tmp_path / "reference"
+    output_dir = tmp_path / "mdx"
+    json_file = reference_dir / PRO_MODE / "spec.json"
+    write_spec(json_file, {"kept": "Kept", "edited": "Old", "removed": "Removed"})
+
+    mode_output_dir = output_dir / PRO_MODE
+    mode_output_dir.mkdir(parents=True)
+    for operation_id in ["kept", "edited", "removed"]:
+        (mode_output_dir / f"{operation_id}.mdx").write_text("old", encoding="utf-8")
+
+    watcher = SpecWatcher(
+        RecordingFetcher(), reference_dir, output_dir, modes=[PRO_MODE]
+    )
+    watcher.start()
+    return watcher, json_file, mode_output_dir
+
+
+def test_only_changed_operations_are_regenerated(watcher):
+    watcher, json_file, mode_output_dir = watcher
+    write_spec(json_file, {"kept": "Kept", "edited": "New", "added": "Added"})
+
+    assert watcher.changed_files() == [json_file]
+    assert watcher.handle_change(json_file) == 3
+
+    assert sorted(watcher.fetcher.fetched) == [
+        (PRO_MODE, "added"),
+        (PRO_MODE, "edited"),
+    ]
+    assert sorted(path.name for path in mode_output_dir.iterdir()) == [
+        "added.mdx",
+        "edited.mdx",
+        "kept.mdx",
+    ]
+    assert (mode_output_dir / "kept.mdx").read_text(encoding="utf-8") == "old"
+    assert (
+        (mode_output_dir / "edited.mdx")
+        .read_text(encoding="utf-8")
+        .startswith("---\nopenapi: api-reference/spec.json get /edited\n---\n")
+    )
+
+
+def test_adding_x_mint_is_not_a_change(watcher):
+    watcher, json_file, _ = watcher
+    write_spec(json_file, {"kept": "Kept", "edited": "New", "removed": "Removed"})
+    watcher.handle_change(json_file)
+
+    spec = justsdk.read_file(json_file)
+    assert all("x-mint" in path["get"] for path in spec["paths"].values())
+    assert watcher.changed_files() == []
+
+    # A later poll that sees the file again finds nothing to regenerate
+    watcher.fetcher.fetched.clear()
+    assert watcher.handle_change(json_file) == 0
+    assert watcher.fetcher.fetched == []
+
+
+def test_operations_moved_to_another_spec_are_kept(watcher):
+    watcher, json_file, mode_output_dir = watcher
+    other_file = json_file.with_name("other.json")
+    write_spec(other_file, {"removed": "Removed"})
+    watcher.handle_change(other_file)
+
+    write_spec(json_file, {"kept": "Kept", "edited": "Old"})
+    watcher.handle_change(json_file)
+
+    assert (mode_output_dir / "removed.mdx").exists()
+
+
+def test_deleted_spec_removes_its_operations(watcher):
+    watcher, json_file, mode_output_dir = watcher
+    json_file.unlink()
+
+    assert watcher.changed_files() == [json_file]
+    assert watcher.handle_change(json_file) == 3
+    assert list(mode_output_dir.iterdir()) == []
+    assert watcher.fetcher.fetched == []
+
+
+def test_unreadable_spec_waits_for_the_next_write(watcher):
+    watcher, json_file, mode_output_dir = watcher
+    json_file.write_text('{"paths": {', encoding="utf-8")
+
+    assert watcher.handle_change(json_file) == 0
+    # The half-written spec is not handled again until it changes
+    assert watcher.changed_files() == []
+    assert len(list(mode_output_dir.iterdir())) == 3
+
+    write_spec(json_file, {"kept": "Kept", "edited": "New", "removed": "Removed"})
+    assert watcher.changed_files() == [json_file]
+    assert watcher.handle_change(json_file) == 1
+    assert watcher.fetcher.fetched == [(PRO_MODE, "edited")]